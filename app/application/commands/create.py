@@ -37,7 +37,6 @@ class CreateMessageHandler:
                 read_at=command.read_at,
                 edited_at=command.edited_at
             )
-            await self.event_bus.process_events(message)
             return {
                 "success": True,
                 "message_id": command.message_id
@@ -0,0 +1,38 @@
+from typing import Any
+from uuid import UUID
+from dataclasses import dataclass
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.domain.events.event_bus import EventBus
+
+
+@dataclass
+class MarkChatAsReadCommand:
+    chat_id: UUID
+    reader_id: UUID
+    up_to_message_id: UUID
+
+
+class MarkChatAsReadHandler:
+    def __init__(self, message_service: MessageService, event_bus: EventBus) -> None:
+        self.message_service: MessageService = message_service
+        self.event_bus: EventBus = event_bus
+
+    async def handle(self, command: MarkChatAsReadCommand) -> dict[str, Any]:
+        try:
+            watermark = await self.message_service.mark_chat_as_read(
+                chat_id=command.chat_id,
+                reader_id=command.reader_id,
+                up_to_message_id=command.up_to_message_id
+            )
+
+            return {
+                "success": True,
+                "chat_id": command.chat_id,
+                "advanced": watermark is not None
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "exception": str(e)
+            }
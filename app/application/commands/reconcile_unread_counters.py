@@ -0,0 +1,30 @@
+from typing import Any
+from uuid import UUID
+from dataclasses import dataclass
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.domain.events.event_bus import EventBus
+
+
+@dataclass
+class ReconcileUnreadCountersCommand:
+    recipient_id: UUID | None = None
+
+
+class ReconcileUnreadCountersHandler:
+    def __init__(self, message_service: MessageService, event_bus: EventBus) -> None:
+        self.message_service: MessageService = message_service
+        self.event_bus: EventBus = event_bus
+
+    async def handle(self, command: ReconcileUnreadCountersCommand) -> dict[str, Any]:
+        try:
+            repaired = await self.message_service.reconcile_unread_counters(command.recipient_id)
+            return {
+                "success": True,
+                "repaired": repaired
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "exception": str(e)
+            }
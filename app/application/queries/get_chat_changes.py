@@ -0,0 +1,48 @@
+from typing import Any
+from uuid import UUID
+from dataclasses import dataclass
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.domain.events.event_bus import EventBus
+
+
+@dataclass
+class GetChatChangesQuery:
+    chat_id: UUID
+    since_seq: int = 0
+    limit: int = 500
+
+
+class GetChatChangesHandler:
+    def __init__(self, message_service: MessageService, event_bus: EventBus) -> None:
+        self.message_service: MessageService = message_service
+        self.event_bus: EventBus = event_bus
+
+    async def handle(self, query: GetChatChangesQuery) -> dict[str, Any]:
+        try:
+            page = await self.message_service.get_chat_changes(
+                chat_id=query.chat_id,
+                since_seq=query.since_seq,
+                limit=query.limit
+            )
+            return {
+                "success": True,
+                "chat_id": query.chat_id,
+                "changes": [
+                    {
+                        "seq": change.seq,
+                        "message_id": change.message_id,
+                        "change_type": change.change_type,
+                        "data": change.data,
+                        "changed_at": change.changed_at
+                    }
+                    for change in page.changes
+                ],
+                "last_seq": page.last_seq,
+                "has_more": page.has_more
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "exception": str(e)
+            }
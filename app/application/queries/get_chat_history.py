@@ -0,0 +1,44 @@
+from typing import Any
+from uuid import UUID
+from dataclasses import dataclass
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.domain.events.event_bus import EventBus
+from LuminMessageService.app.domain.models.common.value_objects import HistoryDirection, MessageCursor
+from LuminMessageService.app.infrastructure.persistance.message_mapper import MessageMapper
+
+
+@dataclass
+class GetChatHistoryQuery:
+    chat_id: UUID
+    limit: int = 50
+    cursor: MessageCursor | None = None
+    direction: HistoryDirection = HistoryDirection.OLDER
+
+
+class GetChatHistoryHandler:
+    def __init__(self, message_service: MessageService, event_bus: EventBus) -> None:
+        self.message_service: MessageService = message_service
+        self.event_bus: EventBus = event_bus
+
+    async def handle(self, query: GetChatHistoryQuery) -> dict[str, Any]:
+        try:
+            page = await self.message_service.get_chat_history(
+                chat_id=query.chat_id,
+                limit=query.limit,
+                cursor=query.cursor,
+                direction=query.direction
+            )
+            mapper = MessageMapper()
+            return {
+                "success": True,
+                "chat_id": query.chat_id,
+                "messages": [mapper.to_persistence(message) for message in page.messages],
+                "older_cursor": page.older_cursor.encode() if page.older_cursor else None,
+                "newer_cursor": page.newer_cursor.encode() if page.newer_cursor else None
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "exception": str(e)
+            }
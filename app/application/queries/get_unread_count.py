@@ -0,0 +1,42 @@
+from typing import Any
+from uuid import UUID
+from dataclasses import dataclass
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.domain.events.event_bus import EventBus
+
+
+@dataclass
+class GetUnreadCountQuery:
+    recipient_id: UUID
+    chat_id: UUID | None = None
+
+
+class GetUnreadCountHandler:
+    def __init__(self, message_service: MessageService, event_bus: EventBus) -> None:
+        self.message_service: MessageService = message_service
+        self.event_bus: EventBus = event_bus
+
+    async def handle(self, query: GetUnreadCountQuery) -> dict[str, Any]:
+        try:
+            if query.chat_id:
+                unread_count = await self.message_service.get_unread_count(query.recipient_id, query.chat_id)
+                return {
+                    "success": True,
+                    "recipient_id": query.recipient_id,
+                    "chat_id": query.chat_id,
+                    "unread_count": unread_count
+                }
+
+            unread_counts = await self.message_service.get_unread_counts(query.recipient_id)
+            return {
+                "success": True,
+                "recipient_id": query.recipient_id,
+                "chats": {str(chat_id): count for chat_id, count in unread_counts.items()},
+                "unread_count": sum(unread_counts.values())
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "exception": str(e)
+            }
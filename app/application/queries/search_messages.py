@@ -0,0 +1,45 @@
+from typing import Any
+from uuid import UUID
+from dataclasses import dataclass
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.domain.events.event_bus import EventBus
+from LuminMessageService.app.domain.models.common.value_objects import SearchCursor
+from LuminMessageService.app.infrastructure.persistance.message_mapper import MessageMapper
+
+
+@dataclass
+class SearchMessagesQuery:
+    query: str
+    chat_id: UUID | None = None
+    participant_id: UUID | None = None
+    limit: int = 20
+    cursor: SearchCursor | None = None
+
+
+class SearchMessagesHandler:
+    def __init__(self, message_service: MessageService, event_bus: EventBus) -> None:
+        self.message_service: MessageService = message_service
+        self.event_bus: EventBus = event_bus
+
+    async def handle(self, query: SearchMessagesQuery) -> dict[str, Any]:
+        try:
+            page = await self.message_service.search_messages(
+                query=query.query,
+                limit=query.limit,
+                chat_id=query.chat_id,
+                participant_id=query.participant_id,
+                cursor=query.cursor
+            )
+            mapper = MessageMapper()
+            return {
+                "success": True,
+                "query": query.query,
+                "hits": [{**mapper.to_persistence(message), "rank": rank} for message, rank in page.hits],
+                "next_cursor": page.next_cursor.encode() if page.next_cursor else None
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "exception": str(e)
+            }
@@ -1,16 +1,59 @@
+import asyncio
+import json
+import logging
+from contextlib import AbstractAsyncContextManager
 from datetime import datetime
+from typing import Any, AsyncIterator
 from uuid import UUID
 from LuminMessageService.app.domain.events.message_events import MessageCreatedEvent
 from LuminMessageService.app.domain.models.aggregates.message import Message
-from LuminMessageService.app.domain.models.common.value_objects import MessageText
+from LuminMessageService.app.domain.models.common.value_objects import (MessageText, MessageCursor, HistoryDirection,
+                                                                        ReadWatermark, SearchCursor)
+from LuminMessageService.app.domain.repositories.reposiotries import MessagePage, ChatChangePage, MessageSearchPage
+from LuminMessageService.app.infrastructure.archive.message_archive import MessageArchive
 from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache
-from LuminMessageService.app.infrastructure.persistance.unit_of_work import get_unit_of_work
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool
+from LuminMessageService.app.infrastructure.persistance.replica_router import ReplicaRouter
+from LuminMessageService.app.infrastructure.persistance.shard_router import ShardRouter
+from LuminMessageService.app.infrastructure.persistance.unit_of_work import MessageUnitOfWork, get_unit_of_work
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
 
 
 class MessageService:
-    def __init__(self, connection_factory, cache: MultiLevelCache) -> None:
-        self.connection_factory = connection_factory
+    EXPORT_BATCH_SIZE = 1000
+
+    def __init__(
+            self,
+            connection_pool: DatabasePool,
+            cache: MultiLevelCache,
+            replica_router: ReplicaRouter | None = None,
+            shard_router: ShardRouter | None = None,
+            archive: MessageArchive | None = None
+    ) -> None:
+        self.connection_pool = connection_pool
         self.cache = cache
+        self.replica_router = replica_router or ReplicaRouter(connection_pool)
+        self.shard_router = shard_router or ShardRouter([self.replica_router])
+        self.archive = archive
+        self.cache.set_refresher(self._load_message_data)
+
+    @staticmethod
+    def _record_write(shard: ReplicaRouter, message: Message) -> None:
+        shard.record_write(message.id, message.chat_id, message.recipient_id)
+
+    def _read_unit_of_work(
+            self, shard: ReplicaRouter, *keys: UUID | None
+    ) -> AbstractAsyncContextManager[MessageUnitOfWork]:
+        pool = shard.for_read(*keys)
+        # A replica can return rows older than a commit whose cache invalidation already ran in another process.
+        return get_unit_of_work(pool, self.cache, self.archive, fills_cache=pool is shard.primary)
 
     async def create_message(
             self,
@@ -23,12 +66,15 @@ class MessageService:
             read_at: datetime | None = None,
             edited_at: datetime | None = None,
     ) -> Message:
-        async with get_unit_of_work(self.connection_factory, self.cache) as uow:
+        shard = self.shard_router.for_chat(chat_id, write=True)
+        await self.shard_router.register_routes({message_id: chat_id})
+
+        async with get_unit_of_work(shard.primary, self.cache, self.archive) as uow:
             existing_message = await uow.messages.get_by_id(message_id)
             if existing_message:
                 raise ValueError(f"Message {message_id} already exists")
 
-            message = Message(
+            message = self._build_message(
                 message_id=message_id,
                 sender_id=sender_id,
                 recipient_id=recipient_id,
@@ -39,75 +85,237 @@ class MessageService:
                 edited_at=edited_at,
             )
 
-            message.add_domain_event(MessageCreatedEvent(
-                aggregate_id=message_id,
-                data={
-                    "sender_id": sender_id,
-                    "recipient_id": recipient_id,
-                    "chat_id": chat_id,
-                    "text": text.value,
-                    "sent_at": sent_at,
-                    "read_at": read_at,
-                    "edited_at": edited_at,
-                }
-
-            ))
-
             await uow.messages.save(message)
             await uow.commit()
+            self._record_write(shard, message)
 
-            print(f"User created: {message_id}")
+            logger.debug(f"Message created: {message_id}")
             return message
 
+    async def create_messages(self, messages_data: list[dict[str, Any]]) -> list[Message]:
+        batches: dict[int, list[dict[str, Any]]] = {}
+        for data in messages_data:
+            self.shard_router.for_chat(data["chat_id"], write=True)
+            batches.setdefault(self.shard_router.shard_index(data["chat_id"]), []).append(data)
+
+        await self.shard_router.register_routes({data["message_id"]: data["chat_id"] for data in messages_data})
+
+        created = []
+        for index, batch in batches.items():
+            shard = self.shard_router.shards[index]
+            async with get_unit_of_work(shard.primary, self.cache, self.archive) as uow:
+                existing_messages = await uow.messages.get_many([data["message_id"] for data in batch])
+                if existing_messages:
+                    raise ValueError(f"Messages already exist: {[message.id for message in existing_messages]}")
+
+                messages = [self._build_message(**data) for data in batch]
+
+                await uow.messages.save_many(messages)
+                await uow.commit()
+                for message in messages:
+                    self._record_write(shard, message)
+                created.extend(messages)
+
+        logger.debug(f"Messages created: {len(created)}")
+        return created
+
+    async def get_messages_by_ids(self, message_ids: list[UUID]) -> list[Message]:
+        found: dict[UUID, Message] = {}
+        for shard, shard_message_ids in await self.shard_router.group_messages(message_ids):
+            # Point reads fill the shared cache, so they go to the primary; the cache absorbs their load.
+            async with get_unit_of_work(shard.primary, self.cache, self.archive) as uow:
+                found.update({message.id: message for message in await uow.messages.get_many(shard_message_ids)})
+
+        messages = [found[message_id] for message_id in message_ids if message_id in found]
+        logger.debug(f"[get_messages_by_ids] Messages found: {len(messages)} of {len(message_ids)}")
+        return messages
+
     async def get_message_by_id(self, message_id: UUID) -> Message | None:
-        async with get_unit_of_work(self.connection_factory, self.cache) as uow:
+        shard = await self.shard_router.for_message(message_id)
+        async with get_unit_of_work(shard.primary, self.cache, self.archive) as uow:
             message: Message = await uow.messages.get_by_id(message_id)
             if message:
-                print(f"[MessageService.get_message_by_id] Message found: {message}")
-                print(f"[MessageService.get_message_by_id] Message class: {message.__class__}")
-                print(f"[MessageService.get_message_by_id] Has id attr: {hasattr(message, 'id')}")
-                print(f"[MessageService.get_message_by_id] Message.id value: {message.id if hasattr(message, 'id') else 'NO ID'}")
+                logger.debug(f"[get_message_by_id] Message found: {message_id} (version {message.version})")
             else:
-                print(f"[MessageService.get_message_by_id] Message not found: {message_id}")
+                logger.debug(f"[get_message_by_id] Message not found: {message_id}")
                 raise ValueError(f"Message {message_id} not found")
 
             return message
 
+    async def _load_message_data(self, message_id: UUID) -> dict[str, Any] | None:
+        shard = await self.shard_router.for_message(message_id)
+        async with get_unit_of_work(shard.primary, self.cache, self.archive) as uow:
+            return await uow.messages.fetch_message_data(message_id)
+
+    async def get_chat_history(
+            self,
+            chat_id: UUID,
+            limit: int,
+            cursor: MessageCursor | None = None,
+            direction: HistoryDirection = HistoryDirection.OLDER,
+    ) -> MessagePage:
+        shard = self.shard_router.for_chat(chat_id)
+        async with self._read_unit_of_work(shard, chat_id) as uow:
+            page = await uow.messages.get_chat_history(chat_id, limit, cursor, direction)
+            logger.debug(f"[get_chat_history] {len(page.messages)} messages in chat {chat_id}")
+            return page
+
+    async def search_messages(
+            self,
+            query: str,
+            limit: int,
+            chat_id: UUID | None = None,
+            participant_id: UUID | None = None,
+            cursor: SearchCursor | None = None,
+    ) -> MessageSearchPage:
+        if chat_id is None and participant_id is None:
+            raise ValueError("Search must be scoped by chat_id or participant_id")
+
+        async def shard_search(shard: ReplicaRouter) -> MessageSearchPage:
+            async with self._read_unit_of_work(shard, chat_id, participant_id) as uow:
+                return await uow.messages.search(query, limit, chat_id, participant_id, cursor)
+
+        shards = [self.shard_router.for_chat(chat_id)] if chat_id else self.shard_router.shards
+        pages = await asyncio.gather(*(shard_search(shard) for shard in shards))
+
+        hits = sorted(
+            (hit for page in pages for hit in page.hits),
+            key=lambda hit: (hit[1], hit[0].id),
+            reverse=True
+        )
+        has_more = len(hits) > limit or any(page.next_cursor for page in pages)
+        hits = hits[:limit]
+
+        logger.debug(f"[search_messages] {len(hits)} hits for {query!r}")
+        return MessageSearchPage(
+            hits=hits,
+            next_cursor=SearchCursor(hits[-1][1], hits[-1][0].id) if has_more and hits else None
+        )
+
+    async def get_chat_changes(self, chat_id: UUID, since_seq: int, limit: int) -> ChatChangePage:
+        shard = self.shard_router.for_chat(chat_id)
+        async with self._read_unit_of_work(shard, chat_id) as uow:
+            page = await uow.chat_changes.get_since(chat_id, since_seq, limit)
+            logger.debug(f"[get_chat_changes] {len(page.changes)} changes in chat {chat_id} after {since_seq}")
+            return page
+
+    async def get_unread_count(self, recipient_id: UUID, chat_id: UUID) -> int:
+        shard = self.shard_router.for_chat(chat_id)
+        async with self._read_unit_of_work(shard, recipient_id, chat_id) as uow:
+            return await uow.unread_counters.get(recipient_id, chat_id)
+
+    async def get_unread_counts(self, recipient_id: UUID) -> dict[UUID, int]:
+        async def shard_counts(shard: ReplicaRouter) -> dict[UUID, int]:
+            async with self._read_unit_of_work(shard, recipient_id) as uow:
+                return await uow.unread_counters.get_for_recipient(recipient_id)
+
+        counts: dict[UUID, int] = {}
+        for shard_result in await asyncio.gather(*(shard_counts(shard) for shard in self.shard_router.shards)):
+            counts.update(shard_result)
+        return counts
+
+    async def reconcile_unread_counters(self, recipient_id: UUID | None = None) -> int:
+        repaired = 0
+        for shard in self.shard_router.shards:
+            async with get_unit_of_work(shard.primary, self.cache, self.archive) as uow:
+                repaired += await uow.unread_counters.reconcile(recipient_id)
+                await uow.commit()
+        return repaired
+
+    async def export_chat(self, chat_id: UUID) -> AsyncIterator[bytes]:
+        shard = self.shard_router.for_chat(chat_id)
+        async with self._read_unit_of_work(shard, chat_id) as uow:
+            async for batch in uow.messages.stream_chat_messages(chat_id, self.EXPORT_BATCH_SIZE):
+                yield "".join(json.dumps(row, default=_json_default) + "\n" for row in batch).encode()
+
     async def edit_message_text(self, message_id: UUID, new_text: MessageText) -> Message:
-        async with get_unit_of_work(self.connection_factory, self.cache) as uow:
+        shard = await self.shard_router.for_message(message_id, write=True)
+        async with get_unit_of_work(shard.primary, self.cache, self.archive) as uow:
             message: Message = await uow.messages.get_by_id(message_id)
             if message:
-                print(f"[MessageService.edit_message_text] Message found: {message}")
-                print(f"[MessageService.edit_message_text] Message class: {message.__class__}")
-                print(f"[MessageService.edit_message_text] Has id attr: {hasattr(message, 'id')}")
-                print(
-                    f"[MessageService.edit_message_text] Message.id value: {message.id if hasattr(message, 'id') else 'NO ID'}")
+                logger.debug(f"[edit_message_text] Message found: {message_id} (version {message.version})")
                 message.edit_text(new_text, datetime.now())
                 await uow.messages.save(message)
+                await uow.commit()
+                self._record_write(shard, message)
             else:
-                print(f"[MessageService.edit_message_text] Message not found: {message_id}")
+                logger.debug(f"[edit_message_text] Message not found: {message_id}")
                 raise ValueError(f"Message {message_id} not found")
 
             return message
 
     async def mark_message_as_read(self, message_id: UUID) -> Message:
-        async with get_unit_of_work(self.connection_factory, self.cache) as uow:
+        shard = await self.shard_router.for_message(message_id, write=True)
+        async with get_unit_of_work(shard.primary, self.cache, self.archive) as uow:
             message: Message = await uow.messages.get_by_id(message_id)
             if message:
-                print(f"[MessageService.mark_message_as_read] Message found: {message}")
-                print(f"[MessageService.mark_message_as_read] Message class: {message.__class__}")
-                print(f"[MessageService.mark_message_as_read] Has id attr: {hasattr(message, 'id')}")
-                print(
-                    f"[MessageService.mark_message_as_read] Message.id value: {message.id if hasattr(message, 'id') else 'NO ID'}")
+                logger.debug(f"[mark_message_as_read] Message found: {message_id} (version {message.version})")
                 message.mark_as_read(datetime.now())
                 await uow.messages.save(message)
+                await uow.commit()
+                self._record_write(shard, message)
             else:
-                print(f"[MessageService.mark_message_as_read] Message not found: {message_id}")
+                logger.debug(f"[mark_message_as_read] Message not found: {message_id}")
                 raise ValueError(f"Message {message_id} not found")
 
             return message
 
+    async def mark_chat_as_read(self, chat_id: UUID, reader_id: UUID, up_to_message_id: UUID) -> ReadWatermark | None:
+        shard = self.shard_router.for_chat(chat_id, write=True)
+        async with get_unit_of_work(shard.primary, self.cache, self.archive) as uow:
+            watermark = await uow.read_watermarks.advance(chat_id, reader_id, up_to_message_id)
+            await uow.commit()
+            shard.record_write(chat_id, reader_id)
+            return watermark
+
     async def delete(self, message_id: UUID) -> None:
-        async with get_unit_of_work(self.connection_factory, self.cache) as uow:
+        shard = await self.shard_router.for_message(message_id, write=True)
+        async with get_unit_of_work(shard.primary, self.cache, self.archive) as uow:
             await uow.messages.delete(message_id)
             await uow.commit()
+            shard.record_write(message_id)
+
+    async def delete_messages(self, message_ids: list[UUID]) -> None:
+        for shard, shard_message_ids in await self.shard_router.group_messages(message_ids, write=True):
+            async with get_unit_of_work(shard.primary, self.cache, self.archive) as uow:
+                await uow.messages.delete_many(shard_message_ids)
+                await uow.commit()
+                shard.record_write(*shard_message_ids)
+
+    @staticmethod
+    def _build_message(
+            message_id: UUID,
+            sender_id: UUID,
+            recipient_id: UUID,
+            chat_id: UUID,
+            text: MessageText,
+            sent_at: datetime | None = None,
+            read_at: datetime | None = None,
+            edited_at: datetime | None = None,
+    ) -> Message:
+        message = Message(
+            message_id=message_id,
+            sender_id=sender_id,
+            recipient_id=recipient_id,
+            chat_id=chat_id,
+            text=text,
+            sent_at=sent_at,
+            read_at=read_at,
+            edited_at=edited_at,
+        )
+
+        message.add_domain_event(MessageCreatedEvent(
+            aggregate_id=message_id,
+            data={
+                "sender_id": sender_id,
+                "recipient_id": recipient_id,
+                "chat_id": chat_id,
+                "text": text.value,
+                "sent_at": message.sent_at,
+                "read_at": read_at,
+                "edited_at": edited_at,
+            }
+
+        ))
+
+        return message
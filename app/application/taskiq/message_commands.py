@@ -5,6 +5,8 @@ from LuminMessageService.app.application.commands.create import CreateMessageCom
 from LuminMessageService.app.application.commands.delete import DeleteMessageCommand
 from LuminMessageService.app.application.commands.edit_text import EditMessageTextCommand
 from LuminMessageService.app.application.commands.mark_as_read import MarkMessageAsReadCommand
+from LuminMessageService.app.application.commands.mark_chat_as_read import MarkChatAsReadCommand
+from LuminMessageService.app.application.commands.reconcile_unread_counters import ReconcileUnreadCountersCommand
 from LuminMessageService.app.application.queries.get_by_id import GetMessageByIDQuery
 from LuminMessageService.app.domain.models.common.value_objects import MessageText
 from LuminMessageService.app.infrastructure.dependency_container import DependencyContainer
@@ -46,20 +48,10 @@ if broker is not None:
             container: DependencyContainer = TaskiqDepends(get_dependency_container)
     ) -> dict:
         try:
-            print("=" * 50)
-            print("STARTING CREATE_USER_TASK")
-            print(f"User data received: {message_data}")
-
             if not container:
                 return {"success": False, "error": "DependencyContainer is None"}
 
-            print("Getting create user handler...")
             create_handler = await container.get_create_message_handler()
-            print(f"Create user handler obtained: {create_handler}")
-
-            message_service = await container.get_message_service()
-            print(f"Message service: {message_service}")
-            print(f"Connection factory: {message_service.connection_factory if message_service else 'None'}")
 
             command = CreateMessageCommand(
                 message_id=message_data["message_id"],
@@ -72,15 +64,14 @@ if broker is not None:
                 edited_at=message_data["edited_at"],
             )
 
-            print(f"Finishing create_user_task for user_id: {message_data["user_id"]}")
             result = await create_handler.handle(command)
+            logger.debug(f"create_message_task finished for message {message_data['message_id']}")
 
             return result
 
         except Exception as e:
-            print(f"ERROR in create_user_task: {str(e)}")
+            logger.error(f"Error in create_message_task: {e}")
             import traceback
-            print(f"📋 Traceback:\n{traceback.format_exc()}")
             return {
 
                 "success": False,
@@ -115,6 +106,29 @@ if broker is not None:
             }
 
 
+    @broker.task
+    async def mark_chat_as_read_task(
+            chat_id: str,
+            reader_id: str,
+            up_to_message_id: str,
+            container: DependencyContainer = TaskiqDepends(get_dependency_container)
+    ) -> dict:
+        try:
+            handler = await container.get_mark_chat_as_read_handler()
+
+            command = MarkChatAsReadCommand(UUID(chat_id), UUID(reader_id), UUID(up_to_message_id))
+
+            result = await handler.handle(command)
+            return result
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "task": "mark_chat_as_read"
+            }
+
+
     @broker.task
     async def edit_message_text_task(
             message_id: str,
@@ -198,3 +212,148 @@ if broker is not None:
                 "error": str(e),
                 "task": "change_username"
             }
+
+
+    @broker.task
+    async def reconcile_unread_counters_task(
+            recipient_id: str | None = None,
+            container: DependencyContainer = TaskiqDepends(get_dependency_container)
+    ) -> dict:
+        try:
+            handler = await container.get_reconcile_unread_counters_handler()
+
+            command = ReconcileUnreadCountersCommand(UUID(recipient_id) if recipient_id else None)
+
+            result = await handler.handle(command)
+            return result
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "task": "reconcile_unread_counters"
+            }
+
+
+    @broker.task
+    async def maintain_message_partitions_task(
+            container: DependencyContainer = TaskiqDepends(get_dependency_container)
+    ) -> dict:
+        try:
+            result = {"created": [], "expired": []}
+            for partition_manager in container.get_partition_managers():
+                shard_result = await partition_manager.maintain()
+                result["created"] += shard_result["created"]
+                result["expired"] += shard_result["expired"]
+
+            if result["expired"]:
+                message_service = await container.get_message_service()
+                await message_service.reconcile_unread_counters()
+
+            return {"success": True, **result}
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "task": "maintain_message_partitions"
+            }
+
+
+    @broker.task
+    async def relay_outbox_task(
+            max_batches: int | None = None,
+            container: DependencyContainer = TaskiqDepends(get_dependency_container)
+    ) -> dict:
+        try:
+            published = 0
+            for outbox_relay in await container.get_outbox_relays():
+                published += await outbox_relay.drain(max_batches)
+
+            return {"success": True, "published": published}
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "task": "relay_outbox"
+            }
+
+
+    @broker.task
+    async def compact_tombstones_task(
+            max_chunks: int | None = None,
+            container: DependencyContainer = TaskiqDepends(get_dependency_container)
+    ) -> dict:
+        try:
+            purged = 0
+            for compactor in container.get_tombstone_compactors():
+                purged += await compactor.compact(max_chunks)
+
+            return {"success": True, "purged": purged}
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "task": "compact_tombstones"
+            }
+
+
+    @broker.task
+    async def move_chat_task(
+            chat_id: str,
+            target_shard: int,
+            container: DependencyContainer = TaskiqDepends(get_dependency_container)
+    ) -> dict:
+        try:
+            resharder = await container.get_chat_resharder()
+            result = await resharder.move_chat(UUID(chat_id), target_shard)
+
+            return {"success": True, **result}
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "task": "move_chat"
+            }
+
+
+    @broker.task
+    async def archive_messages_task(
+            max_segments: int | None = None,
+            container: DependencyContainer = TaskiqDepends(get_dependency_container)
+    ) -> dict:
+        try:
+            archived = 0
+            for archiver in container.get_message_archivers():
+                archived += await archiver.archive(max_segments)
+
+            return {"success": True, "archived": archived}
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "task": "archive_messages"
+            }
+
+
+    @broker.task
+    async def sweep_derived_cache_task(
+            max_keys: int | None = None,
+            container: DependencyContainer = TaskiqDepends(get_dependency_container)
+    ) -> dict:
+        try:
+            sweeper = await container.get_derived_key_sweeper()
+            deleted = await sweeper.sweep(max_keys)
+
+            return {"success": True, "deleted": deleted}
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "task": "sweep_derived_cache"
+            }
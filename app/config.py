@@ -9,13 +9,59 @@ class Settings(BaseSettings):
     db_name: str = Field(default="LuminMessageDatabase", env="DB_NAME")
     db_user: str = Field(default="postgres", env="DB_USER")
     db_password: SecretStr = Field(default="(123)%111", env="DB_PASSWORD")
+    db_pool_min_size: int = Field(default=2, env="DB_POOL_MIN_SIZE")
+    db_pool_max_size: int = Field(default=10, env="DB_POOL_MAX_SIZE")
+    db_pool_acquire_timeout: float = Field(default=5.0, env="DB_POOL_ACQUIRE_TIMEOUT")
+    db_pool_max_idle_lifetime: float = Field(default=300.0, env="DB_POOL_MAX_IDLE_LIFETIME")
+
+    db_replica_dsns: list[str] = Field(default_factory=list, env="DB_REPLICA_DSNS")
+    db_replica_max_lag_seconds: float = Field(default=5.0, env="DB_REPLICA_MAX_LAG_SECONDS")
+    db_replica_health_interval: float = Field(default=2.0, env="DB_REPLICA_HEALTH_INTERVAL")
+    db_read_your_writes_window: float = Field(default=5.0, env="DB_READ_YOUR_WRITES_WINDOW")
+
+    db_shard_dsns: list[str] = Field(default_factory=list, env="DB_SHARD_DSNS")
+    db_shard_override_refresh_interval: float = Field(default=5.0, env="DB_SHARD_OVERRIDE_REFRESH_INTERVAL")
+    db_shard_route_cache_size: int = Field(default=100_000, env="DB_SHARD_ROUTE_CACHE_SIZE")
+
+    messages_partitions_ahead: int = Field(default=3, env="MESSAGES_PARTITIONS_AHEAD")
+    messages_retention_months: int = Field(default=12, env="MESSAGES_RETENTION_MONTHS")
+    messages_retention_detach_only: bool = Field(default=False, env="MESSAGES_RETENTION_DETACH_ONLY")
 
     redis_host: str = Field(default="localhost", env="REDIS_HOST")
     redis_port: int = Field(default=6379, env="REDIS_PORT")
     redis_password: SecretStr = Field("", env="REDIS_PASSWORD")
     redis_db: int = Field(default=0, env="REDIS_DB")
+    redis_fill_lease_ms: int = Field(default=0, env="REDIS_FILL_LEASE_MS")
+    redis_absent_ttl: int = Field(default=30, env="REDIS_ABSENT_TTL")
+    redis_soft_ttl: int = Field(default=300, env="REDIS_SOFT_TTL")
+    redis_hard_ttl: int = Field(default=3600, env="REDIS_HARD_TTL")
+    redis_ttl_jitter: float = Field(default=0.1, env="REDIS_TTL_JITTER")
+    local_absent_ttl: float = Field(default=2.0, env="LOCAL_ABSENT_TTL")
+
+    cache_sweep_max_keys_per_second: int = Field(default=5000, env="CACHE_SWEEP_MAX_KEYS_PER_SECOND")
+    cache_sweep_max_keys_per_run: int = Field(default=1_000_000, env="CACHE_SWEEP_MAX_KEYS_PER_RUN")
+
+    local_cache_max_entries: int = Field(default=50_000, env="LOCAL_CACHE_MAX_ENTRIES")
+    local_cache_max_bytes: int = Field(default=64 * 1024 * 1024, env="LOCAL_CACHE_MAX_BYTES")
+    local_cache_ttl_seconds: float = Field(default=300.0, env="LOCAL_CACHE_TTL_SECONDS")
 
     nats_url: str = Field(default="nats://localhost:4222", env="NATS_URL")
+    l1_invalidation_enabled: bool = Field(default=True, env="L1_INVALIDATION_ENABLED")
+    l1_invalidation_subject: str = Field(default="message_service.cache.l1_invalidate", env="L1_INVALIDATION_SUBJECT")
+    l1_degraded_local_ttl: float = Field(default=1.0, env="L1_DEGRADED_LOCAL_TTL")
+    outbox_batch_size: int = Field(default=500, env="OUTBOX_BATCH_SIZE")
+    outbox_poll_interval: float = Field(default=0.5, env="OUTBOX_POLL_INTERVAL")
+    outbox_sent_retention_seconds: float = Field(default=86400.0, env="OUTBOX_SENT_RETENTION_SECONDS")
+
+    archive_directory: str = Field(default="archive", env="ARCHIVE_DIRECTORY")
+    archive_after_days: int = Field(default=90, env="ARCHIVE_AFTER_DAYS")
+    archive_segment_rows: int = Field(default=100_000, env="ARCHIVE_SEGMENT_ROWS")
+    archive_cached_row_groups: int = Field(default=256, env="ARCHIVE_CACHED_ROW_GROUPS")
+
+    tombstone_retention_seconds: float = Field(default=604800.0, env="TOMBSTONE_RETENTION_SECONDS")
+    tombstone_compaction_chunk_size: int = Field(default=500, env="TOMBSTONE_COMPACTION_CHUNK_SIZE")
+    tombstone_compaction_pause: float = Field(default=0.2, env="TOMBSTONE_COMPACTION_PAUSE")
+    tombstone_compaction_max_chunks: int = Field(default=100, env="TOMBSTONE_COMPACTION_MAX_CHUNKS")
 
     app_env: str = Field(default="development", env="APP_ENV")
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
@@ -11,15 +11,19 @@ class DomainEvent:
     data: Dict[str, Any]
     occurred_at: datetime = None
     version: int = 1
+    event_id: uuid.UUID = None
 
     def __post_init__(self):
         if self.occurred_at is None:
             self.occurred_at = datetime.now()
+        if self.event_id is None:
+            self.event_id = uuid.uuid4()
 
     def to_dict(self) -> Dict[str, Any]:
         result = asdict(self)
         result['occurred_at'] = self.occurred_at.isoformat()
         result['aggregate_id'] = str(self.aggregate_id)
+        result['event_id'] = str(self.event_id)
         return result
 
     @classmethod
@@ -28,4 +32,6 @@ class DomainEvent:
             data['occurred_at'] = datetime.fromisoformat(data['occurred_at'])
         if isinstance(data['aggregate_id'], str):
             data['aggregate_id'] = uuid.UUID(data['aggregate_id'])
+        if isinstance(data.get('event_id'), str):
+            data['event_id'] = uuid.UUID(data['event_id'])
         return cls(**data)
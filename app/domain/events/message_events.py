@@ -42,3 +42,23 @@ class MessageEditedEvent(DomainEvent):
             aggregate_id=aggregate_id,
             data=data
         )
+
+
+@dataclass
+class MessageDeletedEvent(DomainEvent):
+    def __init__(self, aggregate_id: UUID, data: dict[str, Any]) -> None:
+        super().__init__(
+            event_type="MessageDeletedEvent",
+            aggregate_id=aggregate_id,
+            data=data
+        )
+
+
+@dataclass
+class MessagesReadUpToEvent(DomainEvent):
+    def __init__(self, aggregate_id: UUID, data: dict[str, Any]) -> None:
+        super().__init__(
+            event_type="MessagesReadUpToEvent",
+            aggregate_id=aggregate_id,
+            data=data
+        )
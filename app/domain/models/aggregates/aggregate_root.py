@@ -21,6 +21,10 @@ class AggregateRoot(ABC):
     def version(self) -> int:
         return self._version
 
+    @property
+    def expected_version(self) -> int:
+        return self._expected_version
+
     @property
     def created_at(self) -> datetime:
         return self._created_at
@@ -44,6 +48,10 @@ class AggregateRoot(ABC):
     def clear_domain_events(self) -> None:
         self._domain_events.clear()
 
+    def mark_as_persisted(self, version: int) -> None:
+        self._version = version
+        self._expected_version = version
+
     def _increment_version(self) -> None:
         self._version += 1
         self._updated_at = datetime.now()
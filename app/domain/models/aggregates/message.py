@@ -1,6 +1,7 @@
 from datetime import datetime
 from uuid import UUID, uuid4
-from LuminMessageService.app.domain.events.message_events import MessageSentEvent, MessageReadEvent, MessageEditedEvent
+from LuminMessageService.app.domain.events.message_events import (MessageSentEvent, MessageReadEvent, MessageEditedEvent,
+                                                                  MessageDeletedEvent)
 from LuminMessageService.app.domain.models.aggregates.aggregate_root import AggregateRoot
 from LuminMessageService.app.domain.models.common.exceptions import (SenderIDCannotBeEmptyError,
                                                                      RecipientIDCannotBeEmptyError,
@@ -11,7 +12,7 @@ from LuminMessageService.app.domain.models.common.exceptions import (SenderIDCan
                                                                      CannotEditDeletedMessageError,
                                                                      NewTextCannotBeEmptyError, MessageIsTooLongError,
                                                                      DeletedMessageCannotBeMarkedAsReadError)
-from LuminMessageService.app.domain.models.common.value_objects import MessageText
+from LuminMessageService.app.domain.models.common.value_objects import MessageText, ReadWatermark
 
 
 class Message(AggregateRoot):
@@ -38,6 +39,7 @@ class Message(AggregateRoot):
         self._read_at = read_at
         self._edited_at = edited_at
         self._is_deleted = False
+        self._read_watermark: ReadWatermark | None = None
 
         self.add_domain_event(
             MessageSentEvent(
@@ -79,7 +81,7 @@ class Message(AggregateRoot):
     def mark_as_read(self, read_at: datetime | None = None) -> None:
         if self._is_deleted:
             raise CannotReadDeletedMessageError("Cannot read deleted message")
-        if self._read_at:
+        if self.is_read:
             return None
 
         self._read_at = read_at or datetime.now()
@@ -109,13 +111,19 @@ class Message(AggregateRoot):
             MessageEditedEvent(
                 aggregate_id=self.id,
                 data={
-                    'old_text': old_text,
+                    'old_text': old_text.value,
                     'new_text': self._text.value,
                     'edited_at': self._edited_at.isoformat()
                 }
             )
         )
 
+    def apply_read_watermark(self, watermark: ReadWatermark) -> None:
+        if watermark.chat_id != self._chat_id or watermark.reader_id != self._recipient_id:
+            return
+        if self._read_watermark is None or not self._read_watermark.covers(watermark.sent_at, watermark.message_id):
+            self._read_watermark = watermark
+
     def delete(self) -> None:
         if self._is_deleted:
             return
@@ -123,6 +131,13 @@ class Message(AggregateRoot):
         self._is_deleted = True
         self._increment_version()
 
+        self.add_domain_event(
+            MessageDeletedEvent(
+                aggregate_id=self.id,
+                data={'chat_id': str(self._chat_id), 'recipient_id': str(self._recipient_id)}
+            )
+        )
+
     @property
     def sender_id(self) -> UUID:
         return self._sender_id
@@ -151,9 +166,15 @@ class Message(AggregateRoot):
     def edited_at(self) -> datetime | None:
         return self._edited_at
 
+    @property
+    def read_watermark(self) -> ReadWatermark | None:
+        return self._read_watermark
+
     @property
     def is_read(self) -> bool:
-        return self._read_at is not None
+        if self._read_at is not None:
+            return True
+        return self._read_watermark is not None and self._read_watermark.covers(self._sent_at, self.id)
 
     @property
     def is_edited(self) -> bool:
@@ -36,3 +36,19 @@ class MessageIsTooLongError(Exception):
 
 class DeletedMessageCannotBeMarkedAsReadError(Exception):
     pass
+
+
+class MessageVersionConflictError(Exception):
+    pass
+
+
+class InvalidCursorError(Exception):
+    pass
+
+
+class ChatMigrationInProgressError(Exception):
+    pass
+
+
+class CacheCodecError(Exception):
+    pass
@@ -1,5 +1,13 @@
+import base64
+import binascii
 from dataclasses import dataclass
-from LuminMessageService.app.domain.models.common.exceptions import MessageIsTooLongError, MessageTextCannotBeEmptyError
+from datetime import datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+from LuminMessageService.app.domain.models.common.exceptions import (MessageIsTooLongError,
+                                                                     MessageTextCannotBeEmptyError,
+                                                                     InvalidCursorError)
 
 
 @dataclass(frozen=True)
@@ -18,3 +26,67 @@ class MessageText:
 
     def __eq__(self, other):
         return isinstance(other, MessageText) and self._text == other._text
+
+
+class HistoryDirection(Enum):
+    OLDER = "older"
+    NEWER = "newer"
+
+
+@dataclass(frozen=True)
+class MessageCursor:
+    sent_at: datetime
+    message_id: UUID
+
+    def encode(self) -> str:
+        raw = f"{self.sent_at.isoformat()}|{self.message_id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "MessageCursor":
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode()
+            sent_at, message_id = raw.split("|")
+            return cls(sent_at=datetime.fromisoformat(sent_at), message_id=UUID(message_id))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise InvalidCursorError(f"Invalid cursor: {value}") from e
+
+
+@dataclass(frozen=True)
+class SearchCursor:
+    rank: float
+    message_id: UUID
+
+    def encode(self) -> str:
+        raw = f"{self.rank!r}|{self.message_id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "SearchCursor":
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode()
+            rank, message_id = raw.split("|")
+            return cls(rank=float(rank), message_id=UUID(message_id))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise InvalidCursorError(f"Invalid cursor: {value}") from e
+
+
+@dataclass(frozen=True)
+class ReadWatermark:
+    chat_id: UUID
+    reader_id: UUID
+    sent_at: datetime
+    message_id: UUID
+
+    def covers(self, sent_at: datetime, message_id: UUID) -> bool:
+        return (sent_at, message_id) <= (self.sent_at, self.message_id)
+
+
+@dataclass(frozen=True)
+class ChatChange:
+    chat_id: UUID
+    seq: int
+    message_id: UUID
+    change_type: str
+    data: dict[str, Any]
+    changed_at: datetime
@@ -1,6 +1,31 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
 from uuid import UUID
+from LuminMessageService.app.domain.events.domain_event import DomainEvent
 from LuminMessageService.app.domain.models.aggregates.message import Message
+from LuminMessageService.app.domain.models.common.value_objects import (HistoryDirection, MessageCursor, ReadWatermark,
+                                                                        ChatChange, SearchCursor)
+
+
+@dataclass
+class MessagePage:
+    messages: list[Message]
+    older_cursor: MessageCursor | None = None
+    newer_cursor: MessageCursor | None = None
+
+
+@dataclass
+class MessageSearchPage:
+    hits: list[tuple[Message, float]]
+    next_cursor: SearchCursor | None = None
+
+
+@dataclass
+class ChatChangePage:
+    changes: list[ChatChange]
+    last_seq: int
+    has_more: bool = False
 
 
 class MessageRepository(ABC):
@@ -15,3 +40,74 @@ class MessageRepository(ABC):
     @abstractmethod
     def delete(self, message_id: UUID) -> None:
         pass
+
+    @abstractmethod
+    def save_many(self, messages: list[Message]) -> None:
+        pass
+
+    @abstractmethod
+    def get_many(self, message_ids: list[UUID]) -> list[Message]:
+        pass
+
+    @abstractmethod
+    def delete_many(self, message_ids: list[UUID]) -> None:
+        pass
+
+    @abstractmethod
+    def get_chat_history(
+            self,
+            chat_id: UUID,
+            limit: int,
+            cursor: MessageCursor | None = None,
+            direction: HistoryDirection = HistoryDirection.OLDER,
+    ) -> MessagePage:
+        pass
+
+    @abstractmethod
+    def stream_chat_messages(self, chat_id: UUID, batch_size: int) -> AsyncIterator[list[dict[str, Any]]]:
+        pass
+
+    @abstractmethod
+    def search(
+            self,
+            query: str,
+            limit: int,
+            chat_id: UUID | None = None,
+            participant_id: UUID | None = None,
+            cursor: SearchCursor | None = None,
+    ) -> MessageSearchPage:
+        pass
+
+
+class UnreadCounterRepository(ABC):
+    @abstractmethod
+    def get(self, recipient_id: UUID, chat_id: UUID) -> int:
+        pass
+
+    @abstractmethod
+    def get_for_recipient(self, recipient_id: UUID) -> dict[UUID, int]:
+        pass
+
+    @abstractmethod
+    def reconcile(self, recipient_id: UUID | None = None) -> int:
+        pass
+
+
+class ReadWatermarkRepository(ABC):
+    @abstractmethod
+    def advance(self, chat_id: UUID, reader_id: UUID, up_to_message_id: UUID) -> ReadWatermark | None:
+        pass
+
+    @abstractmethod
+    def get_many(self, keys: set[tuple[UUID, UUID]]) -> dict[tuple[UUID, UUID], ReadWatermark]:
+        pass
+
+
+class ChatChangeRepository(ABC):
+    @abstractmethod
+    def record(self, changes: list[tuple[UUID, UUID, DomainEvent]]) -> None:
+        pass
+
+    @abstractmethod
+    def get_since(self, chat_id: UUID, since_seq: int, limit: int) -> ChatChangePage:
+        pass
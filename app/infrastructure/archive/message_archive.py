@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+from uuid import UUID
+from LuminMessageService.app.domain.models.common.value_objects import MessageCursor
+from LuminMessageService.app.infrastructure.archive.segment import RowGroup, Segment, SEGMENT_SUFFIX, write_segment
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ArchiveConfig:
+    directory: str = "archive"
+    archive_after_days: int = 90
+    segment_rows: int = 100_000
+    row_group_rows: int = 1024
+    max_segments_per_run: int = 10
+    cached_row_groups: int = 256
+    refresh_interval: float = 1.0
+
+
+class MessageArchive:
+    def __init__(self, config: Optional[ArchiveConfig] = None) -> None:
+        self.config = config or ArchiveConfig()
+        self._segments: list[Segment] = []
+        self._row_groups: OrderedDict[tuple[str, int], RowGroup] = OrderedDict()
+        self._refreshed_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+        self.stats = {"lookups": 0, "hits": 0, "row_group_reads": 0, "row_group_cache_hits": 0}
+
+    @property
+    def segments(self) -> list[Segment]:
+        return self._segments
+
+    async def refresh(self, force: bool = False) -> None:
+        if not force and time.monotonic() - self._refreshed_at < self.config.refresh_interval:
+            return
+
+        async with self._refresh_lock:
+            known = {segment.name: segment for segment in self._segments}
+            self._segments = await asyncio.to_thread(self._scan, known)
+            self._refreshed_at = time.monotonic()
+
+    def _scan(self, known: dict[str, Segment]) -> list[Segment]:
+        if not os.path.isdir(self.config.directory):
+            return []
+
+        segments = []
+        for name in sorted(os.listdir(self.config.directory), reverse=True):
+            if not name.endswith(SEGMENT_SUFFIX):
+                continue
+            segment = known.get(name)
+            if segment is None:
+                try:
+                    segment = Segment(os.path.join(self.config.directory, name))
+                except Exception as e:
+                    logger.error(f"❌ Skipping unreadable archive segment {name}: {e}")
+                    continue
+            segments.append(segment)
+        return segments
+
+    async def write(self, rows: list[dict[str, Any]]) -> str:
+        path = await asyncio.to_thread(write_segment, self.config.directory, rows, self.config.row_group_rows)
+        await self.refresh(force=True)
+        return path
+
+    async def _row_group(self, segment: Segment, group: int) -> RowGroup:
+        key = (segment.name, group)
+        row_group = self._row_groups.get(key)
+        if row_group is not None:
+            self._row_groups.move_to_end(key)
+            self.stats["row_group_cache_hits"] += 1
+            return row_group
+
+        row_group = await asyncio.to_thread(segment.read_row_group, group)
+        self.stats["row_group_reads"] += 1
+        self._row_groups[key] = row_group
+        while len(self._row_groups) > self.config.cached_row_groups:
+            self._row_groups.popitem(last=False)
+        return row_group
+
+    async def get_many(self, message_ids: list[UUID]) -> dict[UUID, dict[str, Any]]:
+        await self.refresh()
+        self.stats["lookups"] += len(message_ids)
+
+        found: dict[UUID, dict[str, Any]] = {}
+        for segment in self._segments:
+            for message_id in message_ids:
+                if message_id in found:
+                    continue
+                position = segment.find(message_id)
+                if position is not None:
+                    row_group = await self._row_group(segment, position // segment.row_group_rows)
+                    found[message_id] = row_group.row(position % segment.row_group_rows)
+
+        self.stats["hits"] += len(found)
+        return found
+
+    async def chat_history(
+            self,
+            chat_id: UUID,
+            limit: int,
+            cursor: MessageCursor | None = None,
+            older: bool = True,
+    ) -> list[dict[str, Any]]:
+        await self.refresh()
+
+        rows: dict[UUID, dict[str, Any]] = {}
+        for segment in self._segments:
+            chat_range = segment.chat_range(chat_id)
+            if chat_range is None:
+                continue
+            if cursor and older and segment.min_sent_at and segment.min_sent_at > cursor.sent_at:
+                continue
+            if cursor and not older and segment.max_sent_at and segment.max_sent_at < cursor.sent_at:
+                continue
+
+            for row in await self._chat_rows(segment, *chat_range, limit, cursor, older):
+                rows.setdefault(row["message_id"], row)
+
+        ordered = sorted(rows.values(), key=lambda row: (row["sent_at"], row["message_id"]), reverse=older)
+        return [row for row in ordered if not row["is_deleted"]][:limit]
+
+    async def _chat_rows(
+            self,
+            segment: Segment,
+            start: int,
+            end: int,
+            limit: int,
+            cursor: MessageCursor | None,
+            older: bool,
+    ) -> list[dict[str, Any]]:
+        groups = range(start // segment.row_group_rows, (end - 1) // segment.row_group_rows + 1)
+        rows = []
+        visible = 0
+        for group in (reversed(groups) if older else groups):
+            if cursor:
+                min_sent_at, max_sent_at = segment.row_group_bounds(group)
+                if (older and min_sent_at > cursor.sent_at) or (not older and max_sent_at < cursor.sent_at):
+                    continue
+
+            row_group = await self._row_group(segment, group)
+            group_start = group * segment.row_group_rows
+            chat_rows = row_group.rows(start - group_start, end - group_start)
+            for row in (reversed(chat_rows) if older else chat_rows):
+                if cursor:
+                    key = (row["sent_at"], row["message_id"])
+                    if (older and key >= (cursor.sent_at, cursor.message_id)) or \
+                            (not older and key <= (cursor.sent_at, cursor.message_id)):
+                        continue
+                rows.append(row)
+                visible += not row["is_deleted"]
+
+            if visible >= limit:
+                break
+        return rows
+
+    def get_metrics(self) -> dict:
+        return {
+            **self.stats,
+            "segments": len(self._segments),
+            "archived_rows": sum(segment.rows for segment in self._segments),
+            "cached_row_groups": len(self._row_groups),
+        }
@@ -0,0 +1,60 @@
+import logging
+from LuminMessageService.app.infrastructure.archive.message_archive import MessageArchive
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool
+
+logger = logging.getLogger(__name__)
+
+SELECT_ARCHIVABLE_SQL = """
+SELECT
+    m.message_id, m.sender_id, m.recipient_id, m.chat_id, m.text,
+    m.sent_at, m.read_at, m.edited_at, m.version, m.deleted_at IS NOT NULL AS is_deleted
+FROM messages AS m
+LEFT JOIN read_watermarks AS w ON w.chat_id = m.chat_id AND w.reader_id = m.recipient_id
+WHERE m.sent_at < now() - make_interval(days => $1)
+AND (
+    m.read_at IS NOT NULL
+    OR m.deleted_at IS NOT NULL
+    OR (m.sent_at, m.message_id) <= (w.sent_at, w.message_id)
+)
+ORDER BY m.chat_id, m.sent_at, m.message_id
+LIMIT $2
+FOR UPDATE OF m SKIP LOCKED
+"""
+
+
+class MessageArchiver:
+    def __init__(self, connection_pool: DatabasePool, archive: MessageArchive) -> None:
+        self.connection_pool = connection_pool
+        self.archive = archive
+        self.config = archive.config
+        self.stats = {"segments": 0, "archived": 0}
+
+    async def archive_once(self) -> int:
+        async with self.connection_pool.acquire() as conn:
+            async with conn.transaction():
+                rows = await conn.fetch(
+                    SELECT_ARCHIVABLE_SQL, self.config.archive_after_days, self.config.segment_rows
+                )
+                if not rows:
+                    return 0
+
+                path = await self.archive.write([dict(row) for row in rows])
+
+                message_ids = [row["message_id"] for row in rows]
+                await conn.execute("DELETE FROM message_events WHERE aggregate_id = ANY($1::uuid[])", message_ids)
+                await conn.execute("DELETE FROM message_snapshots WHERE aggregate_id = ANY($1::uuid[])", message_ids)
+                await conn.execute("DELETE FROM messages WHERE message_id = ANY($1::uuid[])", message_ids)
+
+        self.stats["segments"] += 1
+        self.stats["archived"] += len(rows)
+        logger.info(f"✅ Archived {len(rows)} messages to {path}")
+        return len(rows)
+
+    async def archive(self, max_segments: int | None = None) -> int:
+        archived = 0
+        for _ in range(max_segments or self.config.max_segments_per_run):
+            count = await self.archive_once()
+            archived += count
+            if count < self.config.segment_rows:
+                break
+        return archived
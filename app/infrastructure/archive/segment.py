@@ -0,0 +1,196 @@
+import json
+import os
+import struct
+import zlib
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Optional
+from uuid import UUID, uuid4
+
+SEGMENT_MAGIC = b"LMSEG001"
+SEGMENT_SUFFIX = ".seg"
+EPOCH = datetime(1970, 1, 1)
+NULL_TIMESTAMP = -(2 ** 63)
+
+UUID_COLUMNS = ("message_id", "sender_id", "recipient_id", "chat_id")
+TIMESTAMP_COLUMNS = ("sent_at", "read_at", "edited_at")
+
+
+def _to_micros(value: Optional[datetime]) -> int:
+    if value is None:
+        return NULL_TIMESTAMP
+    return (value.replace(tzinfo=None) - EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(value: int) -> Optional[datetime]:
+    if value == NULL_TIMESTAMP:
+        return None
+    return EPOCH + timedelta(microseconds=value)
+
+
+def _encode_row_group(rows: list[dict[str, Any]]) -> dict[str, bytes]:
+    columns = {}
+    for name in UUID_COLUMNS:
+        columns[name] = b"".join(row[name].bytes for row in rows)
+    for name in TIMESTAMP_COLUMNS:
+        columns[name] = array("q", (_to_micros(row[name]) for row in rows)).tobytes()
+    columns["version"] = array("i", (row["version"] or 0 for row in rows)).tobytes()
+    columns["is_deleted"] = bytes(1 if row.get("is_deleted") else 0 for row in rows)
+
+    texts = [row["text"].encode() for row in rows]
+    columns["text_lengths"] = array("I", (len(text) for text in texts)).tobytes()
+    columns["text"] = b"".join(texts)
+
+    return {name: zlib.compress(data, 6) for name, data in columns.items()}
+
+
+class RowGroup:
+    def __init__(self, blocks: dict[str, bytes], count: int) -> None:
+        self.count = count
+        self._decoded: dict[int, dict[str, Any]] = {}
+        self._raw = {name: zlib.decompress(data) for name, data in blocks.items()}
+
+        self._timestamps = {}
+        for name in TIMESTAMP_COLUMNS:
+            values = array("q")
+            values.frombytes(self._raw[name])
+            self._timestamps[name] = values
+        self._versions = array("i")
+        self._versions.frombytes(self._raw["version"])
+
+        lengths = array("I")
+        lengths.frombytes(self._raw["text_lengths"])
+        self._text_offsets = [0]
+        for length in lengths:
+            self._text_offsets.append(self._text_offsets[-1] + length)
+
+    def row(self, index: int) -> dict[str, Any]:
+        row = self._decoded.get(index)
+        if row is None:
+            row = self._decoded[index] = self._decode(index)
+        return dict(row)
+
+    def _decode(self, index: int) -> dict[str, Any]:
+        return {
+            **{name: UUID(bytes=self._raw[name][index * 16:(index + 1) * 16]) for name in UUID_COLUMNS},
+            "text": self._raw["text"][self._text_offsets[index]:self._text_offsets[index + 1]].decode(),
+            **{name: _from_micros(self._timestamps[name][index]) for name in TIMESTAMP_COLUMNS},
+            "version": self._versions[index],
+            "is_deleted": bool(self._raw["is_deleted"][index]),
+        }
+
+    def rows(self, start: int, end: int) -> list[dict[str, Any]]:
+        return [self.row(index) for index in range(max(start, 0), min(end, self.count))]
+
+
+def write_segment(directory: str, rows: list[dict[str, Any]], row_group_rows: int = 1024) -> str:
+    rows = sorted(rows, key=lambda row: (row["chat_id"], row["sent_at"], row["message_id"]))
+    created_at = datetime.now()
+    name = f"{created_at:%Y%m%d%H%M%S%f}-{uuid4().hex}{SEGMENT_SUFFIX}"
+    path = os.path.join(directory, name)
+    temp_path = path + ".tmp"
+
+    chats: dict[str, list] = {}
+    for position, row in enumerate(rows):
+        chat = chats.setdefault(row["chat_id"].hex, [position, 0])
+        chat[1] += 1
+
+    os.makedirs(directory, exist_ok=True)
+    row_groups = []
+    with open(temp_path, "wb") as file:
+        file.write(SEGMENT_MAGIC)
+
+        for start in range(0, len(rows), row_group_rows):
+            group = rows[start:start + row_group_rows]
+            columns = {}
+            for column, block in _encode_row_group(group).items():
+                columns[column] = [file.tell(), len(block)]
+                file.write(block)
+            row_groups.append({
+                "rows": len(group),
+                "columns": columns,
+                "min_sent_at": _to_micros(min(row["sent_at"] for row in group)),
+                "max_sent_at": _to_micros(max(row["sent_at"] for row in group)),
+            })
+
+        index = sorted((row["message_id"].bytes, position) for position, row in enumerate(rows))
+        index_offset = file.tell()
+        file.write(b"".join(message_id for message_id, _ in index))
+        file.write(array("I", (position for _, position in index)).tobytes())
+
+        footer = zlib.compress(json.dumps({
+            "rows": len(rows),
+            "row_group_rows": row_group_rows,
+            "row_groups": row_groups,
+            "chats": chats,
+            "index_offset": index_offset,
+            "min_sent_at": _to_micros(min(row["sent_at"] for row in rows)) if rows else None,
+            "max_sent_at": _to_micros(max(row["sent_at"] for row in rows)) if rows else None,
+            "created_at": created_at.isoformat(),
+        }).encode())
+        file.write(footer)
+        file.write(struct.pack("<Q", len(footer)))
+        file.write(SEGMENT_MAGIC)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temp_path, path)
+    return path
+
+
+class Segment:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.name = os.path.basename(path)
+
+        with open(path, "rb") as file:
+            file.seek(-(8 + len(SEGMENT_MAGIC)), os.SEEK_END)
+            footer_length = struct.unpack("<Q", file.read(8))[0]
+            if file.read(len(SEGMENT_MAGIC)) != SEGMENT_MAGIC:
+                raise ValueError(f"{path} is not a message segment")
+
+            file.seek(-(8 + len(SEGMENT_MAGIC) + footer_length), os.SEEK_END)
+            meta = json.loads(zlib.decompress(file.read(footer_length)))
+
+            self.rows: int = meta["rows"]
+            self.row_group_rows: int = meta["row_group_rows"]
+            self.row_groups: list[dict] = meta["row_groups"]
+            self.chats: dict[str, list[int]] = meta["chats"]
+            self.min_sent_at = _from_micros(meta["min_sent_at"]) if meta["min_sent_at"] is not None else None
+            self.max_sent_at = _from_micros(meta["max_sent_at"]) if meta["max_sent_at"] is not None else None
+
+            file.seek(meta["index_offset"])
+            self._index_ids = file.read(self.rows * 16)
+            self._index_positions = array("I")
+            self._index_positions.frombytes(file.read(self.rows * 4))
+
+    def find(self, message_id: UUID) -> Optional[int]:
+        key = message_id.bytes
+        low, high = 0, self.rows
+        while low < high:
+            middle = (low + high) // 2
+            if self._index_ids[middle * 16:(middle + 1) * 16] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self.rows and self._index_ids[low * 16:(low + 1) * 16] == key:
+            return self._index_positions[low]
+        return None
+
+    def chat_range(self, chat_id: UUID) -> Optional[tuple[int, int]]:
+        chat = self.chats.get(chat_id.hex)
+        return (chat[0], chat[0] + chat[1]) if chat else None
+
+    def row_group_bounds(self, group: int) -> tuple[datetime, datetime]:
+        meta = self.row_groups[group]
+        return _from_micros(meta["min_sent_at"]), _from_micros(meta["max_sent_at"])
+
+    def read_row_group(self, group: int) -> RowGroup:
+        meta = self.row_groups[group]
+        blocks = {}
+        with open(self.path, "rb") as file:
+            for column, (offset, length) in meta["columns"].items():
+                file.seek(offset)
+                blocks[column] = file.read(length)
+        return RowGroup(blocks, meta["rows"])
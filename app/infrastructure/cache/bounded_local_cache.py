@@ -0,0 +1,98 @@
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class LocalCacheConfig:
+    max_entries: int = 50_000
+    max_bytes: int = 64 * 1024 * 1024
+    ttl_seconds: float = 300.0
+
+
+class BoundedLocalCache(Generic[K, V]):
+    def __init__(
+            self,
+            config: Optional[LocalCacheConfig] = None,
+            sizeof: Callable[[V], int] = sys.getsizeof
+    ) -> None:
+        self.config = config or LocalCacheConfig()
+        self.sizeof = sizeof
+        self._entries: OrderedDict[K, tuple[V, float, int]] = OrderedDict()
+        self._bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, record=False) is not None
+
+    def get(self, key: K, record: bool = True) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            if record:
+                self.stats["misses"] += 1
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at < time.monotonic():
+            self._drop(key)
+            self.stats["expirations"] += 1
+            if record:
+                self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if record:
+            self.stats["hits"] += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        size = self.sizeof(value)
+        if size > self.config.max_bytes:
+            self.remove(key)
+            return
+
+        self._drop(key)
+        expires_at = time.monotonic() + (self.config.ttl_seconds if ttl is None else ttl)
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+        self._evict()
+
+    def remove(self, key: K) -> None:
+        self._drop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def get_metrics(self) -> dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_ratio": self.stats["hits"] / lookups if lookups else None,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.config.max_entries,
+            "max_bytes": self.config.max_bytes,
+            "ttl_seconds": self.config.ttl_seconds,
+        }
+
+    def _drop(self, key: K) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _evict(self) -> None:
+        while self._entries and (
+                len(self._entries) > self.config.max_entries or self._bytes > self.config.max_bytes
+        ):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.stats["evictions"] += 1
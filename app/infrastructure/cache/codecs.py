@@ -0,0 +1,229 @@
+import json
+import pickle
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from uuid import UUID
+from LuminMessageService.app.domain.models.common.exceptions import CacheCodecError
+
+MESSAGE_TAG = 0xB1
+JSON_TAG = 0xB2
+TOMBSTONE_TAG = 0xB3
+WATERMARK_TAG = 0xB4
+ABSENT_TAG = 0xB5
+ENVELOPE_TAG = 0xB6
+PICKLE_PROTOCOL_MARKER = 0x80
+
+MESSAGE_SCHEMA_VERSION = 1
+MESSAGE_FIELDS = frozenset({
+    "message_id", "sender_id", "recipient_id", "chat_id", "text", "sent_at", "read_at", "edited_at", "version",
+})
+# Repository rows carry is_deleted and folded histories have no is_read; neither is stored beyond the IS_READ flag.
+OPTIONAL_MESSAGE_FIELDS = frozenset({"is_read", "is_deleted"})
+
+EPOCH = datetime(1970, 1, 1)
+
+HAS_READ_AT = 0x01
+HAS_EDITED_AT = 0x02
+IS_READ = 0x04
+TZ_AWARE = 0x08
+
+# tag, schema version, flags, 4 uuids, sent_at, version
+MESSAGE_HEADER = struct.Struct("!BBB16s16s16s16sqI")
+TIMESTAMP = struct.Struct("!q")
+WATERMARK = struct.Struct("!BB16sq")
+# tag, soft expiry (unix seconds), recompute time in seconds
+ENVELOPE = struct.Struct("!Bdf")
+
+
+@dataclass(frozen=True)
+class CacheEnvelope:
+    value: Any
+    soft_expires_at: float
+    delta: float = 0.0
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(value: int, aware: bool) -> datetime:
+    moment = EPOCH + timedelta(microseconds=value)
+    return moment.replace(tzinfo=timezone.utc) if aware else moment
+
+
+def _is_message_record(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and MESSAGE_FIELDS <= value.keys() <= MESSAGE_FIELDS | OPTIONAL_MESSAGE_FIELDS
+        and not value.get("is_deleted")
+        and all(isinstance(value[name], UUID) for name in ("message_id", "sender_id", "recipient_id", "chat_id"))
+        and isinstance(value["text"], str)
+        and isinstance(value["sent_at"], datetime)
+        and all(
+            value[name] is None
+            or isinstance(value[name], datetime) and (value[name].tzinfo is None) == (value["sent_at"].tzinfo is None)
+            for name in ("read_at", "edited_at")
+        )
+        and isinstance(value["version"], int)
+        and 0 <= value["version"] < 2 ** 32
+    )
+
+
+def _is_watermark(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and value.keys() == {"sent_at", "message_id"}
+        and (value["sent_at"] is None) == (value["message_id"] is None)
+        and (value["sent_at"] is None or isinstance(value["sent_at"], datetime))
+        and (value["message_id"] is None or isinstance(value["message_id"], UUID))
+    )
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return {"$uuid": str(value)}
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not cache serializable")
+
+
+def _json_object_hook(value: dict) -> Any:
+    if len(value) == 1:
+        if "$uuid" in value:
+            return UUID(value["$uuid"])
+        if "$datetime" in value:
+            return datetime.fromisoformat(value["$datetime"])
+    return value
+
+
+class CacheCodec:
+    def encode(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class BinaryCacheCodec(CacheCodec):
+    def __init__(self, read_legacy_pickle: bool = True) -> None:
+        self.read_legacy_pickle = read_legacy_pickle
+
+    def encode(self, value: Any) -> bytes:
+        if isinstance(value, CacheEnvelope):
+            return ENVELOPE.pack(ENVELOPE_TAG, value.soft_expires_at, value.delta) + self.encode(value.value)
+        if value == {"deleted": True}:
+            return bytes((TOMBSTONE_TAG,))
+        if value == {"absent": True}:
+            return bytes((ABSENT_TAG,))
+        if _is_message_record(value):
+            return self._encode_message(value)
+        if _is_watermark(value):
+            return self._encode_watermark(value)
+        return bytes((JSON_TAG,)) + json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+    def decode(self, data: bytes) -> Any:
+        if not data:
+            raise CacheCodecError("Empty cache entry")
+
+        tag = data[0]
+        if tag == MESSAGE_TAG:
+            return self._decode_message(data)
+        if tag == ENVELOPE_TAG:
+            _, soft_expires_at, delta = ENVELOPE.unpack_from(data)
+            return CacheEnvelope(self.decode(data[ENVELOPE.size:]), soft_expires_at, delta)
+        if tag == TOMBSTONE_TAG:
+            return {"deleted": True}
+        if tag == ABSENT_TAG:
+            return {"absent": True}
+        if tag == WATERMARK_TAG:
+            return self._decode_watermark(data)
+        if tag == JSON_TAG:
+            return json.loads(data[1:], object_hook=_json_object_hook)
+        if tag == PICKLE_PROTOCOL_MARKER and self.read_legacy_pickle:
+            return pickle.loads(data)
+        raise CacheCodecError(f"Unknown cache entry tag 0x{tag:02x}")
+
+    @staticmethod
+    def _encode_message(value: dict[str, Any]) -> bytes:
+        aware = value["sent_at"].tzinfo is not None
+        flags = (
+            (HAS_READ_AT if value["read_at"] is not None else 0)
+            | (HAS_EDITED_AT if value["edited_at"] is not None else 0)
+            | (IS_READ if value.get("is_read", value["read_at"] is not None) else 0)
+            | (TZ_AWARE if aware else 0)
+        )
+        parts = [MESSAGE_HEADER.pack(
+            MESSAGE_TAG,
+            MESSAGE_SCHEMA_VERSION,
+            flags,
+            value["message_id"].bytes,
+            value["sender_id"].bytes,
+            value["recipient_id"].bytes,
+            value["chat_id"].bytes,
+            _to_micros(value["sent_at"]),
+            value["version"],
+        )]
+        for name in ("read_at", "edited_at"):
+            if value[name] is not None:
+                parts.append(TIMESTAMP.pack(_to_micros(value[name])))
+        parts.append(value["text"].encode())
+        return b"".join(parts)
+
+    @staticmethod
+    def _decode_message(data: bytes) -> dict[str, Any]:
+        _, schema_version, flags, message_id, sender_id, recipient_id, chat_id, sent_at, version = (
+            MESSAGE_HEADER.unpack_from(data)
+        )
+        if schema_version != MESSAGE_SCHEMA_VERSION:
+            raise CacheCodecError(f"Unsupported message schema version {schema_version}")
+
+        aware = bool(flags & TZ_AWARE)
+        offset = MESSAGE_HEADER.size
+        optional: dict[str, Optional[datetime]] = {}
+        for name, flag in (("read_at", HAS_READ_AT), ("edited_at", HAS_EDITED_AT)):
+            if flags & flag:
+                optional[name] = _from_micros(TIMESTAMP.unpack_from(data, offset)[0], aware)
+                offset += TIMESTAMP.size
+            else:
+                optional[name] = None
+
+        return {
+            "message_id": UUID(bytes=message_id),
+            "sender_id": UUID(bytes=sender_id),
+            "recipient_id": UUID(bytes=recipient_id),
+            "chat_id": UUID(bytes=chat_id),
+            "text": data[offset:].decode(),
+            "sent_at": _from_micros(sent_at, aware),
+            "read_at": optional["read_at"],
+            "edited_at": optional["edited_at"],
+            "version": version,
+            "is_read": bool(flags & IS_READ),
+        }
+
+    @staticmethod
+    def _encode_watermark(value: dict[str, Any]) -> bytes:
+        if value["sent_at"] is None:
+            return WATERMARK.pack(WATERMARK_TAG, 0, bytes(16), 0)
+        aware = value["sent_at"].tzinfo is not None
+        return WATERMARK.pack(
+            WATERMARK_TAG, 1 | (TZ_AWARE if aware else 0), value["message_id"].bytes, _to_micros(value["sent_at"])
+        )
+
+    @staticmethod
+    def _decode_watermark(data: bytes) -> dict[str, Any]:
+        _, flags, message_id, sent_at = WATERMARK.unpack_from(data)
+        if not flags & 1:
+            return {"sent_at": None, "message_id": None}
+        return {"sent_at": _from_micros(sent_at, bool(flags & TZ_AWARE)), "message_id": UUID(bytes=message_id)}
+
+
+class PickleCacheCodec(CacheCodec):
+    def encode(self, value: Any) -> bytes:
+        return pickle.dumps(value)
+
+    def decode(self, data: bytes) -> Any:
+        return pickle.loads(data)
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from typing import Optional
+from LuminMessageService.app.infrastructure.cache.redis_cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+DERIVED_KEY_PATTERN = "*:g[0-9]*:*"
+DERIVED_KEY_RE = re.compile(r"^(?P<entity>[a-z_]+):(?P<entity_id>[^:]+):g(?P<generation>\d+):")
+
+
+@dataclass
+class DerivedKeySweeperConfig:
+    scan_count: int = 500
+    max_keys_per_second: int = 5000
+    max_keys_per_run: int = 1_000_000
+
+
+class DerivedKeySweeper:
+    def __init__(self, redis_cache: RedisCache, config: Optional[DerivedKeySweeperConfig] = None) -> None:
+        self.redis = redis_cache
+        self.config = config or DerivedKeySweeperConfig()
+        self.stats = {"scanned": 0, "deleted": 0, "runs": 0}
+
+    async def sweep(self, max_keys: Optional[int] = None) -> int:
+        max_keys = max_keys or self.config.max_keys_per_run
+        scanned = 0
+        deleted = 0
+
+        # Pace every SCAN call, including empty ones: Redis examines scan_count slots whether or not they match.
+        async for keys in self.redis.scan_keys(DERIVED_KEY_PATTERN, self.config.scan_count):
+            keys = keys[:max_keys - scanned]
+            deleted += await self._sweep_batch(keys)
+            scanned += len(keys)
+            if scanned >= max_keys:
+                break
+            await asyncio.sleep(self.config.scan_count / self.config.max_keys_per_second)
+
+        self.stats["runs"] += 1
+        self.stats["scanned"] += scanned
+        self.stats["deleted"] += deleted
+        if deleted:
+            logger.info(f"✅ Swept {deleted} stale derived cache keys out of {scanned} scanned")
+        return deleted
+
+    async def _sweep_batch(self, keys: list[str]) -> int:
+        parsed = [(key, match) for key in keys if (match := DERIVED_KEY_RE.match(key))]
+        if not parsed:
+            return 0
+
+        generations = await self.redis.get_generations([
+            (match["entity"], match["entity_id"]) for _, match in parsed
+        ])
+        stale = [
+            key for (key, match), current in zip(parsed, generations)
+            if current is None or int(match["generation"]) < current
+        ]
+        if stale:
+            await self.redis.delete_many(stale)
+        return len(stale)
@@ -1,73 +1,322 @@
-from typing import Optional, Any
+import asyncio
+import math
+import random
+import time
+from functools import partial
+from typing import Awaitable, Callable, Optional, Any
 from uuid import UUID
-from datetime import timedelta
 import logging
 from LuminMessageService.app.domain.models.aggregates.message import Message
+from LuminMessageService.app.infrastructure.cache.bounded_local_cache import BoundedLocalCache
+from LuminMessageService.app.infrastructure.cache.codecs import CacheEnvelope
 from LuminMessageService.app.infrastructure.cache.redis_cache import RedisCache
-from LuminMessageService.app.infrastructure.persistance.identity_map import MessageIdentityMap
+from LuminMessageService.app.infrastructure.cache.single_flight import SingleFlight
 from LuminMessageService.app.infrastructure.persistance.message_mapper import MessageMapper
 
 logger = logging.getLogger(__name__)
 
+TOMBSTONE = {"deleted": True}
+ABSENT = {"absent": True}
+LOCAL_TOMBSTONE = object()
+LOCAL_ABSENT = object()
+MESSAGE_OVERHEAD_BYTES = 1024
+LEASE_POLL_INTERVAL = 0.02
+
+MessageLoader = Callable[[], Awaitable[Optional[dict]]]
+MessageRefresher = Callable[[UUID], Awaitable[Optional[dict]]]
+InvalidationPublisher = Callable[[list[UUID]], None]
+
+
+def local_entry_size(entry: Message | object) -> int:
+    if isinstance(entry, Message):
+        return MESSAGE_OVERHEAD_BYTES + len(entry.text.value.encode())
+    return 64
+
 
 class MultiLevelCache:
-    def __init__(self, redis_cache: RedisCache, identity_map: MessageIdentityMap):
+    def __init__(self, redis_cache: RedisCache, local_cache: BoundedLocalCache[UUID, Message | object]):
         self.redis = redis_cache
-        self.identity_map = identity_map
-        self.local_cache_ttl = timedelta(minutes=5)
+        self.config = redis_cache.config
+        self.local = local_cache
+        self.tombstone_ttl = 3600
+        self.single_flight: SingleFlight[UUID, Optional[dict]] = SingleFlight()
+        self.lease_stats = {"acquired": 0, "peer_fills": 0, "lease_timeouts": 0}
+        self.absent_stats = {"stored": 0, "local_hits": 0, "redis_hits": 0}
+        self.refresh_stats = {"stale_served": 0, "early_refreshes": 0, "refreshes": 0, "refresh_failures": 0}
+        self.refresher: Optional[MessageRefresher] = None
+        self._refresh_tasks: dict[UUID, asyncio.Task] = {}
+        self.invalidation_publisher: Optional[InvalidationPublisher] = None
+        self.local_ttl_cap: Optional[float] = None
 
-    async def get_message(self, message_id: UUID) -> Optional[Message]:
-        cached_user = self.identity_map.get(message_id)
-        if cached_user:
-            logger.debug(f"Message {message_id} found in Identity Map")
-            return cached_user
+    def set_refresher(self, refresher: MessageRefresher) -> None:
+        self.refresher = refresher
+
+    def set_invalidation_publisher(self, publisher: Optional[InvalidationPublisher]) -> None:
+        self.invalidation_publisher = publisher
+
+    def cap_local_ttl(self, ttl: Optional[float]) -> None:
+        self.local_ttl_cap = ttl
+        self.local.clear()
+
+    def _local_set(self, message_id: UUID, entry: Message | object, ttl: Optional[float] = None) -> None:
+        ttl = self.local.config.ttl_seconds if ttl is None else ttl
+        if self.local_ttl_cap is not None:
+            ttl = min(ttl, self.local_ttl_cap)
+        self.local.set(message_id, entry, ttl)
+
+    @staticmethod
+    def _detached(message: Message) -> Message:
+        # Each unit of work gets its own aggregate; the cached instance is shared by the whole process.
+        mapper = MessageMapper()
+        return mapper.to_domain(mapper.to_persistence(message))
+
+    def _publish_invalidation(self, message_ids: list[UUID]) -> None:
+        if self.invalidation_publisher is not None:
+            self.invalidation_publisher(message_ids)
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * (1 + random.uniform(-self.config.ttl_jitter, self.config.ttl_jitter))
+
+    def _needs_refresh(self, envelope: CacheEnvelope) -> bool:
+        now = time.time()
+        if now >= envelope.soft_expires_at:
+            self.refresh_stats["stale_served"] += 1
+            return True
+
+        # XFetch: refresh early with a probability that grows as expiry nears and with the cost of a reload.
+        if envelope.delta and now - envelope.delta * self.config.early_refresh_beta * math.log(
+                random.random() or 1e-12) >= envelope.soft_expires_at:
+            self.refresh_stats["early_refreshes"] += 1
+            return True
+        return False
+
+    def _schedule_refresh(self, message_id: UUID) -> None:
+        if self.refresher is None or message_id in self._refresh_tasks:
+            return
+
+        task = asyncio.create_task(self._refresh(message_id))
+        self._refresh_tasks[message_id] = task
+        task.add_done_callback(lambda _: self._refresh_tasks.pop(message_id, None))
+
+    async def _refresh(self, message_id: UUID) -> None:
+        try:
+            message_data = await self.load_message(message_id, partial(self.refresher, message_id))
+            if message_data is None:
+                await self.invalidate_messages([message_id])
+            self.refresh_stats["refreshes"] += 1
+        except Exception as e:
+            self.refresh_stats["refresh_failures"] += 1
+            logger.warning(f"⚠️ Background refresh of message {message_id} failed: {e}")
+
+    async def get_message_entry(self, message_id: UUID) -> tuple[bool, Optional[Message]]:
+        entries = await self.get_message_entries([message_id])
+        if message_id in entries:
+            return True, entries[message_id]
+        return False, None
+
+    async def get_message_entries(self, message_ids: list[UUID]) -> dict[UUID, Optional[Message]]:
+        found: dict[UUID, Optional[Message]] = {}
+        missing: list[UUID] = []
+
+        for message_id in message_ids:
+            entry = self.local.get(message_id)
+            if entry is None:
+                missing.append(message_id)
+            elif entry is LOCAL_TOMBSTONE:
+                found[message_id] = None
+            elif entry is LOCAL_ABSENT:
+                self.absent_stats["local_hits"] += 1
+                found[message_id] = None
+            else:
+                found[message_id] = self._detached(entry)
+
+        if not missing:
+            return found
+
+        redis_results = await self.redis.get_messages(missing)
+        for message_id, redis_message_data in redis_results.items():
+            if isinstance(redis_message_data, CacheEnvelope):
+                if self._needs_refresh(redis_message_data):
+                    self._schedule_refresh(message_id)
+                redis_message_data = redis_message_data.value
+
+            if redis_message_data.get("deleted"):
+                self._local_set(message_id, LOCAL_TOMBSTONE)
+                found[message_id] = None
+                continue
+            if redis_message_data.get("absent"):
+                self._local_set(message_id, LOCAL_ABSENT, self.config.local_absent_ttl)
+                self.absent_stats["redis_hits"] += 1
+                found[message_id] = None
+                continue
 
-        redis_message_data = await self.redis.get_message(message_id)
-        if redis_message_data:
             redis_message = MessageMapper().to_domain(data=redis_message_data)
-        else:
-            redis_message = None
+            self._local_set(message_id, redis_message, self._jittered(self.local.config.ttl_seconds))
+            found[message_id] = self._detached(redis_message)
+
+        logger.debug(f"{len(found)} of {len(message_ids)} message entries found in cache")
+        return found
+
+    async def get_message(self, message_id: UUID) -> Optional[Message]:
+        _, message = await self.get_message_entry(message_id)
+        return message
 
-        if redis_message:
-            logger.debug(f"Message {message_id} found in Redis")
-            if hasattr(redis_message, '__dict__'):
-                self.identity_map.add(redis_message)
-            return redis_message
+    async def get_messages(self, message_ids: list[UUID]) -> dict[UUID, Message]:
+        entries = await self.get_message_entries(message_ids)
+        return {message_id: message for message_id, message in entries.items() if message is not None}
 
-        logger.debug(f"Message {message_id} not found in cache")
-        return None
+    async def load_message(self, message_id: UUID, loader: MessageLoader) -> Optional[dict]:
+        return await self.single_flight.do(message_id, partial(self._load_and_fill, message_id, loader))
+
+    async def _load_and_fill(self, message_id: UUID, loader: MessageLoader) -> Optional[dict]:
+        token = None
+        if self.config.fill_lease_ms:
+            token = await self.redis.acquire_lease(f"message:{message_id}", self.config.fill_lease_ms)
+            if token is None:
+                filled, message_data = await self._wait_for_peer_fill(message_id)
+                if filled:
+                    return message_data
+            else:
+                self.lease_stats["acquired"] += 1
+
+        try:
+            started_at = time.monotonic()
+            message_data = await loader()
+            if message_data is None:
+                await self.set_absent([message_id])
+            elif message_data.get("is_deleted"):
+                await self.set_tombstones([message_id])
+            else:
+                await self.set_messages({message_id: message_data}, time.monotonic() - started_at)
+            return message_data
+        finally:
+            if token is not None:
+                await self.redis.release_lease(f"message:{message_id}", token)
+
+    async def _wait_for_peer_fill(self, message_id: UUID) -> tuple[bool, Optional[dict]]:
+        deadline = time.monotonic() + self.config.fill_lease_ms / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LEASE_POLL_INTERVAL)
+            message_data = await self.redis.get_message(message_id)
+            if isinstance(message_data, CacheEnvelope):
+                message_data = message_data.value
+            if message_data:
+                self.lease_stats["peer_fills"] += 1
+                if message_data.get("absent"):
+                    return True, None
+                return True, {"is_deleted": True} if message_data.get("deleted") else message_data
+
+        self.lease_stats["lease_timeouts"] += 1
+        return False, None
+
+    async def set_absent(self, message_ids: list[UUID]) -> bool:
+        if not message_ids:
+            return True
+
+        for message_id in message_ids:
+            if self.local.get(message_id, record=False) is None:
+                self._local_set(message_id, LOCAL_ABSENT, self.config.local_absent_ttl)
+        self.absent_stats["stored"] += len(message_ids)
+
+        return await self.redis.add_messages(
+            {message_id: ABSENT for message_id in message_ids}, self.config.absent_ttl
+        )
+
+    async def set_tombstones(self, message_ids: list[UUID]) -> bool:
+        for message_id in message_ids:
+            self._local_set(message_id, LOCAL_TOMBSTONE)
+        self._publish_invalidation(message_ids)
+
+        return await self.redis.set_messages(
+            {message_id: TOMBSTONE for message_id in message_ids}, self.tombstone_ttl
+        )
 
     async def set_message(self, message_id: UUID, message_data: dict) -> bool:
+        return await self.set_messages({message_id: message_data})
+
+    async def invalidate_message(self, message_id: UUID) -> bool:
+        return await self.invalidate_messages([message_id])
+
+    async def set_messages(self, messages_data: dict[UUID, dict], load_seconds: float = 0.0) -> bool:
+        if not messages_data:
+            return True
+
         try:
-            self.identity_map.add(MessageMapper().to_domain(message_data))
+            local_ttl = self.local.config.ttl_seconds
+            for message_id, message_data in messages_data.items():
+                current = self.local.get(message_id, record=False)
+                if current is LOCAL_TOMBSTONE or (
+                        isinstance(current, Message) and current.version > message_data["version"]):
+                    continue
+                self._local_set(message_id, MessageMapper().to_domain(message_data), self._jittered(local_ttl))
 
-            ttl = 3600
-            success = await self.redis.set_message(message_id, message_data, ttl)
+            # A loader that read before a commit must not replace what the commit cached after it.
+            now = time.time()
+            success = await self.redis.fill_messages({
+                message_id: (
+                    message_data["version"],
+                    CacheEnvelope(message_data, now + self._jittered(self.config.soft_ttl), load_seconds)
+                )
+                for message_id, message_data in messages_data.items()
+            }, self.config.default_ttl)
 
             if success:
-                logger.debug(f"Message {message_id} cached in Redis")
+                logger.debug(f"{len(messages_data)} messages cached in Redis")
             else:
-                logger.warning(f"Failed to cache message {message_id} in Redis")
+                logger.warning(f"Failed to cache {len(messages_data)} messages in Redis")
 
             return success
         except Exception as e:
-            logger.error(f"Error caching message {message_id}: {e}")
+            logger.error(f"Error caching {len(messages_data)} messages: {e}")
             return False
 
-    async def invalidate_message(self, message_id: UUID) -> bool:
-        try:
-            self.identity_map.remove(message_id)
+    async def invalidate_messages(self, message_ids: list[UUID]) -> bool:
+        if not message_ids:
+            return True
 
-            success = await self.redis.delete_message(message_id)
+        try:
+            for message_id in message_ids:
+                self.local.remove(message_id)
+            self._publish_invalidation(message_ids)
 
-            await self.redis.invalidate_message_cache(message_id)
+            success = await self.redis.delete_messages(message_ids)
 
-            logger.debug(f"Cache invalidated for message {message_id}")
+            logger.debug(f"Cache invalidated for {len(message_ids)} messages")
             return success
         except Exception as e:
-            logger.error(f"Error invalidating cache for message {message_id}: {e}")
+            logger.error(f"Error invalidating cache for {len(message_ids)} messages: {e}")
             return False
 
+    async def get_derived(self, entity: str, entity_id: UUID, name: str) -> tuple[Optional[Any], Optional[int]]:
+        return await self.redis.get_derived(entity, entity_id, name)
+
+    async def set_derived(self, entity: str, entity_id: UUID, name: str, value: Any, generation: int) -> bool:
+        return await self.redis.set_derived(entity, entity_id, name, value, generation)
+
+    async def invalidate_chats(self, chat_ids: list[UUID]) -> bool:
+        return await self.redis.invalidate_chats(chat_ids)
+
+    def evict_local(self, message_ids: list[UUID]) -> None:
+        for message_id in message_ids:
+            self.local.remove(message_id)
+
+    def get_metrics(self) -> dict:
+        return {
+            "local": self.local.get_metrics(),
+            "single_flight": {**self.single_flight.stats, "in_flight": len(self.single_flight), **self.lease_stats},
+            "absent": {
+                **self.absent_stats,
+                "db_lookups_avoided": self.absent_stats["local_hits"] + self.absent_stats["redis_hits"],
+            },
+            "refresh": {**self.refresh_stats, "in_flight": len(self._refresh_tasks)},
+        }
+
+    async def get_read_watermarks(self, keys: set[tuple[UUID, UUID]]) -> dict[tuple[UUID, UUID], dict]:
+        return await self.redis.get_read_watermarks(list(keys))
+
+    async def set_read_watermarks(self, watermarks_data: dict[tuple[UUID, UUID], dict]) -> bool:
+        return await self.redis.set_read_watermarks(watermarks_data)
+
     async def get_with_fallback(
             self,
             message_id: UUID,
@@ -79,9 +328,4 @@ class MultiLevelCache:
         if cached_data:
             return cached_data
 
-        fresh_data = await fallback_func(*args, **kwargs)
-
-        if fresh_data:
-            await self.set_message(message_id, fresh_data)
-
-        return fresh_data
+        return await self.load_message(message_id, partial(fallback_func, *args, **kwargs))
@@ -1,12 +1,81 @@
-import pickle
-from typing import Optional, Any
+from typing import AsyncIterator, Optional, Any
 from uuid import UUID
 import redis.asyncio as redis
 from dataclasses import dataclass
 import logging
+import secrets
+from LuminMessageService.app.infrastructure.cache.codecs import BinaryCacheCodec, CacheCodec, ENVELOPE, ENVELOPE_TAG, \
+    MESSAGE_HEADER, MESSAGE_TAG, TOMBSTONE_TAG
 
 logger = logging.getLogger(__name__)
 
+# A read creates the counter, so a concurrent bump always has one to increment.
+GET_DERIVED_SCRIPT = """
+redis.call('SET', KEYS[1], 0, 'NX', 'EX', ARGV[2])
+local generation = redis.call('GET', KEYS[1])
+return {generation, redis.call('GET', KEYS[2] .. generation .. ':' .. ARGV[1])}
+"""
+
+SET_DERIVED_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[5] then
+    return 0
+end
+redis.call('SET', KEYS[2] .. ARGV[5] .. ':' .. ARGV[1], ARGV[2], 'EX', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+# Without a counter no derived key is readable, so entities nobody derived from cost nothing to invalidate.
+BUMP_GENERATIONS_SCRIPT = """
+for _, key in ipairs(KEYS) do
+    if redis.call('EXISTS', key) == 1 then
+        redis.call('INCR', key)
+        redis.call('EXPIRE', key, ARGV[1])
+    end
+end
+return #KEYS
+"""
+
+# Reads the version out of the binary message layout. Tombstones are never replaced; entries it cannot parse
+# (absent markers, JSON, legacy pickle) always are.
+FILL_MESSAGES_SCRIPT = f"""
+local function cached_version(data)
+    if not data then
+        return -1
+    end
+    local offset = 0
+    if string.byte(data, 1) == {ENVELOPE_TAG} then
+        offset = {ENVELOPE.size}
+    end
+    local tag = string.byte(data, offset + 1)
+    if tag == {TOMBSTONE_TAG} then
+        return nil
+    end
+    if tag ~= {MESSAGE_TAG} or #data < offset + {MESSAGE_HEADER.size} then
+        return -1
+    end
+    local b1, b2, b3, b4 = string.byte(data, offset + {MESSAGE_HEADER.size - 3}, offset + {MESSAGE_HEADER.size})
+    return ((b1 * 256 + b2) * 256 + b3) * 256 + b4
+end
+
+local filled = 0
+for index, key in ipairs(KEYS) do
+    local current = cached_version(redis.call('GET', key))
+    if current and current <= tonumber(ARGV[index * 2]) then
+        redis.call('SET', key, ARGV[index * 2 + 1], 'EX', ARGV[1])
+        filled = filled + 1
+    end
+end
+return filled
+"""
+
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
 
 @dataclass
 class CacheConfig:
@@ -16,13 +85,27 @@ class CacheConfig:
     db: int = 0
     default_ttl: int = 3600
     key_prefix: str = "message_service:"
+    read_legacy_pickle: bool = True
+    generation_ttl: int = 7 * 24 * 3600
+    fill_lease_ms: int = 0
+    absent_ttl: int = 30
+    local_absent_ttl: float = 2.0
+    soft_ttl: int = 300
+    ttl_jitter: float = 0.1
+    early_refresh_beta: float = 1.0
 
 
 class RedisCache:
-    def __init__(self, config: CacheConfig):
+    def __init__(self, config: CacheConfig, codec: Optional[CacheCodec] = None):
         self.config = config
+        self.codec = codec or BinaryCacheCodec(read_legacy_pickle=config.read_legacy_pickle)
         self._client: Optional[redis.Redis] = None
         self._connected = False
+        self._get_derived_script = None
+        self._set_derived_script = None
+        self._bump_generations_script = None
+        self._fill_messages_script = None
+        self._release_lease_script = None
 
     async def connect(self) -> None:
         if not self._connected:
@@ -37,6 +120,11 @@ class RedisCache:
             )
             try:
                 await self._client.ping()
+                self._get_derived_script = self._client.register_script(GET_DERIVED_SCRIPT)
+                self._set_derived_script = self._client.register_script(SET_DERIVED_SCRIPT)
+                self._bump_generations_script = self._client.register_script(BUMP_GENERATIONS_SCRIPT)
+                self._fill_messages_script = self._client.register_script(FILL_MESSAGES_SCRIPT)
+                self._release_lease_script = self._client.register_script(RELEASE_LEASE_SCRIPT)
                 self._connected = True
                 logger.info("✅ Redis connected successfully")
             except Exception as e:
@@ -59,7 +147,7 @@ class RedisCache:
             full_key = self._build_key(key)
             data = await self._client.get(full_key)
             if data:
-                return pickle.loads(data)
+                return self.codec.decode(data)
             return None
         except Exception as e:
             logger.error(f"Redis get error for key {key}: {e}")
@@ -71,7 +159,7 @@ class RedisCache:
 
         try:
             full_key = self._build_key(key)
-            serialized = pickle.dumps(value)
+            serialized = self.codec.encode(value)
             ttl = ttl or self.config.default_ttl
             await self._client.setex(full_key, ttl, serialized)
             return True
@@ -79,6 +167,71 @@ class RedisCache:
             logger.error(f"Redis set error for key {key}: {e}")
             return False
 
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        if not self._connected or not keys:
+            return {}
+
+        try:
+            values = await self._client.mget([self._build_key(key) for key in keys])
+        except Exception as e:
+            logger.error(f"Redis mget error for {len(keys)} keys: {e}")
+            return {}
+
+        found = {}
+        for key, data in zip(keys, values):
+            if not data:
+                continue
+            try:
+                found[key] = self.codec.decode(data)
+            except Exception as e:
+                logger.error(f"Redis decode error for key {key}: {e}")
+        return found
+
+    async def set_many(self, items: dict[str, tuple[Any, Optional[int]]]) -> bool:
+        if not self._connected:
+            return False
+        if not items:
+            return True
+
+        try:
+            pipeline = self._client.pipeline(transaction=False)
+            for key, (value, ttl) in items.items():
+                pipeline.setex(self._build_key(key), ttl or self.config.default_ttl, self.codec.encode(value))
+            await pipeline.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis pipelined set error for {len(items)} keys: {e}")
+            return False
+
+    async def add_many(self, items: dict[str, Any], ttl: int) -> bool:
+        if not self._connected:
+            return False
+        if not items:
+            return True
+
+        try:
+            pipeline = self._client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipeline.set(self._build_key(key), self.codec.encode(value), ex=ttl, nx=True)
+            await pipeline.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis pipelined add error for {len(items)} keys: {e}")
+            return False
+
+    async def delete_many(self, keys: list[str]) -> bool:
+        if not self._connected:
+            return False
+        if not keys:
+            return True
+
+        try:
+            await self._client.delete(*(self._build_key(key) for key in keys))
+            return True
+        except Exception as e:
+            logger.error(f"Redis delete error for {len(keys)} keys: {e}")
+            return False
+
     async def delete(self, key: str) -> bool:
         if not self._connected:
             return False
@@ -97,14 +250,112 @@ class RedisCache:
 
         try:
             full_pattern = self._build_key(pattern)
-            keys = await self._client.keys(full_pattern)
-            if keys:
-                await self._client.delete(*keys)
+            batch = []
+            async for key in self._client.scan_iter(match=full_pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    await self._client.delete(*batch)
+                    batch.clear()
+            if batch:
+                await self._client.delete(*batch)
             return True
         except Exception as e:
             logger.error(f"Redis delete pattern error: {e}")
             return False
 
+    async def scan_keys(self, pattern: str, count: int = 500) -> AsyncIterator[list[str]]:
+        if not self._connected:
+            return
+
+        prefix_length = len(self.config.key_prefix)
+        cursor = 0
+        while True:
+            cursor, keys = await self._client.scan(cursor, match=self._build_key(pattern), count=count)
+            yield [key.decode()[prefix_length:] for key in keys]
+            if cursor == 0:
+                break
+
+    def _generation_key(self, entity: str, entity_id: UUID) -> str:
+        return self._build_key(f"gen:{entity}:{entity_id}")
+
+    def _derived_prefix(self, entity: str, entity_id: UUID) -> str:
+        return self._build_key(f"{entity}:{entity_id}:g")
+
+    async def get_derived(self, entity: str, entity_id: UUID, name: str) -> tuple[Optional[Any], Optional[int]]:
+        if not self._connected:
+            return None, None
+
+        try:
+            generation, *data = await self._get_derived_script(
+                keys=[self._generation_key(entity, entity_id), self._derived_prefix(entity, entity_id)],
+                args=[name, self.config.generation_ttl]
+            )
+            return (self.codec.decode(data[0]) if data and data[0] else None), int(generation)
+        except Exception as e:
+            logger.error(f"Redis derived get error for {entity}:{entity_id}:{name}: {e}")
+            return None, None
+
+    async def set_derived(self, entity: str, entity_id: UUID, name: str, value: Any, generation: int,
+                          ttl: Optional[int] = None) -> bool:
+        if not self._connected:
+            return False
+
+        try:
+            ttl = min(ttl or self.config.default_ttl, self.config.generation_ttl)
+            return bool(await self._set_derived_script(
+                keys=[self._generation_key(entity, entity_id), self._derived_prefix(entity, entity_id)],
+                args=[name, self.codec.encode(value), ttl, self.config.generation_ttl, generation]
+            ))
+        except Exception as e:
+            logger.error(f"Redis derived set error for {entity}:{entity_id}:{name}: {e}")
+            return False
+
+    async def get_generations(self, entity_keys: list[tuple[str, str]]) -> list[Optional[int]]:
+        if not self._connected or not entity_keys:
+            return []
+
+        values = await self._client.mget([
+            self._build_key(f"gen:{entity}:{entity_id}") for entity, entity_id in entity_keys
+        ])
+        return [int(value) if value is not None else None for value in values]
+
+    async def invalidate_entities(self, entity: str, entity_ids: list[UUID]) -> bool:
+        if not self._connected:
+            return False
+        if not entity_ids:
+            return True
+
+        try:
+            await self._bump_generations_script(
+                keys=[self._generation_key(entity, entity_id) for entity_id in entity_ids],
+                args=[self.config.generation_ttl]
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Redis invalidation error for {len(entity_ids)} {entity} entries: {e}")
+            return False
+
+    async def acquire_lease(self, key: str, ttl_ms: int) -> Optional[str]:
+        if not self._connected:
+            return None
+
+        token = secrets.token_hex(8)
+        try:
+            acquired = await self._client.set(self._build_key(f"lease:{key}"), token, nx=True, px=ttl_ms)
+            return token if acquired else None
+        except Exception as e:
+            logger.error(f"Redis lease error for key {key}: {e}")
+            return None
+
+    async def release_lease(self, key: str, token: str) -> None:
+        if not self._connected:
+            return
+
+        try:
+            await self._release_lease_script(keys=[self._build_key(f"lease:{key}")], args=[token])
+        except Exception as e:
+            logger.error(f"Redis lease release error for key {key}: {e}")
+
     async def get_message(self, message_id: UUID) -> Optional[dict]:
         return await self.get(f"message:{message_id}")
 
@@ -114,7 +365,67 @@ class RedisCache:
     async def delete_message(self, message_id: UUID) -> bool:
         return await self.delete(f"message:{message_id}")
 
+    async def get_messages(self, message_ids: list[UUID]) -> dict[UUID, dict]:
+        found = await self.get_many([f"message:{message_id}" for message_id in message_ids])
+        return {
+            message_id: found[f"message:{message_id}"] for message_id in message_ids if f"message:{message_id}" in found
+        }
+
+    async def set_messages(self, messages_data: dict[UUID, dict], ttl: Optional[int] = None) -> bool:
+        return await self.set_many({
+            f"message:{message_id}": (message_data, ttl) for message_id, message_data in messages_data.items()
+        })
+
+    async def fill_messages(self, messages: dict[UUID, tuple[int, Any]], ttl: Optional[int] = None) -> bool:
+        if not self._connected:
+            return False
+        if not messages:
+            return True
+
+        args: list[Any] = [ttl or self.config.default_ttl]
+        for version, value in messages.values():
+            args += [version, self.codec.encode(value)]
+        try:
+            await self._fill_messages_script(
+                keys=[self._build_key(f"message:{message_id}") for message_id in messages], args=args
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Redis versioned fill error for {len(messages)} messages: {e}")
+            return False
+
+    async def add_messages(self, messages_data: dict[UUID, dict], ttl: int) -> bool:
+        return await self.add_many(
+            {f"message:{message_id}": message_data for message_id, message_data in messages_data.items()}, ttl
+        )
+
+    async def delete_messages(self, message_ids: list[UUID]) -> bool:
+        return await self.delete_many([f"message:{message_id}" for message_id in message_ids])
+
+    async def invalidate_chats(self, chat_ids: list[UUID]) -> bool:
+        return await self.invalidate_entities("chat", chat_ids)
+
+    async def get_read_watermark(self, chat_id: UUID, reader_id: UUID) -> Optional[dict]:
+        return await self.get(f"read_watermark:{chat_id}:{reader_id}")
+
+    async def set_read_watermark(self, chat_id: UUID, reader_id: UUID, watermark_data: dict,
+                                 ttl: Optional[int] = None) -> bool:
+        return await self.set(f"read_watermark:{chat_id}:{reader_id}", watermark_data, ttl)
+
+    async def get_read_watermarks(self, keys: list[tuple[UUID, UUID]]) -> dict[tuple[UUID, UUID], dict]:
+        found = await self.get_many([f"read_watermark:{chat_id}:{reader_id}" for chat_id, reader_id in keys])
+        return {
+            (chat_id, reader_id): found[f"read_watermark:{chat_id}:{reader_id}"]
+            for chat_id, reader_id in keys
+            if f"read_watermark:{chat_id}:{reader_id}" in found
+        }
+
+    async def set_read_watermarks(self, watermarks_data: dict[tuple[UUID, UUID], dict],
+                                  ttl: Optional[int] = None) -> bool:
+        return await self.set_many({
+            f"read_watermark:{chat_id}:{reader_id}": (data, ttl)
+            for (chat_id, reader_id), data in watermarks_data.items()
+        })
+
     async def invalidate_message_cache(self, message_id: UUID) -> bool:
-        await self.delete_message(message_id)
-        await self.delete_pattern(f"message:{message_id}:*")
-        return True
+        return await self.delete_messages([message_id])
@@ -1,26 +1,86 @@
+import logging
+from dataclasses import replace
 from typing import Optional
 from LuminMessageService.app.application.commands.create import CreateMessageHandler
 from LuminMessageService.app.application.commands.delete import DeleteMessageHandler
 from LuminMessageService.app.application.commands.edit_text import EditMessageTextHandler
 from LuminMessageService.app.application.commands.mark_as_read import MarkMessageAsReadHandler
+from LuminMessageService.app.application.commands.mark_chat_as_read import MarkChatAsReadHandler
+from LuminMessageService.app.application.commands.reconcile_unread_counters import ReconcileUnreadCountersHandler
 from LuminMessageService.app.application.queries.get_by_id import GetMessageByIDHandler
+from LuminMessageService.app.application.queries.get_chat_changes import GetChatChangesHandler
+from LuminMessageService.app.application.queries.get_chat_history import GetChatHistoryHandler
+from LuminMessageService.app.application.queries.get_unread_count import GetUnreadCountHandler
+from LuminMessageService.app.application.queries.search_messages import SearchMessagesHandler
 from LuminMessageService.app.application.services.message_service import MessageService
-from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache
+from LuminMessageService.app.infrastructure.archive.message_archive import ArchiveConfig, MessageArchive
+from LuminMessageService.app.infrastructure.archive.message_archiver import MessageArchiver
+from LuminMessageService.app.infrastructure.cache.bounded_local_cache import BoundedLocalCache, LocalCacheConfig
+from LuminMessageService.app.infrastructure.cache.derived_key_sweeper import DerivedKeySweeper, \
+    DerivedKeySweeperConfig
+from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache, local_entry_size
 from LuminMessageService.app.infrastructure.cache.redis_cache import CacheConfig, RedisCache
+from LuminMessageService.app.infrastructure.messaging.l1_invalidation_broadcaster import L1InvalidationBroadcaster, \
+    L1InvalidationConfig
 from LuminMessageService.app.infrastructure.messaging.nats_event_bus import NatsEventBus
-from LuminMessageService.app.infrastructure.persistance.identity_map import MessageIdentityMap
+from LuminMessageService.app.infrastructure.messaging.outbox_relay import OutboxRelay, OutboxRelayConfig
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool
+from LuminMessageService.app.infrastructure.persistance.partitioning import MessagePartitionManager, PartitionConfig
+from LuminMessageService.app.infrastructure.persistance.chat_resharder import ChatResharder
+from LuminMessageService.app.infrastructure.persistance.replica_router import ReplicaRouter, ReplicaRouterConfig
+from LuminMessageService.app.infrastructure.persistance.shard_router import ShardRouter, ShardRouterConfig
+from LuminMessageService.app.infrastructure.persistance.tombstone_compactor import TombstoneCompactor, \
+    TombstoneCompactorConfig
+
+logger = logging.getLogger(__name__)
 
 
 class DependencyContainer:
-    def __init__(self, connection_factory, redis_config: Optional[CacheConfig] = None):
-        self.connection_factory = connection_factory
+    def __init__(
+            self,
+            connection_pool: DatabasePool,
+            redis_config: Optional[CacheConfig] = None,
+            partition_config: Optional[PartitionConfig] = None,
+            replica_dsns: Optional[list[str]] = None,
+            replica_router_config: Optional[ReplicaRouterConfig] = None,
+            outbox_relay_config: Optional[OutboxRelayConfig] = None,
+            tombstone_compactor_config: Optional[TombstoneCompactorConfig] = None,
+            shard_dsns: Optional[list[str]] = None,
+            shard_router_config: Optional[ShardRouterConfig] = None,
+            archive_config: Optional[ArchiveConfig] = None,
+            local_cache_config: Optional[LocalCacheConfig] = None,
+            derived_key_sweeper_config: Optional[DerivedKeySweeperConfig] = None,
+            l1_invalidation_config: Optional[L1InvalidationConfig] = None
+    ):
+        self.connection_pool = connection_pool
         self.redis_config = redis_config or CacheConfig()
+        self.local_cache_config = local_cache_config or LocalCacheConfig()
+        self.derived_key_sweeper_config = derived_key_sweeper_config or DerivedKeySweeperConfig()
+        self._derived_key_sweeper = None
+        self.l1_invalidation_config = l1_invalidation_config or L1InvalidationConfig()
+        self._l1_invalidation_broadcaster = None
+        self.partition_config = partition_config or PartitionConfig()
+        self.replica_dsns = replica_dsns or []
+        self.replica_router_config = replica_router_config or ReplicaRouterConfig()
+        self._partition_managers = None
+        self._replica_router = None
+        self.shard_dsns = shard_dsns or []
+        self.shard_router_config = shard_router_config or ShardRouterConfig()
+        self._shard_pools = None
+        self._shard_router = None
+        self.outbox_relay_config = outbox_relay_config or OutboxRelayConfig()
+        self._outbox_relays = None
+        self.tombstone_compactor_config = tombstone_compactor_config or TombstoneCompactorConfig()
+        self._tombstone_compactors = None
+        self.archive_config = archive_config or ArchiveConfig()
+        self._message_archive = None
+        self._message_archivers = None
         self._event_bus = None
         self._message_service = None
         self._redis_cache = None
         self._multi_level_cache = None
         self._handlers = {}
-        self._identity_map = None
+        self._local_cache = None
 
     async def get_redis_cache(self) -> RedisCache:
         if not self._redis_cache:
@@ -28,18 +88,91 @@ class DependencyContainer:
             await self._redis_cache.connect()
         return self._redis_cache
 
-    def get_identity_map(self) -> MessageIdentityMap:
-        if not self._identity_map:
-            self._identity_map = MessageIdentityMap()
-        return self._identity_map
+    def get_shard_pools(self) -> list[DatabasePool]:
+        if not self._shard_pools:
+            self._shard_pools = [self.connection_pool] + [
+                DatabasePool(replace(self.connection_pool.config, dsn=dsn)) for dsn in self.shard_dsns
+            ]
+        return self._shard_pools
+
+    def get_partition_managers(self) -> list[MessagePartitionManager]:
+        if not self._partition_managers:
+            self._partition_managers = [
+                MessagePartitionManager(pool, self.partition_config) for pool in self.get_shard_pools()
+            ]
+        return self._partition_managers
+
+    async def get_replica_router(self) -> ReplicaRouter:
+        if not self._replica_router:
+            replicas = [
+                DatabasePool(replace(self.connection_pool.config, dsn=dsn)) for dsn in self.replica_dsns
+            ]
+            self._replica_router = ReplicaRouter(self.connection_pool, replicas, self.replica_router_config)
+            await self._replica_router.start()
+        return self._replica_router
+
+    async def get_shard_router(self) -> ShardRouter:
+        if not self._shard_router:
+            shards = [ReplicaRouter(pool, config=self.replica_router_config) for pool in self.get_shard_pools()[1:]]
+            self._shard_router = ShardRouter([await self.get_replica_router(), *shards], self.shard_router_config)
+            await self._shard_router.start()
+        return self._shard_router
+
+    async def get_chat_resharder(self) -> ChatResharder:
+        return ChatResharder(await self.get_shard_router())
+
+    def get_message_archive(self) -> MessageArchive:
+        if not self._message_archive:
+            self._message_archive = MessageArchive(self.archive_config)
+        return self._message_archive
+
+    def get_message_archivers(self) -> list[MessageArchiver]:
+        if not self._message_archivers:
+            archive = self.get_message_archive()
+            self._message_archivers = [MessageArchiver(pool, archive) for pool in self.get_shard_pools()]
+        return self._message_archivers
+
+    def get_tombstone_compactors(self) -> list[TombstoneCompactor]:
+        if not self._tombstone_compactors:
+            self._tombstone_compactors = [
+                TombstoneCompactor(pool, self.tombstone_compactor_config) for pool in self.get_shard_pools()
+            ]
+        return self._tombstone_compactors
+
+    async def get_outbox_relays(self) -> list[OutboxRelay]:
+        if not self._outbox_relays:
+            event_bus = await self.get_event_bus()
+            self._outbox_relays = [
+                OutboxRelay(pool, event_bus, self.outbox_relay_config) for pool in self.get_shard_pools()
+            ]
+        return self._outbox_relays
+
+    async def get_derived_key_sweeper(self) -> DerivedKeySweeper:
+        if not self._derived_key_sweeper:
+            self._derived_key_sweeper = DerivedKeySweeper(await self.get_redis_cache(), self.derived_key_sweeper_config)
+        return self._derived_key_sweeper
+
+    def get_local_cache(self) -> BoundedLocalCache:
+        if self._local_cache is None:
+            self._local_cache = BoundedLocalCache(self.local_cache_config, local_entry_size)
+        return self._local_cache
 
     async def get_multi_level_cache(self) -> MultiLevelCache:
         if not self._multi_level_cache:
             redis_cache = await self.get_redis_cache()
-            identity_map = self.get_identity_map()
-            self._multi_level_cache = MultiLevelCache(redis_cache, identity_map)
+            local_cache = self.get_local_cache()
+            self._multi_level_cache = MultiLevelCache(redis_cache, local_cache)
+            if self.l1_invalidation_config.enabled:
+                self._l1_invalidation_broadcaster = L1InvalidationBroadcaster(
+                    self._multi_level_cache, self.l1_invalidation_config
+                )
+                await self._l1_invalidation_broadcaster.start()
         return self._multi_level_cache
 
+    async def get_l1_invalidation_broadcaster(self) -> Optional[L1InvalidationBroadcaster]:
+        await self.get_multi_level_cache()
+        return self._l1_invalidation_broadcaster
+
     async def get_event_bus(self) -> NatsEventBus:
         if not self._event_bus:
             self._event_bus = NatsEventBus()
@@ -49,8 +182,12 @@ class DependencyContainer:
     async def get_message_service(self) -> MessageService:
         if not self._message_service:
             cache = await self.get_multi_level_cache()
-            self._message_service = MessageService(self.connection_factory, cache)
-            print(f"MessageService created with connection_factory: {self.connection_factory}")
+            replica_router = await self.get_replica_router()
+            shard_router = await self.get_shard_router()
+            self._message_service = MessageService(
+                self.connection_pool, cache, replica_router, shard_router, self.get_message_archive()
+            )
+            logger.debug(f"MessageService created with connection_pool: {self.connection_pool}")
         return self._message_service
 
     async def get_message_by_id_handler(self) -> GetMessageByIDHandler:
@@ -61,6 +198,30 @@ class DependencyContainer:
             self._handlers[key] = GetMessageByIDHandler(message_service, event_bus)
         return self._handlers[key]
 
+    async def get_chat_history_handler(self) -> GetChatHistoryHandler:
+        key = "get_chat_history"
+        if key not in self._handlers:
+            event_bus = await self.get_event_bus()
+            message_service = await self.get_message_service()
+            self._handlers[key] = GetChatHistoryHandler(message_service, event_bus)
+        return self._handlers[key]
+
+    async def get_chat_changes_handler(self) -> GetChatChangesHandler:
+        key = "get_chat_changes"
+        if key not in self._handlers:
+            event_bus = await self.get_event_bus()
+            message_service = await self.get_message_service()
+            self._handlers[key] = GetChatChangesHandler(message_service, event_bus)
+        return self._handlers[key]
+
+    async def get_search_messages_handler(self) -> SearchMessagesHandler:
+        key = "search_messages"
+        if key not in self._handlers:
+            event_bus = await self.get_event_bus()
+            message_service = await self.get_message_service()
+            self._handlers[key] = SearchMessagesHandler(message_service, event_bus)
+        return self._handlers[key]
+
     async def get_create_message_handler(self) -> CreateMessageHandler:
         key = "create_message"
         if key not in self._handlers:
@@ -92,3 +253,27 @@ class DependencyContainer:
             message_service = await self.get_message_service()
             self._handlers[key] = MarkMessageAsReadHandler(message_service, event_bus)
         return self._handlers[key]
+
+    async def get_mark_chat_as_read_handler(self) -> MarkChatAsReadHandler:
+        key = "mark_chat_as_read"
+        if key not in self._handlers:
+            event_bus = await self.get_event_bus()
+            message_service = await self.get_message_service()
+            self._handlers[key] = MarkChatAsReadHandler(message_service, event_bus)
+        return self._handlers[key]
+
+    async def get_unread_count_handler(self) -> GetUnreadCountHandler:
+        key = "get_unread_count"
+        if key not in self._handlers:
+            event_bus = await self.get_event_bus()
+            message_service = await self.get_message_service()
+            self._handlers[key] = GetUnreadCountHandler(message_service, event_bus)
+        return self._handlers[key]
+
+    async def get_reconcile_unread_counters_handler(self) -> ReconcileUnreadCountersHandler:
+        key = "reconcile_unread_counters"
+        if key not in self._handlers:
+            event_bus = await self.get_event_bus()
+            message_service = await self.get_message_service()
+            self._handlers[key] = ReconcileUnreadCountersHandler(message_service, event_bus)
+        return self._handlers[key]
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID, uuid4
+import nats
+from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class L1InvalidationConfig:
+    enabled: bool = True
+    nats_url: str = "nats://localhost:4222"
+    subject: str = "message_service.cache.l1_invalidate"
+    flush_interval: float = 0.01
+    max_batch: int = 1000
+    degraded_local_ttl: float = 1.0
+
+
+class L1InvalidationBroadcaster:
+    def __init__(self, cache: MultiLevelCache, config: Optional[L1InvalidationConfig] = None) -> None:
+        self.cache = cache
+        self.config = config or L1InvalidationConfig()
+        self.origin = uuid4().bytes
+        self.nc = None
+        self._subscription = None
+        self._pending: set[UUID] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.stats = {
+            "published_ids": 0,
+            "published_batches": 0,
+            "received_ids": 0,
+            "received_batches": 0,
+            "publish_failures": 0,
+            "disconnects": 0,
+        }
+
+    @property
+    def connected(self) -> bool:
+        return self.nc is not None and self.nc.is_connected
+
+    async def start(self) -> None:
+        if self.nc is not None:
+            return
+
+        self.cache.cap_local_ttl(self.config.degraded_local_ttl)
+        self.cache.set_invalidation_publisher(self.publish)
+        try:
+            self.nc = await nats.connect(
+                self.config.nats_url,
+                name="message-service-l1-invalidation",
+                max_reconnect_attempts=-1,
+                disconnected_cb=self._on_disconnected,
+                reconnected_cb=self._on_reconnected,
+            )
+            self._subscription = await self.nc.subscribe(self.config.subject, cb=self._on_message)
+        except Exception as e:
+            logger.error(f"❌ L1 invalidation channel unavailable, local cache TTL capped: {e}")
+            self.nc = None
+            return
+
+        self.cache.cap_local_ttl(None)
+        logger.info("✅ L1 invalidation channel subscribed")
+
+    async def stop(self) -> None:
+        self.cache.set_invalidation_publisher(None)
+        if self._flush_task is not None:
+            await self._flush_task
+        if self.nc is not None:
+            await self.nc.drain()
+            self.nc = None
+            logger.info("L1 invalidation channel closed")
+
+    def publish(self, message_ids: list[UUID]) -> None:
+        self._pending.update(message_ids)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_soon())
+
+    def get_metrics(self) -> dict:
+        return {**self.stats, "connected": self.connected, "pending": len(self._pending)}
+
+    async def _flush_soon(self) -> None:
+        try:
+            if len(self._pending) < self.config.max_batch:
+                await asyncio.sleep(self.config.flush_interval)
+            while self._pending:
+                await self._flush()
+        finally:
+            self._flush_task = None
+
+    async def _flush(self) -> None:
+        batch = []
+        while self._pending and len(batch) < self.config.max_batch:
+            batch.append(self._pending.pop())
+
+        if self.nc is None or self.nc.is_closed:
+            self.stats["publish_failures"] += 1
+            return
+
+        payload = self.origin + b"".join(message_id.bytes for message_id in batch)
+        try:
+            await self.nc.publish(self.config.subject, payload)
+            self.stats["published_batches"] += 1
+            self.stats["published_ids"] += len(batch)
+        except Exception as e:
+            self.stats["publish_failures"] += 1
+            logger.warning(f"⚠️ Failed to publish {len(batch)} L1 invalidations: {e}")
+
+    async def _on_message(self, msg) -> None:
+        data = msg.data
+        if data[:16] == self.origin:
+            return
+
+        message_ids = [UUID(bytes=data[offset:offset + 16]) for offset in range(16, len(data), 16)]
+        self.cache.evict_local(message_ids)
+        self.stats["received_batches"] += 1
+        self.stats["received_ids"] += len(message_ids)
+
+    async def _on_disconnected(self) -> None:
+        self.stats["disconnects"] += 1
+        self.cache.cap_local_ttl(self.config.degraded_local_ttl)
+        logger.warning("⚠️ L1 invalidation channel disconnected, local cache TTL capped")
+
+    async def _on_reconnected(self) -> None:
+        self.cache.cap_local_ttl(None)
+        logger.info("✅ L1 invalidation channel reconnected, local cache cleared")
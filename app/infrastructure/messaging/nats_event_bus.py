@@ -1,3 +1,4 @@
+import asyncio
 import nats
 import json
 from nats.js.api import ConsumerConfig, DeliverPolicy, AckPolicy
@@ -44,13 +45,27 @@ class NatsEventBus(EventBus):
 
             await self.js.publish(
                 subject=subject,
-                payload=json.dumps(event_data, default=str).encode()
+                payload=json.dumps(event_data, default=str).encode(),
+                headers={"Nats-Msg-Id": str(event.event_id)}
             )
             print(f"Event published: {event.event_type}")
         except Exception as e:
             print(f"Error publishing event: {e}")
             raise
 
+    async def publish_batch(self, messages: list[tuple[str, bytes, str]]) -> list[BaseException | None]:
+        if not self.js:
+            await self.connect()
+
+        results = await asyncio.gather(
+            *(
+                self.js.publish(subject=subject, payload=payload, headers={"Nats-Msg-Id": message_id})
+                for subject, payload, message_id in messages
+            ),
+            return_exceptions=True
+        )
+        return [result if isinstance(result, BaseException) else None for result in results]
+
     async def subscribe(self, event_type: Type[DomainEvent], handler: Callable) -> None:
         subject = f"message.events.{event_type.__name__}"
 
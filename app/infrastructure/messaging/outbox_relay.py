@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Optional
+from LuminMessageService.app.infrastructure.messaging.nats_event_bus import NatsEventBus
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool
+from LuminMessageService.app.infrastructure.persistance.postgres_sql_outbox_repository import \
+    PostgresSQLOutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboxRelayConfig:
+    batch_size: int = 500
+    poll_interval: float = 0.5
+    sent_retention_seconds: float = 24 * 3600
+    purge_batch_size: int = 5000
+
+
+class OutboxRelay:
+    def __init__(
+            self,
+            connection_pool: DatabasePool,
+            event_bus: NatsEventBus,
+            config: Optional[OutboxRelayConfig] = None
+    ) -> None:
+        self.connection_pool = connection_pool
+        self.event_bus = event_bus
+        self.config = config or OutboxRelayConfig()
+        self.outbox = PostgresSQLOutboxRepository(connection_pool)
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"published": 0, "failed": 0, "batches": 0, "purged": 0}
+
+    async def relay_batch(self) -> int:
+        _, published = await self._relay_batch()
+        return published
+
+    async def _relay_batch(self) -> tuple[int, int]:
+        async with self.connection_pool.acquire() as conn:
+            async with conn.transaction():
+                rows = await self.outbox.lock_pending(conn, self.config.batch_size)
+                if not rows:
+                    return 0, 0
+
+                results = await self.event_bus.publish_batch([
+                    (row["subject"], row["payload"].encode(), str(row["event_id"])) for row in rows
+                ])
+
+                sent_ids = [row["id"] for row, error in zip(rows, results) if error is None]
+                failed = [(row["id"], str(error)) for row, error in zip(rows, results) if error is not None]
+
+                await self.outbox.mark_sent(conn, sent_ids)
+                await self.outbox.mark_failed(conn, [row_id for row_id, _ in failed], [error for _, error in failed])
+
+        self.stats["batches"] += 1
+        self.stats["published"] += len(sent_ids)
+        self.stats["failed"] += len(failed)
+
+        if failed:
+            logger.warning(f"⚠️ Outbox relay failed to publish {len(failed)} of {len(rows)} events: {failed[0][1]}")
+
+        return len(rows), len(sent_ids)
+
+    async def drain(self, max_batches: Optional[int] = None) -> int:
+        published = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            claimed, count = await self._relay_batch()
+            batches += 1
+            published += count
+            if claimed < self.config.batch_size or count == 0:
+                break
+
+        return published
+
+    async def purge_sent(self) -> int:
+        purged = await self.outbox.purge_sent(self.config.sent_retention_seconds, self.config.purge_batch_size)
+        self.stats["purged"] += purged
+        return purged
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("✅ Outbox relay started")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Outbox relay stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                published = await self.drain()
+                if published == 0:
+                    await self.purge_sent()
+                    await asyncio.sleep(self.config.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Outbox relay error: {e}")
+                await asyncio.sleep(self.config.poll_interval)
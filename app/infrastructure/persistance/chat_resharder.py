@@ -0,0 +1,212 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+import asyncpg
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool
+from LuminMessageService.app.infrastructure.persistance.partitioning import MessagePartitionManager
+from LuminMessageService.app.infrastructure.persistance.shard_router import ShardRouter
+
+logger = logging.getLogger(__name__)
+
+COPY_MESSAGES_SQL = """
+INSERT INTO messages (
+    message_id, sender_id, recipient_id, chat_id, text, sent_at, read_at, edited_at, version, deleted_at
+)
+SELECT * FROM unnest(
+    $1::uuid[], $2::uuid[], $3::uuid[], $4::uuid[], $5::text[],
+    $6::timestamp[], $7::timestamp[], $8::timestamp[], $9::int[], $10::timestamp[]
+)
+ON CONFLICT (message_id, sent_at) DO UPDATE SET
+    text = EXCLUDED.text,
+    read_at = EXCLUDED.read_at,
+    edited_at = EXCLUDED.edited_at,
+    version = EXCLUDED.version,
+    deleted_at = EXCLUDED.deleted_at
+WHERE messages.version < EXCLUDED.version
+"""
+
+COPY_EVENTS_SQL = """
+INSERT INTO message_events (aggregate_id, version, chat_id, event_id, event_type, data, occurred_at)
+SELECT * FROM unnest($1::uuid[], $2::int[], $3::uuid[], $4::uuid[], $5::text[], $6::jsonb[], $7::timestamp[])
+ON CONFLICT DO NOTHING
+"""
+
+COPY_SNAPSHOTS_SQL = """
+INSERT INTO message_snapshots (aggregate_id, chat_id, version, state, created_at)
+SELECT * FROM unnest($1::uuid[], $2::uuid[], $3::int[], $4::jsonb[], $5::timestamp[])
+ON CONFLICT (aggregate_id) DO UPDATE SET
+    version = EXCLUDED.version,
+    state = EXCLUDED.state,
+    created_at = EXCLUDED.created_at
+WHERE message_snapshots.version < EXCLUDED.version
+"""
+
+MESSAGE_COLUMNS = (
+    "message_id", "sender_id", "recipient_id", "chat_id", "text",
+    "sent_at", "read_at", "edited_at", "version", "deleted_at"
+)
+EVENT_COLUMNS = ("aggregate_id", "version", "chat_id", "event_id", "event_type", "data", "occurred_at")
+SNAPSHOT_COLUMNS = ("aggregate_id", "chat_id", "version", "state", "created_at")
+
+
+@dataclass
+class ChatResharderConfig:
+    batch_size: int = 1000
+    settle_seconds: Optional[float] = None
+
+
+class ChatResharder:
+    def __init__(self, shard_router: ShardRouter, config: Optional[ChatResharderConfig] = None):
+        self.shard_router = shard_router
+        self.config = config or ChatResharderConfig()
+
+    @property
+    def settle_seconds(self) -> float:
+        if self.config.settle_seconds is not None:
+            return self.config.settle_seconds
+        return self.shard_router.config.override_refresh_interval * 2
+
+    async def move_chat(self, chat_id: UUID, target_shard: int) -> dict:
+        source_shard = self.shard_router.shard_index(chat_id)
+        if source_shard == target_shard:
+            return {"moved": False, "source": source_shard, "target": target_shard}
+
+        source = self.shard_router.shards[source_shard].primary
+        target = self.shard_router.shards[target_shard].primary
+
+        copied = await self._copy_chat(chat_id, source, target)
+        logger.info(f"Chat {chat_id}: {copied} messages copied to shard {target_shard}, freezing writes")
+
+        await self.shard_router.set_override(chat_id, source_shard, moving=True)
+        try:
+            await asyncio.sleep(self.settle_seconds)
+            caught_up = await self._copy_chat(chat_id, source, target)
+            await self._copy_chat_state(chat_id, source, target)
+            await self.shard_router.set_override(chat_id, target_shard)
+        except Exception:
+            await self.shard_router.set_override(chat_id, source_shard)
+            raise
+
+        await asyncio.sleep(self.settle_seconds)
+        purged = await self._purge_chat(chat_id, source)
+        logger.info(f"✅ Chat {chat_id} moved from shard {source_shard} to shard {target_shard}")
+
+        return {
+            "moved": True,
+            "source": source_shard,
+            "target": target_shard,
+            "copied": copied,
+            "caught_up": caught_up,
+            "purged": purged,
+        }
+
+    async def _copy_chat(self, chat_id: UUID, source: DatabasePool, target: DatabasePool) -> int:
+        async with source.acquire() as conn:
+            months = await conn.fetch(
+                "SELECT DISTINCT date_trunc('month', sent_at) AS month FROM messages WHERE chat_id = $1", chat_id
+            )
+        await MessagePartitionManager(target).ensure_months(row["month"] for row in months)
+
+        # Events are selected by chat rather than through message rows: compacted tombstones keep their events,
+        # and those events are what make re-creating a deleted message id a conflict on the new shard.
+        async with source.acquire() as source_conn:
+            async with source_conn.transaction(isolation="repeatable_read", readonly=True):
+                copied = await self._copy_rows(source_conn, target, """
+                SELECT message_id, sender_id, recipient_id, chat_id, text, sent_at, read_at, edited_at, version, deleted_at
+                FROM messages
+                WHERE chat_id = $1
+                ORDER BY sent_at, message_id
+                """, chat_id, COPY_MESSAGES_SQL, MESSAGE_COLUMNS)
+                await self._copy_rows(source_conn, target, """
+                SELECT aggregate_id, version, chat_id, event_id, event_type, data::text AS data, occurred_at
+                FROM message_events
+                WHERE chat_id = $1
+                """, chat_id, COPY_EVENTS_SQL, EVENT_COLUMNS)
+                await self._copy_rows(source_conn, target, """
+                SELECT aggregate_id, chat_id, version, state::text AS state, created_at
+                FROM message_snapshots
+                WHERE chat_id = $1
+                """, chat_id, COPY_SNAPSHOTS_SQL, SNAPSHOT_COLUMNS)
+
+        return copied
+
+    async def _copy_rows(
+            self,
+            source_conn: asyncpg.Connection,
+            target: DatabasePool,
+            select_sql: str,
+            chat_id: UUID,
+            insert_sql: str,
+            columns: tuple[str, ...]
+    ) -> int:
+        copied = 0
+        cursor = await source_conn.cursor(select_sql, chat_id)
+
+        while True:
+            rows = await cursor.fetch(self.config.batch_size)
+            if not rows:
+                break
+            async with target.acquire() as conn:
+                await conn.execute(insert_sql, *([row[column] for row in rows] for column in columns))
+            copied += len(rows)
+
+        return copied
+
+    async def _copy_chat_state(self, chat_id: UUID, source: DatabasePool, target: DatabasePool) -> None:
+        async with source.acquire() as conn:
+            watermarks = await conn.fetch(
+                "SELECT chat_id, reader_id, sent_at, message_id, updated_at FROM read_watermarks WHERE chat_id = $1",
+                chat_id
+            )
+            counters = await conn.fetch(
+                "SELECT recipient_id, chat_id, unread_count FROM unread_counters WHERE chat_id = $1", chat_id
+            )
+            last_seq = await conn.fetchval("SELECT last_seq FROM chat_sequences WHERE chat_id = $1", chat_id)
+            changes = await conn.fetch("""
+            SELECT chat_id, seq, message_id, change_type, data::text AS data, changed_at
+            FROM chat_changes
+            WHERE chat_id = $1
+            ORDER BY seq
+            """, chat_id)
+
+        async with target.acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany("""
+                INSERT INTO read_watermarks (chat_id, reader_id, sent_at, message_id, updated_at)
+                VALUES ($1, $2, $3, $4, $5)
+                ON CONFLICT (chat_id, reader_id) DO UPDATE SET
+                    sent_at = EXCLUDED.sent_at,
+                    message_id = EXCLUDED.message_id,
+                    updated_at = EXCLUDED.updated_at
+                """, [tuple(row) for row in watermarks])
+                await conn.executemany("""
+                INSERT INTO unread_counters (recipient_id, chat_id, unread_count)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (recipient_id, chat_id) DO UPDATE SET
+                    unread_count = EXCLUDED.unread_count
+                """, [tuple(row) for row in counters])
+                await conn.executemany("""
+                INSERT INTO chat_changes (chat_id, seq, message_id, change_type, data, changed_at)
+                VALUES ($1, $2, $3, $4, $5::jsonb, $6)
+                ON CONFLICT (chat_id, seq) DO NOTHING
+                """, [tuple(row) for row in changes])
+                if last_seq is not None:
+                    await conn.execute("""
+                    INSERT INTO chat_sequences (chat_id, last_seq) VALUES ($1, $2)
+                    ON CONFLICT (chat_id) DO UPDATE SET last_seq = GREATEST(chat_sequences.last_seq, EXCLUDED.last_seq)
+                    """, chat_id, last_seq)
+
+    async def _purge_chat(self, chat_id: UUID, source: DatabasePool) -> int:
+        async with source.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("DELETE FROM message_events WHERE chat_id = $1", chat_id)
+                await conn.execute("DELETE FROM message_snapshots WHERE chat_id = $1", chat_id)
+                await conn.execute("DELETE FROM read_watermarks WHERE chat_id = $1", chat_id)
+                await conn.execute("DELETE FROM unread_counters WHERE chat_id = $1", chat_id)
+                await conn.execute("DELETE FROM chat_changes WHERE chat_id = $1", chat_id)
+                await conn.execute("DELETE FROM chat_sequences WHERE chat_id = $1", chat_id)
+                result = await conn.execute("DELETE FROM messages WHERE chat_id = $1", chat_id)
+
+        return int(result.split()[-1])
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolConfig:
+    host: str = "localhost"
+    port: int = 5432
+    database: str = "LuminMessageDatabase"
+    user: str = "postgres"
+    password: Optional[str] = None
+    min_size: int = 2
+    max_size: int = 10
+    acquire_timeout: float = 5.0
+    max_idle_lifetime: float = 300.0
+    command_timeout: float = 30.0
+    dsn: Optional[str] = None
+
+
+class DatabasePool:
+    def __init__(self, config: PoolConfig):
+        self.config = config
+        self._pool: Optional[asyncpg.Pool] = None
+        self._connect_lock = asyncio.Lock()
+
+    async def connect(self) -> None:
+        async with self._connect_lock:
+            if self._pool is not None:
+                return
+
+            try:
+                if self.config.dsn:
+                    target = {"dsn": self.config.dsn}
+                else:
+                    target = {
+                        "host": self.config.host,
+                        "port": self.config.port,
+                        "database": self.config.database,
+                        "user": self.config.user,
+                        "password": self.config.password,
+                    }
+
+                self._pool = await asyncpg.create_pool(
+                    **target,
+                    min_size=self.config.min_size,
+                    max_size=self.config.max_size,
+                    max_inactive_connection_lifetime=self.config.max_idle_lifetime,
+                    command_timeout=self.config.command_timeout,
+                )
+                logger.info(
+                    f"✅ Postgres pool created ({self.config.min_size}..{self.config.max_size} connections)"
+                )
+            except Exception as e:
+                logger.error(f"❌ Postgres pool creation failed: {e}")
+                raise
+
+    async def disconnect(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        if self._pool is None:
+            await self.connect()
+
+        async with self._pool.acquire(timeout=self.config.acquire_timeout) as connection:
+            yield connection
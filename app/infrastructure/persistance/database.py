@@ -1,19 +1,125 @@
-from typing import Callable
-import psycopg2
+from functools import lru_cache
 from sqlalchemy import create_engine, Engine
-from LuminMessageService.app.config import settings, db_password
+from LuminMessageService.app.config import settings, db_password, redis_password
+from LuminMessageService.app.infrastructure.archive.message_archive import ArchiveConfig
+from LuminMessageService.app.infrastructure.cache.bounded_local_cache import LocalCacheConfig
+from LuminMessageService.app.infrastructure.cache.derived_key_sweeper import DerivedKeySweeperConfig
+from LuminMessageService.app.infrastructure.cache.redis_cache import CacheConfig
 from LuminMessageService.app.infrastructure.dependency_container import DependencyContainer
+from LuminMessageService.app.infrastructure.messaging.l1_invalidation_broadcaster import L1InvalidationConfig
+from LuminMessageService.app.infrastructure.messaging.outbox_relay import OutboxRelayConfig
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool, PoolConfig
+from LuminMessageService.app.infrastructure.persistance.partitioning import PartitionConfig
+from LuminMessageService.app.infrastructure.persistance.replica_router import ReplicaRouterConfig
+from LuminMessageService.app.infrastructure.persistance.shard_router import ShardRouterConfig
+from LuminMessageService.app.infrastructure.persistance.tombstone_compactor import TombstoneCompactorConfig
 
 
-def connection_factory() -> Callable:
-    def create_connection():
-        return psycopg2.connect(
-            host=settings.db_host,
-            database=settings.db_name,
-            user=settings.db_user,
-            password=db_password
-        )
-    return create_connection
+def get_pool_config() -> PoolConfig:
+    return PoolConfig(
+        host=settings.db_host,
+        port=settings.db_port,
+        database=settings.db_name,
+        user=settings.db_user,
+        password=db_password,
+        min_size=settings.db_pool_min_size,
+        max_size=settings.db_pool_max_size,
+        acquire_timeout=settings.db_pool_acquire_timeout,
+        max_idle_lifetime=settings.db_pool_max_idle_lifetime,
+    )
+
+
+def get_partition_config() -> PartitionConfig:
+    return PartitionConfig(
+        months_ahead=settings.messages_partitions_ahead,
+        retention_months=settings.messages_retention_months,
+        detach_only=settings.messages_retention_detach_only,
+    )
+
+
+def get_replica_router_config() -> ReplicaRouterConfig:
+    return ReplicaRouterConfig(
+        max_lag_seconds=settings.db_replica_max_lag_seconds,
+        read_your_writes_window=settings.db_read_your_writes_window,
+        health_check_interval=settings.db_replica_health_interval,
+    )
+
+
+def get_shard_router_config() -> ShardRouterConfig:
+    return ShardRouterConfig(
+        route_cache_size=settings.db_shard_route_cache_size,
+        override_refresh_interval=settings.db_shard_override_refresh_interval,
+    )
+
+
+def get_outbox_relay_config() -> OutboxRelayConfig:
+    return OutboxRelayConfig(
+        batch_size=settings.outbox_batch_size,
+        poll_interval=settings.outbox_poll_interval,
+        sent_retention_seconds=settings.outbox_sent_retention_seconds,
+    )
+
+
+def get_tombstone_compactor_config() -> TombstoneCompactorConfig:
+    return TombstoneCompactorConfig(
+        retention_seconds=settings.tombstone_retention_seconds,
+        chunk_size=settings.tombstone_compaction_chunk_size,
+        pause_seconds=settings.tombstone_compaction_pause,
+        max_chunks=settings.tombstone_compaction_max_chunks,
+    )
+
+
+def get_archive_config() -> ArchiveConfig:
+    return ArchiveConfig(
+        directory=settings.archive_directory,
+        archive_after_days=settings.archive_after_days,
+        segment_rows=settings.archive_segment_rows,
+        cached_row_groups=settings.archive_cached_row_groups,
+    )
+
+
+def get_cache_config() -> CacheConfig:
+    return CacheConfig(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        password=redis_password or None,
+        db=settings.redis_db,
+        default_ttl=settings.redis_hard_ttl,
+        soft_ttl=settings.redis_soft_ttl,
+        ttl_jitter=settings.redis_ttl_jitter,
+        fill_lease_ms=settings.redis_fill_lease_ms,
+        absent_ttl=settings.redis_absent_ttl,
+        local_absent_ttl=settings.local_absent_ttl,
+    )
+
+
+def get_local_cache_config() -> LocalCacheConfig:
+    return LocalCacheConfig(
+        max_entries=settings.local_cache_max_entries,
+        max_bytes=settings.local_cache_max_bytes,
+        ttl_seconds=settings.local_cache_ttl_seconds,
+    )
+
+
+def get_derived_key_sweeper_config() -> DerivedKeySweeperConfig:
+    return DerivedKeySweeperConfig(
+        max_keys_per_second=settings.cache_sweep_max_keys_per_second,
+        max_keys_per_run=settings.cache_sweep_max_keys_per_run,
+    )
+
+
+def get_l1_invalidation_config() -> L1InvalidationConfig:
+    return L1InvalidationConfig(
+        enabled=settings.l1_invalidation_enabled,
+        nats_url=settings.nats_url,
+        subject=settings.l1_invalidation_subject,
+        degraded_local_ttl=settings.l1_degraded_local_ttl,
+    )
+
+
+@lru_cache()
+def get_connection_pool() -> DatabasePool:
+    return DatabasePool(get_pool_config())
 
 
 def get_sync_engine() -> Engine:
@@ -24,5 +130,20 @@ def get_sync_engine() -> Engine:
     )
 
 
+@lru_cache()
 def get_dependency_container() -> DependencyContainer:
-    return DependencyContainer(connection_factory())
+    return DependencyContainer(
+        get_connection_pool(),
+        redis_config=get_cache_config(),
+        partition_config=get_partition_config(),
+        replica_dsns=settings.db_replica_dsns,
+        replica_router_config=get_replica_router_config(),
+        outbox_relay_config=get_outbox_relay_config(),
+        tombstone_compactor_config=get_tombstone_compactor_config(),
+        shard_dsns=settings.db_shard_dsns,
+        shard_router_config=get_shard_router_config(),
+        archive_config=get_archive_config(),
+        local_cache_config=get_local_cache_config(),
+        derived_key_sweeper_config=get_derived_key_sweeper_config(),
+        l1_invalidation_config=get_l1_invalidation_config(),
+    )
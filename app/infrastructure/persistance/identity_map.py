@@ -19,7 +19,7 @@ class MessageIdentityMap(IdentityMap):
 
     def remove(self, message_id: UUID) -> None:
         with self._lock:
-            del self._map[message_id]
+            self._map.pop(message_id, None)
 
     def clear(self) -> None:
         with self._lock:
@@ -1,21 +1,33 @@
+import json
+from datetime import datetime
 from typing import Any
+from uuid import UUID
 from LuminMessageService.app.domain.models.aggregates.message import Message
+from LuminMessageService.app.domain.models.common.value_objects import MessageText
 from LuminMessageService.app.domain.repositories.data_mapper import MessageDataMapper
 
+STATE_UUID_FIELDS = ("message_id", "sender_id", "recipient_id", "chat_id")
+STATE_DATETIME_FIELDS = ("sent_at", "read_at", "edited_at")
+CREATION_FIELDS = ("sender_id", "recipient_id", "chat_id", "text", "sent_at", "read_at", "edited_at")
+REQUIRED_FIELDS = ("sender_id", "recipient_id", "chat_id", "text", "sent_at")
+
 
 class MessageMapper(MessageDataMapper):
     def to_domain(self, data: dict) -> Message:
         try:
+            text = data["text"]
             message = Message(
                 message_id=data["message_id"],
                 sender_id=data["sender_id"],
                 recipient_id=data["recipient_id"],
                 chat_id=data["chat_id"],
-                text=data["text"],
+                text=text if isinstance(text, MessageText) else MessageText(text),
                 sent_at=data["sent_at"],
                 read_at=data["read_at"],
                 edited_at=data["edited_at"],
             )
+            message.mark_as_persisted(data.get("version") or 0)
+            message.clear_domain_events()
 
             return message
 
@@ -34,9 +46,63 @@ class MessageMapper(MessageDataMapper):
                 "sent_at": message.sent_at,
                 "read_at": message.read_at,
                 "edited_at": message.edited_at,
+                "version": message.version,
+                "is_read": message.is_read,
             }
         except Exception as e:
             raise ValueError(f"Error mapping to persistence: {e}")
 
     def to_domain_list(self, data_list: list[dict]) -> list[Message]:
         return [self.to_domain(data) for data in data_list]
+
+    def to_snapshot(self, message: Message) -> str:
+        state = self.to_persistence(message)
+        state.pop("version")
+        state.pop("is_read")
+        return json.dumps(state, default=str)
+
+    @staticmethod
+    def apply_event(state: dict[str, Any], event_type: str, data: dict[str, Any]) -> None:
+        if event_type == "MessageSentEvent":
+            for key in ("sender_id", "recipient_id", "chat_id", "sent_at"):
+                state[key] = data[key]
+        elif event_type == "MessageCreatedEvent":
+            for key in CREATION_FIELDS:
+                if data.get(key) is not None:
+                    state[key] = data[key]
+        elif event_type == "MessageEditedEvent":
+            state["text"] = data["new_text"]
+            state["edited_at"] = data["edited_at"]
+        elif event_type == "MessageReadEvent":
+            state["read_at"] = data["read_at"]
+        elif event_type == "MessageDeletedEvent":
+            state["is_deleted"] = True
+
+    def fold_history(
+            self,
+            message_id: UUID,
+            snapshot: dict[str, Any] | None,
+            snapshot_version: int,
+            events: list[tuple[int, str, dict[str, Any]]]
+    ) -> dict[str, Any] | None:
+        if snapshot is None and (not events or events[0][0] != 1):
+            return None
+
+        state = {"read_at": None, "edited_at": None, **(snapshot or {}), "message_id": message_id}
+        version = snapshot_version
+        for event_version, event_type, data in events:
+            self.apply_event(state, event_type, data)
+            version = event_version
+
+        if any(state.get(key) is None for key in REQUIRED_FIELDS):
+            return None
+
+        state["version"] = version
+        for key in STATE_UUID_FIELDS:
+            if isinstance(state[key], str):
+                state[key] = UUID(state[key])
+        for key in STATE_DATETIME_FIELDS:
+            if isinstance(state[key], str):
+                state[key] = datetime.fromisoformat(state[key])
+
+        return state
@@ -1,5 +1,7 @@
 import uuid
-from sqlalchemy import Column, UUID, String, Date, Integer
+from sqlalchemy import Column, UUID, String, DateTime, Integer, Index, BigInteger, Text, Boolean, Computed
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy import text as sql_text
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -9,11 +11,131 @@ class MessageModel(Base):
     __tablename__ = "messages"
 
     message_id = Column(UUID(), primary_key=True, default=lambda: uuid.uuid4())
-    sender_id = Column(UUID(), primary_key=True, default=lambda: uuid.uuid4())
-    recipient_id = Column(UUID(), primary_key=True, default=lambda: uuid.uuid4())
-    chat_id = Column(UUID(), primary_key=True, default=lambda: uuid.uuid4())
-    text = Column(String(300)),
-    sent_at = Column(Date),
-    read_at = Column(Date),
-    edited_at = Column(Date),
-    version = Column(Integer())
+    sender_id = Column(UUID(), nullable=False)
+    recipient_id = Column(UUID(), nullable=False)
+    chat_id = Column(UUID(), nullable=False)
+    text = Column(String(5000), nullable=False)
+    sent_at = Column(DateTime(), primary_key=True)
+    read_at = Column(DateTime())
+    edited_at = Column(DateTime())
+    version = Column(Integer(), nullable=False, default=1, server_default="1")
+    deleted_at = Column(DateTime())
+    search_vector = Column(TSVECTOR(), Computed("to_tsvector('simple', text)", persisted=True))
+
+    __table_args__ = (
+        Index(
+            "ix_messages_chat_id_sent_at_message_id", "chat_id", "sent_at", "message_id",
+            postgresql_where=sql_text("deleted_at IS NULL")
+        ),
+        Index(
+            "ix_messages_unread", "recipient_id", "chat_id",
+            postgresql_where=sql_text("read_at IS NULL AND deleted_at IS NULL")
+        ),
+        Index(
+            "ix_messages_search_vector", "search_vector",
+            postgresql_using="gin", postgresql_where=sql_text("deleted_at IS NULL")
+        ),
+        Index("ix_messages_tombstones", "deleted_at", postgresql_where=sql_text("deleted_at IS NOT NULL")),
+        {"postgresql_partition_by": "RANGE (sent_at)"},
+    )
+
+
+class MessageEventModel(Base):
+    __tablename__ = "message_events"
+
+    aggregate_id = Column(UUID(), primary_key=True)
+    version = Column(Integer(), primary_key=True)
+    chat_id = Column(UUID(), nullable=False)
+    event_id = Column(UUID(), nullable=False, unique=True)
+    event_type = Column(String(100), nullable=False)
+    data = Column(JSONB(), nullable=False)
+    occurred_at = Column(DateTime(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_message_events_chat_id", "chat_id"),
+    )
+
+
+class MessageSnapshotModel(Base):
+    __tablename__ = "message_snapshots"
+
+    aggregate_id = Column(UUID(), primary_key=True)
+    chat_id = Column(UUID(), nullable=False)
+    version = Column(Integer(), nullable=False)
+    state = Column(JSONB(), nullable=False)
+    created_at = Column(DateTime(), nullable=False, server_default=sql_text("now()"))
+
+    __table_args__ = (
+        Index("ix_message_snapshots_chat_id", "chat_id"),
+    )
+
+
+class ReadWatermarkModel(Base):
+    __tablename__ = "read_watermarks"
+
+    chat_id = Column(UUID(), primary_key=True)
+    reader_id = Column(UUID(), primary_key=True)
+    sent_at = Column(DateTime(), nullable=False)
+    message_id = Column(UUID(), nullable=False)
+    updated_at = Column(DateTime(), nullable=False)
+
+
+class UnreadCounterModel(Base):
+    __tablename__ = "unread_counters"
+
+    recipient_id = Column(UUID(), primary_key=True)
+    chat_id = Column(UUID(), primary_key=True)
+    unread_count = Column(Integer(), nullable=False, default=0, server_default="0")
+
+
+class OutboxModel(Base):
+    __tablename__ = "outbox"
+
+    id = Column(BigInteger(), primary_key=True, autoincrement=True)
+    event_id = Column(UUID(), nullable=False, unique=True)
+    aggregate_id = Column(UUID(), nullable=False)
+    event_type = Column(String(100), nullable=False)
+    subject = Column(String(255), nullable=False)
+    payload = Column(JSONB(), nullable=False)
+    created_at = Column(DateTime(), nullable=False, server_default=sql_text("now()"))
+    sent_at = Column(DateTime())
+    attempts = Column(Integer(), nullable=False, default=0, server_default="0")
+    last_error = Column(Text())
+
+    __table_args__ = (
+        Index("ix_outbox_pending", "id", postgresql_where=sql_text("sent_at IS NULL")),
+    )
+
+
+class MessageRouteModel(Base):
+    __tablename__ = "message_routes"
+
+    message_id = Column(UUID(), primary_key=True)
+    chat_id = Column(UUID(), nullable=False)
+
+
+class ChatShardModel(Base):
+    __tablename__ = "chat_shards"
+
+    chat_id = Column(UUID(), primary_key=True)
+    shard = Column(Integer(), nullable=False)
+    moving = Column(Boolean(), nullable=False, default=False, server_default="false")
+    updated_at = Column(DateTime(), nullable=False, server_default=sql_text("now()"))
+
+
+class ChatSequenceModel(Base):
+    __tablename__ = "chat_sequences"
+
+    chat_id = Column(UUID(), primary_key=True)
+    last_seq = Column(BigInteger(), nullable=False)
+
+
+class ChatChangeModel(Base):
+    __tablename__ = "chat_changes"
+
+    chat_id = Column(UUID(), primary_key=True)
+    seq = Column(BigInteger(), primary_key=True)
+    message_id = Column(UUID(), nullable=False)
+    change_type = Column(String(100), nullable=False)
+    data = Column(JSONB(), nullable=False)
+    changed_at = Column(DateTime(), nullable=False)
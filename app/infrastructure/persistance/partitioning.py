@@ -0,0 +1,110 @@
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME_PATTERN = re.compile(r"^messages_y(\d{4})m(\d{2})$")
+
+
+def _month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    month_index = value.year * 12 + value.month - 1 + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+@dataclass
+class PartitionConfig:
+    months_ahead: int = 3
+    retention_months: int = 12
+    detach_only: bool = False
+
+
+class MessagePartitionManager:
+    def __init__(self, connection_pool: DatabasePool, config: PartitionConfig | None = None):
+        self.connection_pool = connection_pool
+        self.config = config or PartitionConfig()
+
+    @staticmethod
+    def partition_name(month: datetime) -> str:
+        return f"messages_y{month.year:04d}m{month.month:02d}"
+
+    async def ensure_partitions(self, now: datetime | None = None) -> list[str]:
+        current = _month_start(now or datetime.now())
+        return await self.ensure_months(_add_months(current, offset) for offset in range(self.config.months_ahead + 1))
+
+    async def ensure_months(self, months: Iterable[datetime]) -> list[str]:
+        async with self.connection_pool.acquire() as conn:
+            return await self.create_months(conn, months)
+
+    @classmethod
+    async def create_months(cls, conn, months: Iterable[datetime]) -> list[str]:
+        lowers = {cls.partition_name(lower): lower for lower in sorted({_month_start(month) for month in months})}
+        if not lowers:
+            return []
+
+        missing = await conn.fetch(
+            "SELECT name FROM unnest($1::text[]) AS name WHERE to_regclass(name) IS NULL", list(lowers)
+        )
+
+        created = []
+        for row in missing:
+            name = row["name"]
+            lower = lowers[name]
+            upper = _add_months(lower, 1)
+
+            await conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {name} PARTITION OF messages
+            FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')
+            """)
+            created.append(name)
+            logger.info(f"Created partition {name} [{lower.date()}, {upper.date()})")
+
+        return created
+
+    async def list_partitions(self) -> list[tuple[str, datetime]]:
+        async with self.connection_pool.acquire() as conn:
+            rows = await conn.fetch("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = 'messages'
+            """)
+
+        partitions = []
+        for row in rows:
+            match = PARTITION_NAME_PATTERN.match(row["relname"])
+            if match:
+                partitions.append((row["relname"], datetime(int(match.group(1)), int(match.group(2)), 1)))
+
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    async def apply_retention(self, now: datetime | None = None) -> list[str]:
+        if self.config.retention_months <= 0:
+            return []
+
+        cutoff = _add_months(_month_start(now or datetime.now()), -self.config.retention_months)
+        expired = [name for name, month in await self.list_partitions() if _add_months(month, 1) <= cutoff]
+
+        for name in expired:
+            async with self.connection_pool.acquire() as conn:
+                await conn.execute(f"ALTER TABLE messages DETACH PARTITION {name} CONCURRENTLY")
+                logger.info(f"Detached partition {name}")
+
+                if not self.config.detach_only:
+                    await conn.execute(f"DROP TABLE IF EXISTS {name}")
+                    logger.info(f"Dropped partition {name}")
+
+        return expired
+
+    async def maintain(self, now: datetime | None = None) -> dict:
+        created = await self.ensure_partitions(now)
+        expired = await self.apply_retention(now)
+        return {"created": created, "expired": expired}
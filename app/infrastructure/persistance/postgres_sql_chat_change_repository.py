@@ -0,0 +1,82 @@
+import json
+from uuid import UUID
+from LuminMessageService.app.domain.events.domain_event import DomainEvent
+from LuminMessageService.app.domain.models.common.value_objects import ChatChange
+from LuminMessageService.app.domain.repositories.reposiotries import ChatChangeRepository, ChatChangePage
+from LuminMessageService.app.infrastructure.persistance.transaction_scope import TransactionScope
+
+RECORD_CHANGES_SQL = """
+WITH input AS (
+    SELECT * FROM unnest($1::uuid[], $2::uuid[], $3::text[], $4::jsonb[], $5::timestamp[])
+    WITH ORDINALITY AS c(chat_id, message_id, change_type, data, changed_at, position)
+), counts AS (
+    SELECT chat_id, count(*) AS change_count FROM input GROUP BY chat_id
+), allocated AS (
+    INSERT INTO chat_sequences (chat_id, last_seq)
+    SELECT chat_id, change_count FROM counts ORDER BY chat_id
+    ON CONFLICT (chat_id) DO UPDATE SET
+        last_seq = chat_sequences.last_seq + EXCLUDED.last_seq
+    RETURNING chat_id, last_seq
+)
+INSERT INTO chat_changes (chat_id, seq, message_id, change_type, data, changed_at)
+SELECT
+    i.chat_id,
+    a.last_seq - c.change_count + row_number() OVER (PARTITION BY i.chat_id ORDER BY i.position),
+    i.message_id,
+    i.change_type,
+    i.data,
+    i.changed_at
+FROM input AS i
+JOIN counts AS c ON c.chat_id = i.chat_id
+JOIN allocated AS a ON a.chat_id = i.chat_id
+"""
+
+
+class PostgresSQLChatChangeRepository(ChatChangeRepository):
+    def __init__(self, scope: TransactionScope) -> None:
+        self.scope = scope
+
+    async def record(self, changes: list[tuple[UUID, UUID, DomainEvent]]) -> None:
+        if not changes:
+            return
+
+        conn = await self.scope.get_connection()
+        self.scope.mark_dirty()
+        await conn.execute(
+            RECORD_CHANGES_SQL,
+            [chat_id for chat_id, _, _ in changes],
+            [message_id for _, message_id, _ in changes],
+            [event.event_type for _, _, event in changes],
+            [json.dumps(event.data, default=str) for _, _, event in changes],
+            [event.occurred_at for _, _, event in changes]
+        )
+
+    async def get_since(self, chat_id: UUID, since_seq: int, limit: int) -> ChatChangePage:
+        select_sql = """
+        SELECT chat_id, seq, message_id, change_type, data::text AS data, changed_at
+        FROM chat_changes
+        WHERE chat_id = $1 AND seq > $2
+        ORDER BY seq
+        LIMIT $3
+        """
+
+        conn = await self.scope.get_connection()
+        rows = await conn.fetch(select_sql, chat_id, since_seq, limit + 1)
+
+        changes = [
+            ChatChange(
+                chat_id=row["chat_id"],
+                seq=row["seq"],
+                message_id=row["message_id"],
+                change_type=row["change_type"],
+                data=json.loads(row["data"]),
+                changed_at=row["changed_at"]
+            )
+            for row in rows[:limit]
+        ]
+
+        return ChatChangePage(
+            changes=changes,
+            last_seq=changes[-1].seq if changes else since_seq,
+            has_more=len(rows) > limit
+        )
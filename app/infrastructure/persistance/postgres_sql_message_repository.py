@@ -1,63 +1,304 @@
+import logging
+import json
+from functools import partial
+from typing import Any, AsyncIterator
 from uuid import UUID
-from psycopg2.extras import RealDictCursor
+import asyncpg
+from LuminMessageService.app.domain.events.domain_event import DomainEvent
+from LuminMessageService.app.domain.events.message_events import MessageReadEvent, MessageDeletedEvent, \
+    MessageSentEvent
 from LuminMessageService.app.domain.models.aggregates.message import Message
-from LuminMessageService.app.domain.repositories.reposiotries import MessageRepository
+from LuminMessageService.app.domain.models.common.exceptions import MessageVersionConflictError
+from LuminMessageService.app.domain.models.common.value_objects import HistoryDirection, MessageCursor, SearchCursor
+from LuminMessageService.app.domain.repositories.reposiotries import MessageRepository, MessagePage, MessageSearchPage
+from LuminMessageService.app.infrastructure.archive.message_archive import MessageArchive
 from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache
 from LuminMessageService.app.infrastructure.persistance.identity_map import MessageIdentityMap
 from LuminMessageService.app.infrastructure.persistance.message_mapper import MessageMapper
+from LuminMessageService.app.infrastructure.persistance.partitioning import MessagePartitionManager
+from LuminMessageService.app.infrastructure.persistance.postgres_sql_chat_change_repository import \
+    PostgresSQLChatChangeRepository
+from LuminMessageService.app.infrastructure.persistance.postgres_sql_read_watermark_repository import \
+    PostgresSQLReadWatermarkRepository
+from LuminMessageService.app.infrastructure.persistance.postgres_sql_unread_counter_repository import \
+    PostgresSQLUnreadCounterRepository
+from LuminMessageService.app.infrastructure.persistance.transaction_scope import TransactionScope
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_COLUMNS = "message_id, sender_id, recipient_id, chat_id, text, sent_at, read_at, edited_at, version"
+
+SEARCH_CONFIG = "simple"
+
+INCREMENT_UNREAD_CTE = """,
+counted AS (
+    INSERT INTO unread_counters (recipient_id, chat_id, unread_count)
+    SELECT $3, $4, 1 FROM saved
+    ON CONFLICT (recipient_id, chat_id) DO UPDATE SET
+        unread_count = unread_counters.unread_count + 1
+)"""
+
+DECREMENT_UNREAD_CTE = """,
+counted AS (
+    UPDATE unread_counters SET unread_count = GREATEST(unread_count - 1, 0)
+    WHERE recipient_id = $3 AND chat_id = $4 AND EXISTS (SELECT 1 FROM saved)
+)"""
+
+HISTORY_SQL = """
+WITH live AS (
+    SELECT DISTINCT message_id FROM messages
+    WHERE message_id = ANY($1::uuid[]) AND deleted_at IS NULL
+)
+SELECT s.aggregate_id, s.version, NULL::text AS event_type, s.state::text AS data
+FROM message_snapshots AS s
+JOIN live ON live.message_id = s.aggregate_id
+UNION ALL
+SELECT e.aggregate_id, e.version, e.event_type, e.data::text AS data
+FROM live
+LEFT JOIN message_snapshots AS s ON s.aggregate_id = live.message_id
+CROSS JOIN LATERAL (
+    SELECT aggregate_id, version, event_type, data FROM message_events
+    WHERE aggregate_id = live.message_id AND version > COALESCE(s.version, 0)
+) AS e
+ORDER BY aggregate_id, version
+"""
+
+PROMOTE_ARCHIVED_SQL = """
+INSERT INTO messages (message_id, sender_id, recipient_id, chat_id, text, sent_at, read_at, edited_at, version)
+SELECT * FROM unnest(
+    $1::uuid[], $2::uuid[], $3::uuid[], $4::uuid[],
+    $5::text[], $6::timestamp[], $7::timestamp[], $8::timestamp[], $9::int[]
+)
+ON CONFLICT (message_id, sent_at) DO NOTHING
+"""
+
+DELETE_SQL = """
+WITH deleted AS (
+    UPDATE messages SET deleted_at = now(), version = version + 1
+    WHERE message_id = ANY($1::uuid[]) AND deleted_at IS NULL
+    RETURNING message_id, recipient_id, chat_id, sent_at, read_at, version
+), unread AS (
+    SELECT d.recipient_id, d.chat_id, count(*)::int AS deleted_count
+    FROM deleted AS d
+    LEFT JOIN read_watermarks AS w ON w.chat_id = d.chat_id AND w.reader_id = d.recipient_id
+    WHERE d.read_at IS NULL
+    AND (w.sent_at IS NULL OR (d.sent_at, d.message_id) > (w.sent_at, w.message_id))
+    GROUP BY d.recipient_id, d.chat_id
+), counted AS (
+    UPDATE unread_counters AS c SET unread_count = GREATEST(c.unread_count - u.deleted_count, 0)
+    FROM unread AS u
+    WHERE c.recipient_id = u.recipient_id AND c.chat_id = u.chat_id
+)
+SELECT message_id, recipient_id, chat_id, version FROM deleted
+"""
 
 
 class PostgresSQLMessageRepository(MessageRepository):
-    def __init__(self, connection_factory, identity_map: MessageIdentityMap, cache: MultiLevelCache) -> None:
-        self.connection_factory = connection_factory
+    BATCH_SIZE = 1000
+    SNAPSHOT_INTERVAL = 50
+
+    def __init__(
+            self,
+            scope: TransactionScope,
+            identity_map: MessageIdentityMap,
+            cache: MultiLevelCache,
+            unread_counters: PostgresSQLUnreadCounterRepository,
+            read_watermarks: PostgresSQLReadWatermarkRepository,
+            chat_changes: PostgresSQLChatChangeRepository,
+            archive: MessageArchive | None = None,
+    ) -> None:
+        self.scope = scope
         self.identity_map = identity_map
         self.mapper = MessageMapper()
         self.cache = cache
-
-    def _get_connection(self):
-        conn = self.connection_factory()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        return conn, cursor
-
-    async def save(self, message: Message) -> None:
-        conn, cursor = self._get_connection()
+        self.unread_counters = unread_counters
+        self.read_watermarks = read_watermarks
+        self.chat_changes = chat_changes
+        self.archive = archive
+
+    @staticmethod
+    def _unread_delta(message: Message) -> int:
+        if message.expected_version == 0:
+            return 0 if message.is_read else 1
+        if any(isinstance(event, MessageReadEvent) for event in message.get_domain_events()):
+            return -1
+        return 0
+
+    async def _refresh_cached_messages(self, messages_data: dict[UUID, dict[str, Any]]) -> None:
+        await self.cache.invalidate_messages(list(messages_data))
+        await self.cache.invalidate_chats(list({message_data["chat_id"] for message_data in messages_data.values()}))
+        await self.cache.set_messages(messages_data)
+
+    @staticmethod
+    def _stamp_events(expected_version: int, events: list[DomainEvent]) -> int:
+        version = expected_version
+        for event in events:
+            version += 1
+            event.version = version
+        return version
+
+    @staticmethod
+    def _chat_changes(message: Message, events: list[DomainEvent]) -> list[tuple[UUID, UUID, DomainEvent]]:
+        return [(message.chat_id, message.id, event) for event in events if not isinstance(event, MessageSentEvent)]
+
+    def _needs_snapshot(self, expected_version: int, new_version: int) -> bool:
+        return new_version // self.SNAPSHOT_INTERVAL > expected_version // self.SNAPSHOT_INTERVAL
+
+    async def _append_events(self, conn, chat_ids: dict[UUID, UUID], events: list[DomainEvent]) -> None:
+        if not events:
+            return
+
+        append_sql = """
+        INSERT INTO message_events (aggregate_id, version, chat_id, event_id, event_type, data, occurred_at)
+        SELECT * FROM unnest(
+            $1::uuid[], $2::int[], $3::uuid[], $4::uuid[], $5::text[], $6::jsonb[], $7::timestamp[]
+        )
+        """
 
         try:
-            check_sql = "SELECT message_id FROM messages WHERE user_id = %s"
-            cursor.execute(check_sql, (str(message.id),))
-            existing_user = cursor.fetchone()
-
-            if existing_user:
-                update_sql = """
-                UPDATE users SET
-                    sender_id = %s,
-                    recipient_id = %s,
-                    chat_id = %s,
-                    text = %s,
-                    sent_at = %s,
-                    read_at = %s,
-                    edited_at = %s,
-                WHERE message_id = %s
-                """
-
-                message_data = (
-                    message.sender_id,
-                    message.recipient_id,
-                    message.chat_id,
-                    message.text.value,
-                    message.sent_at,
-                    message.read_at,
-                    message.edited_at,
-                    str(message.id)
+            await conn.execute(
+                append_sql,
+                [event.aggregate_id for event in events],
+                [event.version for event in events],
+                [chat_ids[event.aggregate_id] for event in events],
+                [event.event_id for event in events],
+                [event.event_type for event in events],
+                [json.dumps(event.data, default=str) for event in events],
+                [event.occurred_at for event in events]
+            )
+        except asyncpg.UniqueViolationError as e:
+            raise MessageVersionConflictError(
+                f"Message already exists or was modified concurrently: {e.detail}"
+            ) from e
+
+    async def _save_snapshots(self, conn, messages: list[Message]) -> None:
+        if not messages:
+            return
+
+        snapshot_sql = """
+        INSERT INTO message_snapshots (aggregate_id, chat_id, version, state, created_at)
+        SELECT s.aggregate_id, s.chat_id, s.version, s.state, now()
+        FROM unnest($1::uuid[], $2::uuid[], $3::int[], $4::jsonb[]) AS s(aggregate_id, chat_id, version, state)
+        ON CONFLICT (aggregate_id) DO UPDATE SET
+            version = EXCLUDED.version,
+            state = EXCLUDED.state,
+            created_at = EXCLUDED.created_at
+        WHERE message_snapshots.version < EXCLUDED.version
+        """
+
+        await conn.execute(
+            snapshot_sql,
+            [message.id for message in messages],
+            [message.chat_id for message in messages],
+            [message.version for message in messages],
+            [self.mapper.to_snapshot(message) for message in messages]
+        )
+
+    async def _load_histories(self, conn, message_ids: list[UUID]) -> dict[UUID, dict[str, Any]]:
+        rows = await conn.fetch(HISTORY_SQL, message_ids)
+
+        streams: dict[UUID, tuple[dict[str, Any] | None, int, list[tuple[int, str, dict[str, Any]]]]] = {}
+        for row in rows:
+            snapshot, snapshot_version, events = streams.get(row["aggregate_id"], (None, 0, []))
+            if row["event_type"] is None:
+                snapshot, snapshot_version = json.loads(row["data"]), row["version"]
+            else:
+                events.append((row["version"], row["event_type"], json.loads(row["data"])))
+            streams[row["aggregate_id"]] = (snapshot, snapshot_version, events)
+
+        histories = {}
+        for message_id, (snapshot, snapshot_version, events) in streams.items():
+            state = self.mapper.fold_history(message_id, snapshot, snapshot_version, events)
+            if state is not None:
+                histories[message_id] = state
+        return histories
+
+    @staticmethod
+    async def _shadowed_ids(conn, message_ids: list[UUID]) -> set[UUID]:
+        if not message_ids:
+            return set()
+        rows = await conn.fetch("SELECT message_id FROM messages WHERE message_id = ANY($1::uuid[])", message_ids)
+        return {row["message_id"] for row in rows}
+
+    async def _promote_archived(self, conn, message_ids: list[UUID]) -> None:
+        archived = await self.archive.get_many(message_ids)
+        shadowed = await self._shadowed_ids(conn, list(archived))
+        rows = [
+            row for message_id, row in archived.items() if message_id not in shadowed and not row["is_deleted"]
+        ]
+        if rows:
+            await MessagePartitionManager.create_months(conn, [row["sent_at"] for row in rows])
+            await conn.execute(PROMOTE_ARCHIVED_SQL, *(
+                [row[column] for row in rows]
+                for column in (
+                    "message_id", "sender_id", "recipient_id", "chat_id", "text",
+                    "sent_at", "read_at", "edited_at", "version"
                 )
+            ))
+
+    async def _merge_archived(
+            self,
+            conn,
+            rows: list[dict[str, Any]],
+            archived: list[dict[str, Any]],
+            older: bool,
+    ) -> list[dict[str, Any]]:
+        hot_ids = {row["message_id"] for row in rows}
+        archived = [row for row in archived if row["message_id"] not in hot_ids]
+        if not archived:
+            return rows
+
+        shadowed = await self._shadowed_ids(conn, [row["message_id"] for row in archived])
+        merged = rows + [row for row in archived if row["message_id"] not in shadowed]
+        merged.sort(key=lambda row: (row["sent_at"], row["message_id"]), reverse=older)
+        return merged
+
+    async def _delete_batch(self, conn, message_ids: list[UUID]) -> int:
+        if self.archive:
+            await self._promote_archived(conn, message_ids)
+
+        rows = await conn.fetch(DELETE_SQL, message_ids)
+
+        events = []
+        for row in rows:
+            event = MessageDeletedEvent(
+                aggregate_id=row["message_id"],
+                data={"chat_id": str(row["chat_id"]), "recipient_id": str(row["recipient_id"])}
+            )
+            self._stamp_events(row["version"] - 1, [event])
+            events.append(event)
+
+        await self._append_events(conn, {row["message_id"]: row["chat_id"] for row in rows}, events)
+        await self.chat_changes.record([
+            (row["chat_id"], row["message_id"], event) for row, event in zip(rows, events)
+        ])
+        for event in events:
+            self.scope.add_event(event)
+        self.scope.after_commit(partial(self.cache.invalidate_chats, list({row["chat_id"] for row in rows})))
+
+        return len(rows)
+
+    async def _apply_read_watermarks(self, messages: list[Message]) -> None:
+        watermarks = await self.read_watermarks.get_many({(message.chat_id, message.recipient_id) for message in messages})
+        for message in messages:
+            watermark = watermarks.get((message.chat_id, message.recipient_id))
+            if watermark:
+                message.apply_read_watermark(watermark)
 
-                cursor.execute(update_sql, message_data)
-                print(f"Message updated: {message.id}")
+    async def save(self, message: Message) -> None:
+        unread_delta = self._unread_delta(message)
+        if unread_delta > 0:
+            counter_cte = INCREMENT_UNREAD_CTE
+        elif unread_delta < 0:
+            counter_cte = DECREMENT_UNREAD_CTE
+        else:
+            counter_cte = ""
 
-            else:
-                insert_sql = """
+        try:
+            upsert_sql = f"""
+            WITH saved AS (
                 INSERT INTO messages (
-                    message_id, 
+                    message_id,
                     sender_id,
                     recipient_id,
                     chat_id,
@@ -65,108 +306,479 @@ class PostgresSQLMessageRepository(MessageRepository):
                     sent_at,
                     read_at,
                     edited_at,
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s CURRENT_TIMESTAMP)
-                """
-
-                user_data = (
-                    str(message.id),
-                    message.sender_id,
-                    message.recipient_id,
-                    message.chat_id,
-                    message.text.value,
-                    message.sent_at,
-                    message.read_at,
-                    message.edited_at,
+                    version
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $10)
+                ON CONFLICT (message_id, sent_at) DO UPDATE SET
+                    text = EXCLUDED.text,
+                    read_at = EXCLUDED.read_at,
+                    edited_at = EXCLUDED.edited_at,
+                    version = EXCLUDED.version
+                WHERE messages.version = $9
+                RETURNING version
+            ){counter_cte}
+            SELECT version FROM saved
+            """
+
+            events = message.get_domain_events()
+            new_version = self._stamp_events(message.expected_version, events)
+
+            conn = await self.scope.get_connection()
+            self.scope.mark_dirty()
+            if message.expected_version == 0:
+                await MessagePartitionManager.create_months(conn, [message.sent_at])
+            version = await conn.fetchval(
+                upsert_sql,
+                message.id,
+                message.sender_id,
+                message.recipient_id,
+                message.chat_id,
+                message.text.value,
+                message.sent_at,
+                message.read_at,
+                message.edited_at,
+                message.expected_version,
+                new_version
+            )
+
+            if version is None:
+                raise MessageVersionConflictError(
+                    f"Message {message.id} was modified concurrently (expected version {message.expected_version})"
                 )
 
-                cursor.execute(insert_sql, user_data)
-                print(f"Message created: {message.id}")
+            await self._append_events(conn, {message.id: message.chat_id}, events)
+            await self.chat_changes.record(self._chat_changes(message, events))
+            snapshot_due = self._needs_snapshot(message.expected_version, version)
 
-            conn.commit()
+            message.mark_as_persisted(version)
+            if snapshot_due:
+                await self._save_snapshots(conn, [message])
+            logger.debug(f"Message saved: {message.id} (version {version})")
 
-            await self.cache.invalidate_message(message.id)
-            message_dict = self.mapper.to_persistence(message)
-            await self.cache.set_message(message.id, message_dict)
+            self.scope.after_commit(partial(
+                self._refresh_cached_messages, {message.id: self.mapper.to_persistence(message)}
+            ))
 
         except Exception as e:
-            conn.rollback()
-            await self.cache.invalidate_message(message.id)
-            print(f"Error saving message {message.id}: {e}")
+            logger.error(f"Error saving message {message.id}: {e}")
             raise
 
-        finally:
-            cursor.close()
-            conn.close()
-
         self.identity_map.add(message)
-        message.clear_domain_events()
+        self.scope.collect_events(message)
 
     async def get_by_id(self, message_id: UUID) -> Message | None:
-        cached_message = await self.cache.get_message(message_id)
+        tracked_message = self.identity_map.get(message_id)
+        if tracked_message:
+            return tracked_message
+
+        cache_hit, cached_message = await self.cache.get_message_entry(message_id)
+        if cache_hit and cached_message is None:
+            return None
 
         if cached_message:
-            print(f"User {message_id} found in cache")
+            logger.debug(f"Message {message_id} found in cache")
+            self.identity_map.add(cached_message)
+            await self._apply_read_watermarks([cached_message])
             return cached_message
 
-        conn, cursor = self._get_connection()
-
         try:
-            select_sql = """
-            SELECT 
-                    message_id, 
-                    sender_id,
-                    recipient_id,
-                    chat_id,
-                    text,
-                    sent_at,
-                    read_at,
-                    edited_at,
-            FROM messages 
-            WHERE message_id = %s
-            """
-
-            cursor.execute(select_sql, (str(message_id),))
-            message_data = cursor.fetchone()
+            if self.scope.dirty or not self.scope.fills_cache:
+                message_dict = await self.fetch_message_data(message_id)
+                if message_dict is None:
+                    await self.scope.cache_write(partial(self.cache.set_absent, [message_id]))
+                elif message_dict.get("is_deleted"):
+                    await self.scope.cache_write(partial(self.cache.set_tombstones, [message_id]))
+                elif message_dict:
+                    await self.scope.cache_write(partial(self.cache.set_message, message_id, message_dict))
+            else:
+                message_dict = await self.cache.load_message(
+                    message_id, partial(self.fetch_message_data, message_id)
+                )
 
-            if not message_data:
+            if not message_dict or message_dict.get("is_deleted"):
                 return None
 
-            message_dict = dict(message_data)
-
-            print(message_dict)
-
             message = self.mapper.to_domain(message_dict)
-            await self.cache.set_message(message_id, message_dict)
             self.identity_map.add(message)
+            await self._apply_read_watermarks([message])
 
             return message
 
         except Exception as e:
-            print(f"Error getting user {message_id}: {e}")
+            logger.error(f"Error getting message {message_id}: {e}")
             return None
 
-        finally:
-            cursor.close()
-            conn.close()
+    async def fetch_message_data(self, message_id: UUID) -> dict[str, Any] | None:
+        select_sql = f"""
+        SELECT {MESSAGE_COLUMNS}, deleted_at IS NOT NULL AS is_deleted
+        FROM messages
+        WHERE message_id = $1
+        """
 
-    async def delete(self, message_id: UUID) -> None:
-        conn, cursor = self._get_connection()
+        conn = await self.scope.get_connection()
+        message_dict = (await self._load_histories(conn, [message_id])).get(message_id)
+
+        if message_dict is None:
+            message_data = await conn.fetchrow(select_sql, message_id)
+            message_dict = dict(message_data) if message_data else None
+
+        if message_dict is None and self.archive:
+            message_dict = (await self.archive.get_many([message_id])).get(message_id)
 
+        return message_dict
+
+    async def delete(self, message_id: UUID) -> None:
         try:
-            delete_sql = "DELETE FROM messages WHERE message_id = %s"
-            cursor.execute(delete_sql, (str(message_id),))
-            conn.commit()
+            conn = await self.scope.get_connection()
+            self.scope.mark_dirty()
+            await self._delete_batch(conn, [message_id])
 
-            await self.cache.invalidate_message(message_id)
+            self.scope.after_commit(partial(self.cache.set_tombstones, [message_id]))
             self.identity_map.remove(message_id)
 
-            print(f"Message {message_id} deleted from database and cache")
+            logger.debug(f"Message {message_id} deleted from database and cache")
+
+        except Exception as e:
+            logger.error(f"Error deleting message {message_id}: {e}")
+            raise
+
+    async def save_many(self, messages: list[Message]) -> None:
+        if not messages:
+            return
+
+        new_messages = [message for message in messages if message.expected_version == 0]
+        existing_messages = [message for message in messages if message.expected_version != 0]
+
+        try:
+            insert_sql = """
+            INSERT INTO messages (
+                message_id,
+                sender_id,
+                recipient_id,
+                chat_id,
+                text,
+                sent_at,
+                read_at,
+                edited_at,
+                version
+            )
+            SELECT * FROM unnest(
+                $1::uuid[], $2::uuid[], $3::uuid[], $4::uuid[],
+                $5::text[], $6::timestamp[], $7::timestamp[], $8::timestamp[], $9::int[]
+            )
+            ON CONFLICT (message_id, sent_at) DO NOTHING
+            RETURNING message_id, version
+            """
+
+            update_sql = """
+            UPDATE messages AS m SET
+                text = u.text,
+                read_at = u.read_at,
+                edited_at = u.edited_at,
+                version = u.new_version
+            FROM unnest(
+                $1::uuid[], $2::timestamp[], $3::text[], $4::timestamp[], $5::timestamp[], $6::int[], $7::int[]
+            ) AS u(message_id, sent_at, text, read_at, edited_at, expected_version, new_version)
+            WHERE m.message_id = u.message_id AND m.sent_at = u.sent_at AND m.version = u.expected_version
+            AND m.deleted_at IS NULL
+            RETURNING m.message_id, m.version
+            """
+
+            versions: dict[UUID, int] = {}
+            events = {message.id: message.get_domain_events() for message in messages}
+            new_versions = {
+                message.id: self._stamp_events(message.expected_version, events[message.id]) for message in messages
+            }
+
+            conn = await self.scope.get_connection()
+            self.scope.mark_dirty()
+            await MessagePartitionManager.create_months(conn, [message.sent_at for message in new_messages])
+            for start in range(0, len(new_messages), self.BATCH_SIZE):
+                batch = new_messages[start:start + self.BATCH_SIZE]
+                rows = await conn.fetch(
+                    insert_sql,
+                    [message.id for message in batch],
+                    [message.sender_id for message in batch],
+                    [message.recipient_id for message in batch],
+                    [message.chat_id for message in batch],
+                    [message.text.value for message in batch],
+                    [message.sent_at for message in batch],
+                    [message.read_at for message in batch],
+                    [message.edited_at for message in batch],
+                    [new_versions[message.id] for message in batch]
+                )
+                versions.update({row["message_id"]: row["version"] for row in rows})
+
+            for start in range(0, len(existing_messages), self.BATCH_SIZE):
+                batch = existing_messages[start:start + self.BATCH_SIZE]
+                rows = await conn.fetch(
+                    update_sql,
+                    [message.id for message in batch],
+                    [message.sent_at for message in batch],
+                    [message.text.value for message in batch],
+                    [message.read_at for message in batch],
+                    [message.edited_at for message in batch],
+                    [message.expected_version for message in batch],
+                    [new_versions[message.id] for message in batch]
+                )
+                versions.update({row["message_id"]: row["version"] for row in rows})
+
+            conflicts = [message.id for message in messages if message.id not in versions]
+            if conflicts:
+                raise MessageVersionConflictError(
+                    f"{len(conflicts)} messages were modified concurrently: {conflicts[:10]}"
+                )
+
+            unread_deltas: dict[tuple[UUID, UUID], int] = {}
+            for message in messages:
+                key = (message.recipient_id, message.chat_id)
+                unread_deltas[key] = unread_deltas.get(key, 0) + self._unread_delta(message)
+            await self.unread_counters.apply_deltas(unread_deltas)
+            await self._append_events(
+                conn,
+                {message.id: message.chat_id for message in messages},
+                [event for message in messages for event in events[message.id]]
+            )
+            await self.chat_changes.record([
+                change for message in messages for change in self._chat_changes(message, events[message.id])
+            ])
+
+            snapshot_due = [
+                message for message in messages if self._needs_snapshot(message.expected_version, versions[message.id])
+            ]
+            for message in messages:
+                message.mark_as_persisted(versions[message.id])
+            await self._save_snapshots(conn, snapshot_due)
+
+            self.scope.after_commit(partial(
+                self._refresh_cached_messages,
+                {message.id: self.mapper.to_persistence(message) for message in messages}
+            ))
+
+        except Exception as e:
+            logger.error(f"Error saving {len(messages)} messages: {e}")
+            raise
+
+        for message in messages:
+            self.identity_map.add(message)
+            self.scope.collect_events(message)
+
+    async def get_many(self, message_ids: list[UUID]) -> list[Message]:
+        unique_ids = list(dict.fromkeys(message_ids))
+        found = {
+            message_id: message
+            for message_id in unique_ids
+            if (message := self.identity_map.get(message_id)) is not None
+        }
+        cached = await self.cache.get_message_entries(
+            [message_id for message_id in unique_ids if message_id not in found]
+        )
+        tombstones = {message_id for message_id, message in cached.items() if message is None}
+        for message_id, message in cached.items():
+            if message is not None:
+                found[message_id] = message
+                self.identity_map.add(message)
+        missing = [message_id for message_id in unique_ids if message_id not in found and message_id not in tombstones]
+
+        if missing:
+            select_sql = f"""
+            SELECT {MESSAGE_COLUMNS}, deleted_at IS NOT NULL AS is_deleted
+            FROM messages
+            WHERE message_id = ANY($1::uuid[])
+            """
+
+            conn = await self.scope.get_connection()
+            messages_data = await self._load_histories(conn, missing)
+
+            legacy_ids = [message_id for message_id in missing if message_id not in messages_data]
+            if legacy_ids:
+                rows = await conn.fetch(select_sql, legacy_ids)
+                messages_data.update({row["message_id"]: dict(row) for row in rows})
+
+            archived_ids = [message_id for message_id in legacy_ids if message_id not in messages_data]
+            if archived_ids and self.archive:
+                messages_data.update(await self.archive.get_many(archived_ids))
+
+            deleted_ids = [message_id for message_id, data in messages_data.items() if data.get("is_deleted")]
+            messages_data = {
+                message_id: data for message_id, data in messages_data.items() if not data.get("is_deleted")
+            }
+            for message in self.mapper.to_domain_list(list(messages_data.values())):
+                found[message.id] = message
+                self.identity_map.add(message)
+
+            await self.scope.cache_write(partial(self.cache.set_messages, messages_data))
+            if deleted_ids:
+                await self.scope.cache_write(partial(self.cache.set_tombstones, deleted_ids))
+            absent_ids = [
+                message_id for message_id in archived_ids
+                if message_id not in messages_data and message_id not in deleted_ids
+            ]
+            if absent_ids:
+                await self.scope.cache_write(partial(self.cache.set_absent, absent_ids))
+            logger.debug(f"Messages fetched from database: {len(messages_data)} of {len(missing)} cache misses")
+
+        await self._apply_read_watermarks(list(found.values()))
+        return [found[message_id] for message_id in message_ids if message_id in found]
+
+    async def delete_many(self, message_ids: list[UUID]) -> None:
+        unique_ids = list(dict.fromkeys(message_ids))
+
+        try:
+            conn = await self.scope.get_connection()
+            self.scope.mark_dirty()
+            for start in range(0, len(unique_ids), self.BATCH_SIZE):
+                await self._delete_batch(conn, unique_ids[start:start + self.BATCH_SIZE])
+
+            self.scope.after_commit(partial(self.cache.set_tombstones, unique_ids))
+            for message_id in unique_ids:
+                self.identity_map.remove(message_id)
+
+            logger.debug(f"{len(unique_ids)} messages deleted from database and cache")
 
         except Exception as e:
-            conn.rollback()
-            print(f"Error deleting message {message_id}: {e}")
+            logger.error(f"Error deleting {len(unique_ids)} messages: {e}")
             raise
 
-        finally:
-            cursor.close()
-            conn.close()
+    async def get_chat_history(
+            self,
+            chat_id: UUID,
+            limit: int,
+            cursor: MessageCursor | None = None,
+            direction: HistoryDirection = HistoryDirection.OLDER,
+    ) -> MessagePage:
+        older = direction == HistoryDirection.OLDER
+        rows = None
+        generation = None
+        if cursor is None and older:
+            rows, generation = await self.cache.get_derived("chat", chat_id, f"history:{limit}")
+
+        if rows is None:
+            rows = await self._history_rows(chat_id, limit, cursor, older)
+            if generation is not None and self.scope.fills_cache and not self.scope.dirty:
+                await self.cache.set_derived("chat", chat_id, f"history:{limit}", rows, generation)
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if not older:
+            rows = list(reversed(rows))
+
+        messages = self.mapper.to_domain_list(rows)
+        if not messages:
+            return MessagePage(messages=[])
+
+        await self._apply_read_watermarks(messages)
+
+        newest = MessageCursor(messages[0].sent_at, messages[0].id)
+        oldest = MessageCursor(messages[-1].sent_at, messages[-1].id)
+
+        if older:
+            has_older, has_newer = has_more, cursor is not None
+        else:
+            has_older, has_newer = cursor is not None, has_more
+
+        return MessagePage(
+            messages=messages,
+            older_cursor=oldest if has_older else None,
+            newer_cursor=newest if has_newer else None,
+        )
+
+    async def _history_rows(
+            self, chat_id: UUID, limit: int, cursor: MessageCursor | None, older: bool
+    ) -> list[dict[str, Any]]:
+        comparison = "<" if older else ">"
+        order = "DESC" if older else "ASC"
+        cursor_filter = (
+            f"AND sent_at {comparison}= $3 AND (sent_at, message_id) {comparison} ($3, $4)" if cursor else ""
+        )
+
+        select_sql = f"""
+        SELECT {MESSAGE_COLUMNS}
+        FROM messages
+        WHERE chat_id = $1 AND deleted_at IS NULL {cursor_filter}
+        ORDER BY sent_at {order}, message_id {order}
+        LIMIT $2
+        """
+
+        args = [chat_id, limit + 1]
+        if cursor:
+            args += [cursor.sent_at, cursor.message_id]
+
+        conn = await self.scope.get_connection()
+        rows = [dict(row) for row in await conn.fetch(select_sql, *args)]
+        if self.archive:
+            archived = await self.archive.chat_history(chat_id, limit + 1, cursor, older)
+            rows = (await self._merge_archived(conn, rows, archived, older))[:limit + 1]
+        return rows
+
+    async def stream_chat_messages(self, chat_id: UUID, batch_size: int = 1000) -> AsyncIterator[list[dict[str, Any]]]:
+        select_sql = f"""
+        SELECT {MESSAGE_COLUMNS}
+        FROM messages
+        WHERE chat_id = $1 AND deleted_at IS NULL
+        ORDER BY sent_at, message_id
+        """
+
+        conn = await self.scope.get_connection()
+        if self.archive:
+            archive_cursor = None
+            while archived := await self.archive.chat_history(chat_id, batch_size, archive_cursor, older=False):
+                archive_cursor = MessageCursor(archived[-1]["sent_at"], archived[-1]["message_id"])
+                shadowed = await self._shadowed_ids(conn, [row["message_id"] for row in archived])
+                batch = [
+                    {column: value for column, value in row.items() if column != "is_deleted"}
+                    for row in archived if row["message_id"] not in shadowed
+                ]
+                if batch:
+                    yield batch
+
+        cursor = await conn.cursor(select_sql, chat_id)
+        while True:
+            rows = await cursor.fetch(batch_size)
+            if not rows:
+                break
+            yield [dict(row) for row in rows]
+
+    async def search(
+            self,
+            query: str,
+            limit: int,
+            chat_id: UUID | None = None,
+            participant_id: UUID | None = None,
+            cursor: SearchCursor | None = None,
+    ) -> MessageSearchPage:
+        args: list[Any] = [query, limit + 1]
+        filters = []
+        if chat_id:
+            args.append(chat_id)
+            filters.append(f"AND chat_id = ${len(args)}")
+        if participant_id:
+            args.append(participant_id)
+            filters.append(f"AND (sender_id = ${len(args)} OR recipient_id = ${len(args)})")
+        cursor_filter = ""
+        if cursor:
+            args += [cursor.rank, cursor.message_id]
+            cursor_filter = f"WHERE (rank, message_id) < (${len(args) - 1}, ${len(args)})"
+
+        search_sql = f"""
+        SELECT * FROM (
+            SELECT {MESSAGE_COLUMNS}, ts_rank_cd(search_vector, q)::float8 AS rank
+            FROM messages, websearch_to_tsquery('{SEARCH_CONFIG}', $1) AS q
+            WHERE search_vector @@ q AND deleted_at IS NULL {" ".join(filters)}
+        ) AS hits
+        {cursor_filter}
+        ORDER BY rank DESC, message_id DESC
+        LIMIT $2
+        """
+
+        conn = await self.scope.get_connection()
+        rows = await conn.fetch(search_sql, *args)
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        messages = self.mapper.to_domain_list([dict(row) for row in rows])
+        await self._apply_read_watermarks(messages)
+
+        return MessageSearchPage(
+            hits=[(message, row["rank"]) for message, row in zip(messages, rows)],
+            next_cursor=SearchCursor(rows[-1]["rank"], rows[-1]["message_id"]) if has_more else None
+        )
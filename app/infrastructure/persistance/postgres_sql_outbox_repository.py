@@ -0,0 +1,78 @@
+import json
+from typing import Iterable
+import asyncpg
+from LuminMessageService.app.domain.events.domain_event import DomainEvent
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool
+
+OUTBOX_SUBJECT_PREFIX = "message.events"
+
+
+def outbox_subject(event: DomainEvent) -> str:
+    return f"{OUTBOX_SUBJECT_PREFIX}.{event.event_type}"
+
+
+class PostgresSQLOutboxRepository:
+    def __init__(self, connection_pool: DatabasePool) -> None:
+        self.connection_pool = connection_pool
+
+    async def add(self, conn: asyncpg.Connection, events: Iterable[DomainEvent]) -> int:
+        events = list(events)
+        if not events:
+            return 0
+
+        insert_sql = """
+        INSERT INTO outbox (event_id, aggregate_id, event_type, subject, payload)
+        SELECT * FROM unnest($1::uuid[], $2::uuid[], $3::text[], $4::text[], $5::jsonb[])
+        ON CONFLICT (event_id) DO NOTHING
+        """
+
+        await conn.execute(
+            insert_sql,
+            [event.event_id for event in events],
+            [event.aggregate_id for event in events],
+            [event.event_type for event in events],
+            [outbox_subject(event) for event in events],
+            [json.dumps(event.to_dict(), default=str) for event in events]
+        )
+        return len(events)
+
+    async def lock_pending(self, conn: asyncpg.Connection, limit: int) -> list[asyncpg.Record]:
+        return await conn.fetch("""
+        SELECT id, event_id, subject, payload::text AS payload
+        FROM outbox
+        WHERE sent_at IS NULL
+        ORDER BY id
+        LIMIT $1
+        FOR UPDATE SKIP LOCKED
+        """, limit)
+
+    async def mark_sent(self, conn: asyncpg.Connection, ids: list[int]) -> None:
+        if ids:
+            await conn.execute("UPDATE outbox SET sent_at = now() WHERE id = ANY($1::bigint[])", ids)
+
+    async def mark_failed(self, conn: asyncpg.Connection, ids: list[int], errors: list[str]) -> None:
+        if ids:
+            await conn.execute("""
+            UPDATE outbox AS o
+            SET attempts = o.attempts + 1, last_error = f.error
+            FROM unnest($1::bigint[], $2::text[]) AS f(id, error)
+            WHERE o.id = f.id
+            """, ids, errors)
+
+    async def purge_sent(self, older_than_seconds: float, limit: int) -> int:
+        async with self.connection_pool.acquire() as conn:
+            result = await conn.execute("""
+            DELETE FROM outbox
+            WHERE id IN (
+                SELECT id FROM outbox
+                WHERE sent_at < now() - make_interval(secs => $1)
+                ORDER BY id
+                LIMIT $2
+            )
+            """, older_than_seconds, limit)
+
+        return int(result.split()[-1])
+
+    async def count_pending(self) -> int:
+        async with self.connection_pool.acquire() as conn:
+            return await conn.fetchval("SELECT count(*) FROM outbox WHERE sent_at IS NULL")
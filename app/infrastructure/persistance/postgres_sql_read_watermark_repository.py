@@ -0,0 +1,121 @@
+import logging
+from datetime import datetime
+from functools import partial
+from uuid import UUID
+from LuminMessageService.app.domain.events.message_events import MessagesReadUpToEvent
+from LuminMessageService.app.domain.models.common.value_objects import ReadWatermark
+from LuminMessageService.app.domain.repositories.reposiotries import ReadWatermarkRepository
+from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache
+from LuminMessageService.app.infrastructure.persistance.postgres_sql_chat_change_repository import \
+    PostgresSQLChatChangeRepository
+from LuminMessageService.app.infrastructure.persistance.transaction_scope import TransactionScope
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresSQLReadWatermarkRepository(ReadWatermarkRepository):
+    def __init__(
+            self,
+            scope: TransactionScope,
+            cache: MultiLevelCache,
+            chat_changes: PostgresSQLChatChangeRepository
+    ) -> None:
+        self.scope = scope
+        self.cache = cache
+        self.chat_changes = chat_changes
+
+    async def advance(self, chat_id: UUID, reader_id: UUID, up_to_message_id: UUID) -> ReadWatermark | None:
+        advance_sql = """
+        WITH target AS (
+            SELECT chat_id, sent_at, message_id
+            FROM messages
+            WHERE message_id = $3 AND chat_id = $1 AND deleted_at IS NULL
+        ), advanced AS (
+            INSERT INTO read_watermarks (chat_id, reader_id, sent_at, message_id, updated_at)
+            SELECT chat_id, $2, sent_at, message_id, now() FROM target
+            ON CONFLICT (chat_id, reader_id) DO UPDATE SET
+                sent_at = EXCLUDED.sent_at,
+                message_id = EXCLUDED.message_id,
+                updated_at = EXCLUDED.updated_at
+            WHERE (read_watermarks.sent_at, read_watermarks.message_id) < (EXCLUDED.sent_at, EXCLUDED.message_id)
+            RETURNING sent_at, message_id
+        ), counted AS (
+            INSERT INTO unread_counters (recipient_id, chat_id, unread_count)
+            SELECT $2, $1, count(m.message_id)::int
+            FROM advanced AS a
+            LEFT JOIN messages AS m
+                ON m.chat_id = $1
+                AND m.recipient_id = $2
+                AND m.read_at IS NULL
+                AND m.deleted_at IS NULL
+                AND m.sent_at >= a.sent_at
+                AND (m.sent_at, m.message_id) > (a.sent_at, a.message_id)
+            GROUP BY a.sent_at, a.message_id
+            ON CONFLICT (recipient_id, chat_id) DO UPDATE SET
+                unread_count = EXCLUDED.unread_count
+        )
+        SELECT sent_at, message_id FROM advanced
+        """
+
+        conn = await self.scope.get_connection()
+        self.scope.mark_dirty()
+        row = await conn.fetchrow(advance_sql, chat_id, reader_id, up_to_message_id)
+
+        if not row:
+            logger.debug(f"Read watermark for chat {chat_id} and reader {reader_id} not advanced")
+            return None
+
+        watermark = ReadWatermark(chat_id, reader_id, row["sent_at"], row["message_id"])
+        event = MessagesReadUpToEvent(
+            aggregate_id=chat_id,
+            data={
+                "reader_id": str(reader_id),
+                "up_to_message_id": str(watermark.message_id),
+                "up_to_sent_at": watermark.sent_at.isoformat(),
+                "read_at": datetime.now().isoformat()
+            }
+        )
+        await self.chat_changes.record([(chat_id, watermark.message_id, event)])
+        self.scope.add_event(event)
+
+        self.scope.after_commit(partial(self.cache.set_read_watermarks, {
+            (chat_id, reader_id): {"sent_at": watermark.sent_at, "message_id": watermark.message_id}
+        }))
+
+        logger.debug(f"Read watermark for chat {chat_id} and reader {reader_id} advanced to {watermark.message_id}")
+        return watermark
+
+    async def get_many(self, keys: set[tuple[UUID, UUID]]) -> dict[tuple[UUID, UUID], ReadWatermark]:
+        if not keys:
+            return {}
+
+        watermarks_data = await self.cache.get_read_watermarks(keys)
+        missing = [key for key in keys if key not in watermarks_data]
+
+        if missing:
+            select_sql = """
+            SELECT w.chat_id, w.reader_id, w.sent_at, w.message_id
+            FROM unnest($1::uuid[], $2::uuid[]) AS k(chat_id, reader_id)
+            JOIN read_watermarks AS w ON w.chat_id = k.chat_id AND w.reader_id = k.reader_id
+            """
+
+            conn = await self.scope.get_connection()
+            rows = await conn.fetch(
+                select_sql,
+                [chat_id for chat_id, _ in missing],
+                [reader_id for _, reader_id in missing]
+            )
+
+            found = {
+                (row["chat_id"], row["reader_id"]): {"sent_at": row["sent_at"], "message_id": row["message_id"]}
+                for row in rows
+            }
+            fetched = {key: found.get(key, {"sent_at": None, "message_id": None}) for key in missing}
+            await self.scope.cache_write(partial(self.cache.set_read_watermarks, fetched))
+            watermarks_data.update(fetched)
+
+        return {
+            (chat_id, reader_id): ReadWatermark(chat_id, reader_id, data["sent_at"], data["message_id"])
+            for (chat_id, reader_id), data in watermarks_data.items()
+            if data.get("sent_at") is not None
+        }
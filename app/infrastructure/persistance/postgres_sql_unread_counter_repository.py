@@ -0,0 +1,103 @@
+import logging
+from uuid import UUID
+from LuminMessageService.app.domain.repositories.reposiotries import UnreadCounterRepository
+from LuminMessageService.app.infrastructure.persistance.transaction_scope import TransactionScope
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresSQLUnreadCounterRepository(UnreadCounterRepository):
+    def __init__(self, scope: TransactionScope) -> None:
+        self.scope = scope
+
+    async def get(self, recipient_id: UUID, chat_id: UUID) -> int:
+        select_sql = "SELECT unread_count FROM unread_counters WHERE recipient_id = $1 AND chat_id = $2"
+
+        conn = await self.scope.get_connection()
+        unread_count = await conn.fetchval(select_sql, recipient_id, chat_id)
+
+        return unread_count or 0
+
+    async def get_for_recipient(self, recipient_id: UUID) -> dict[UUID, int]:
+        select_sql = """
+        SELECT chat_id, unread_count
+        FROM unread_counters
+        WHERE recipient_id = $1 AND unread_count > 0
+        """
+
+        conn = await self.scope.get_connection()
+        rows = await conn.fetch(select_sql, recipient_id)
+
+        return {row["chat_id"]: row["unread_count"] for row in rows}
+
+    async def apply_deltas(self, deltas: dict[tuple[UUID, UUID], int]) -> None:
+        conn = await self.scope.get_connection()
+        self.scope.mark_dirty()
+        increments = [(key, delta) for key, delta in deltas.items() if delta > 0]
+        decrements = [(key, delta) for key, delta in deltas.items() if delta < 0]
+
+        if increments:
+            increment_sql = """
+            INSERT INTO unread_counters (recipient_id, chat_id, unread_count)
+            SELECT * FROM unnest($1::uuid[], $2::uuid[], $3::int[])
+            ON CONFLICT (recipient_id, chat_id) DO UPDATE SET
+                unread_count = unread_counters.unread_count + EXCLUDED.unread_count
+            """
+            await conn.execute(
+                increment_sql,
+                [recipient_id for (recipient_id, _), _ in increments],
+                [chat_id for (_, chat_id), _ in increments],
+                [delta for _, delta in increments]
+            )
+
+        if decrements:
+            decrement_sql = """
+            UPDATE unread_counters AS c SET
+                unread_count = GREATEST(c.unread_count + d.delta, 0)
+            FROM unnest($1::uuid[], $2::uuid[], $3::int[]) AS d(recipient_id, chat_id, delta)
+            WHERE c.recipient_id = d.recipient_id AND c.chat_id = d.chat_id
+            """
+            await conn.execute(
+                decrement_sql,
+                [recipient_id for (recipient_id, _), _ in decrements],
+                [chat_id for (_, chat_id), _ in decrements],
+                [delta for _, delta in decrements]
+            )
+
+    async def reconcile(self, recipient_id: UUID | None = None) -> int:
+        recipient_filter = "AND m.recipient_id = $1" if recipient_id else ""
+        counter_filter = "AND c.recipient_id = $1" if recipient_id else ""
+
+        reconcile_sql = f"""
+        WITH actual AS (
+            SELECT m.recipient_id, m.chat_id, count(*)::int AS unread_count
+            FROM messages AS m
+            LEFT JOIN read_watermarks AS w ON w.chat_id = m.chat_id AND w.reader_id = m.recipient_id
+            WHERE m.read_at IS NULL AND m.deleted_at IS NULL {recipient_filter}
+            AND (w.sent_at IS NULL OR (m.sent_at, m.message_id) > (w.sent_at, w.message_id))
+            GROUP BY m.recipient_id, m.chat_id
+        ), repaired AS (
+            INSERT INTO unread_counters (recipient_id, chat_id, unread_count)
+            SELECT recipient_id, chat_id, unread_count FROM actual
+            ON CONFLICT (recipient_id, chat_id) DO UPDATE SET
+                unread_count = EXCLUDED.unread_count
+            WHERE unread_counters.unread_count <> EXCLUDED.unread_count
+            RETURNING 1
+        ), zeroed AS (
+            UPDATE unread_counters AS c SET unread_count = 0
+            WHERE c.unread_count <> 0 {counter_filter}
+            AND NOT EXISTS (
+                SELECT 1 FROM actual a WHERE a.recipient_id = c.recipient_id AND a.chat_id = c.chat_id
+            )
+            RETURNING 1
+        )
+        SELECT (SELECT count(*) FROM repaired) + (SELECT count(*) FROM zeroed)
+        """
+
+        args = [recipient_id] if recipient_id else []
+        conn = await self.scope.get_connection()
+        self.scope.mark_dirty()
+        repaired = await conn.fetchval(reconcile_sql, *args)
+
+        logger.debug(f"Unread counters reconciled: {repaired} repaired")
+        return repaired
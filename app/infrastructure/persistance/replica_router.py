@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from itertools import count
+from typing import Iterable, Optional
+from uuid import UUID
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplicaRouterConfig:
+    max_lag_seconds: float = 5.0
+    read_your_writes_window: float = 5.0
+    health_check_interval: float = 2.0
+    max_tracked_writes: int = 100_000
+
+
+@dataclass
+class ReplicaState:
+    name: str
+    pool: DatabasePool
+    healthy: bool = False
+    lag_seconds: Optional[float] = None
+    last_checked_at: Optional[float] = None
+    last_error: Optional[str] = None
+    reads: int = 0
+    failures: int = 0
+
+
+class ReplicaRouter:
+    def __init__(
+            self,
+            primary: DatabasePool,
+            replicas: Optional[list[DatabasePool]] = None,
+            config: Optional[ReplicaRouterConfig] = None
+    ):
+        self.primary = primary
+        self.config = config or ReplicaRouterConfig()
+        self.replicas = [
+            ReplicaState(name=f"replica-{index}", pool=pool) for index, pool in enumerate(replicas or [])
+        ]
+        self._round_robin = count()
+        self._written_at: dict[UUID, float] = {}
+        self._health_task: Optional[asyncio.Task] = None
+        self._stats = {
+            "primary_reads": 0,
+            "replica_reads": 0,
+            "read_your_writes_fallbacks": 0,
+            "no_replica_fallbacks": 0,
+        }
+
+    async def start(self) -> None:
+        if not self.replicas or self._health_task is not None:
+            return
+
+        await self.check_health()
+        self._health_task = asyncio.create_task(self._health_loop())
+
+    async def stop(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+        for replica in self.replicas:
+            await replica.pool.disconnect()
+
+    def record_write(self, *keys: Optional[UUID]) -> None:
+        now = time.monotonic()
+        for key in keys:
+            if key is not None:
+                self._written_at[key] = now
+
+        if len(self._written_at) > self.config.max_tracked_writes:
+            self._forget_expired_writes(now)
+
+    def for_read(self, *keys: Optional[UUID]) -> DatabasePool:
+        if not self.replicas:
+            self._stats["primary_reads"] += 1
+            return self.primary
+
+        if self._recently_written(keys):
+            self._stats["read_your_writes_fallbacks"] += 1
+            self._stats["primary_reads"] += 1
+            return self.primary
+
+        candidates = [replica for replica in self.replicas if self._is_usable(replica)]
+        if not candidates:
+            self._stats["no_replica_fallbacks"] += 1
+            self._stats["primary_reads"] += 1
+            return self.primary
+
+        replica = candidates[next(self._round_robin) % len(candidates)]
+        replica.reads += 1
+        self._stats["replica_reads"] += 1
+        return replica.pool
+
+    async def check_health(self) -> None:
+        await asyncio.gather(*(self._check_replica(replica) for replica in self.replicas))
+
+    def get_metrics(self) -> dict:
+        return {
+            **self._stats,
+            "tracked_writes": len(self._written_at),
+            "max_lag_seconds": self.config.max_lag_seconds,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "usable": self._is_usable(replica),
+                    "lag_seconds": replica.lag_seconds,
+                    "seconds_since_check": (
+                        time.monotonic() - replica.last_checked_at if replica.last_checked_at else None
+                    ),
+                    "reads": replica.reads,
+                    "failures": replica.failures,
+                    "last_error": replica.last_error,
+                }
+                for replica in self.replicas
+            ],
+        }
+
+    def _is_usable(self, replica: ReplicaState) -> bool:
+        return (
+            replica.healthy
+            and replica.lag_seconds is not None
+            and replica.lag_seconds <= self.config.max_lag_seconds
+        )
+
+    def _recently_written(self, keys: Iterable[Optional[UUID]]) -> bool:
+        deadline = time.monotonic() - self.config.read_your_writes_window
+        for key in keys:
+            written_at = self._written_at.get(key)
+            if written_at is not None:
+                if written_at >= deadline:
+                    return True
+                del self._written_at[key]
+        return False
+
+    def _forget_expired_writes(self, now: float) -> None:
+        deadline = now - self.config.read_your_writes_window
+        self._written_at = {key: written_at for key, written_at in self._written_at.items() if written_at >= deadline}
+
+    async def _check_replica(self, replica: ReplicaState) -> None:
+        try:
+            async with replica.pool.acquire() as conn:
+                row = await conn.fetchrow("""
+                SELECT
+                    pg_is_in_recovery() AS in_recovery,
+                    CASE
+                        WHEN NOT pg_is_in_recovery() THEN 0
+                        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+                    END AS lag_seconds
+                """)
+
+            replica.healthy = True
+            replica.lag_seconds = float(row["lag_seconds"]) if row["lag_seconds"] is not None else None
+            replica.last_error = None
+        except Exception as e:
+            if replica.healthy:
+                logger.warning(f"⚠️ {replica.name} marked unhealthy: {e}")
+            replica.healthy = False
+            replica.failures += 1
+            replica.last_error = str(e)
+        finally:
+            replica.last_checked_at = time.monotonic()
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.health_check_interval)
+            await self.check_health()
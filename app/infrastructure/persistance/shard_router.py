@@ -0,0 +1,208 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+from uuid import UUID
+from LuminMessageService.app.domain.models.common.exceptions import ChatMigrationInProgressError
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool
+from LuminMessageService.app.infrastructure.persistance.replica_router import ReplicaRouter
+
+logger = logging.getLogger(__name__)
+
+HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    bucket, jump = -1, 0
+    while jump < buckets:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & HASH_MASK
+        jump = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+@dataclass
+class ShardRouterConfig:
+    route_cache_size: int = 100_000
+    override_refresh_interval: float = 5.0
+
+
+class ShardRouter:
+    def __init__(self, shards: list[ReplicaRouter], config: Optional[ShardRouterConfig] = None):
+        if not shards:
+            raise ValueError("At least one shard is required")
+
+        self.shards = shards
+        self.config = config or ShardRouterConfig()
+        self._overrides: dict[UUID, int] = {}
+        self._moving: set[UUID] = set()
+        self._routes: OrderedDict[UUID, UUID] = OrderedDict()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._stats = {"route_cache_hits": 0, "route_lookups": 0, "routes_registered": 0, "migration_rejections": 0}
+
+    @property
+    def directory(self) -> DatabasePool:
+        return self.shards[0].primary
+
+    @property
+    def is_sharded(self) -> bool:
+        return len(self.shards) > 1
+
+    async def start(self) -> None:
+        for shard in self.shards:
+            await shard.start()
+
+        if not self.is_sharded or self._refresh_task is not None:
+            return
+
+        await self.refresh_overrides()
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+        for index, shard in enumerate(self.shards):
+            await shard.stop()
+            if index:
+                await shard.primary.disconnect()
+
+    def shard_index(self, chat_id: UUID) -> int:
+        override = self._overrides.get(chat_id)
+        if override is not None:
+            return override
+        return jump_hash(chat_id.int & HASH_MASK, len(self.shards))
+
+    def for_chat(self, chat_id: UUID, write: bool = False) -> ReplicaRouter:
+        if write:
+            self._ensure_writable(chat_id)
+        return self.shards[self.shard_index(chat_id)]
+
+    async def for_message(self, message_id: UUID, write: bool = False) -> ReplicaRouter:
+        chats = await self.resolve_chats([message_id])
+        if message_id in chats:
+            return self.for_chat(chats[message_id], write)
+        return self.shards[0]
+
+    async def group_messages(
+            self,
+            message_ids: Iterable[UUID],
+            write: bool = False
+    ) -> list[tuple[ReplicaRouter, list[UUID]]]:
+        message_ids = list(dict.fromkeys(message_ids))
+        chats = await self.resolve_chats(message_ids)
+
+        groups: dict[int, list[UUID]] = {}
+        for message_id in message_ids:
+            chat_id = chats.get(message_id)
+            if chat_id is not None and write:
+                self._ensure_writable(chat_id)
+            index = self.shard_index(chat_id) if chat_id is not None else 0
+            groups.setdefault(index, []).append(message_id)
+
+        return [(self.shards[index], ids) for index, ids in groups.items()]
+
+    async def register_routes(self, routes: dict[UUID, UUID]) -> None:
+        if not self.is_sharded or not routes:
+            return
+
+        async with self.directory.acquire() as conn:
+            await conn.execute("""
+            INSERT INTO message_routes (message_id, chat_id)
+            SELECT * FROM unnest($1::uuid[], $2::uuid[])
+            ON CONFLICT (message_id) DO NOTHING
+            """, list(routes), list(routes.values()))
+
+        self._stats["routes_registered"] += len(routes)
+        self.remember_routes(routes)
+
+    def remember_routes(self, routes: dict[UUID, UUID]) -> None:
+        for message_id, chat_id in routes.items():
+            self._routes[message_id] = chat_id
+            self._routes.move_to_end(message_id)
+
+        while len(self._routes) > self.config.route_cache_size:
+            self._routes.popitem(last=False)
+
+    async def resolve_chats(self, message_ids: list[UUID]) -> dict[UUID, UUID]:
+        if not self.is_sharded:
+            return {}
+
+        resolved = {}
+        missing = []
+        for message_id in message_ids:
+            chat_id = self._routes.get(message_id)
+            if chat_id is not None:
+                self._routes.move_to_end(message_id)
+                resolved[message_id] = chat_id
+            else:
+                missing.append(message_id)
+
+        self._stats["route_cache_hits"] += len(resolved)
+        if missing:
+            self._stats["route_lookups"] += len(missing)
+            async with self.directory.acquire() as conn:
+                rows = await conn.fetch(
+                    "SELECT message_id, chat_id FROM message_routes WHERE message_id = ANY($1::uuid[])", missing
+                )
+
+            found = {row["message_id"]: row["chat_id"] for row in rows}
+            self.remember_routes(found)
+            resolved.update(found)
+
+        return resolved
+
+    async def refresh_overrides(self) -> None:
+        async with self.directory.acquire() as conn:
+            rows = await conn.fetch("SELECT chat_id, shard, moving FROM chat_shards")
+
+        self._overrides = {row["chat_id"]: row["shard"] for row in rows if row["shard"] < len(self.shards)}
+        self._moving = {row["chat_id"] for row in rows if row["moving"]}
+
+    async def set_override(self, chat_id: UUID, shard: int, moving: bool = False) -> None:
+        if not 0 <= shard < len(self.shards):
+            raise ValueError(f"Shard {shard} does not exist")
+
+        async with self.directory.acquire() as conn:
+            await conn.execute("""
+            INSERT INTO chat_shards (chat_id, shard, moving, updated_at)
+            VALUES ($1, $2, $3, now())
+            ON CONFLICT (chat_id) DO UPDATE SET
+                shard = EXCLUDED.shard,
+                moving = EXCLUDED.moving,
+                updated_at = EXCLUDED.updated_at
+            """, chat_id, shard, moving)
+
+        self._overrides[chat_id] = shard
+        if moving:
+            self._moving.add(chat_id)
+        else:
+            self._moving.discard(chat_id)
+
+    def get_metrics(self) -> dict:
+        return {
+            **self._stats,
+            "shards": len(self.shards),
+            "overrides": len(self._overrides),
+            "moving_chats": len(self._moving),
+            "cached_routes": len(self._routes),
+        }
+
+    def _ensure_writable(self, chat_id: UUID) -> None:
+        if chat_id in self._moving:
+            self._stats["migration_rejections"] += 1
+            raise ChatMigrationInProgressError(f"Chat {chat_id} is being moved between shards, retry shortly")
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.override_refresh_interval)
+            try:
+                await self.refresh_overrides()
+            except Exception as e:
+                logger.warning(f"⚠️ Shard override refresh failed: {e}")
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TombstoneCompactorConfig:
+    retention_seconds: float = 7 * 24 * 3600
+    chunk_size: int = 500
+    pause_seconds: float = 0.2
+    max_chunks: int = 100
+
+
+class TombstoneCompactor:
+    def __init__(self, connection_pool: DatabasePool, config: TombstoneCompactorConfig | None = None):
+        self.connection_pool = connection_pool
+        self.config = config or TombstoneCompactorConfig()
+        self.stats = {"purged": 0, "chunks": 0, "runs": 0}
+
+    async def compact_once(self) -> int:
+        async with self.connection_pool.acquire() as conn:
+            result = await conn.execute("""
+            DELETE FROM messages
+            WHERE (message_id, sent_at) IN (
+                SELECT message_id, sent_at FROM messages
+                WHERE deleted_at < now() - make_interval(secs => $1)
+                ORDER BY deleted_at
+                LIMIT $2
+            )
+            """, self.config.retention_seconds, self.config.chunk_size)
+
+        purged = int(result.split()[-1])
+        self.stats["chunks"] += 1
+        self.stats["purged"] += purged
+        return purged
+
+    async def compact(self, max_chunks: int | None = None) -> int:
+        max_chunks = max_chunks or self.config.max_chunks
+        purged = 0
+
+        for chunk in range(max_chunks):
+            if chunk:
+                await asyncio.sleep(self.config.pause_seconds)
+
+            count = await self.compact_once()
+            purged += count
+            if count < self.config.chunk_size:
+                break
+
+        self.stats["runs"] += 1
+        if purged:
+            logger.info(f"✅ Purged {purged} message tombstones")
+        return purged
@@ -0,0 +1,97 @@
+import logging
+from typing import Any, Awaitable, Callable, Optional
+import asyncpg
+from asyncpg.transaction import Transaction
+from LuminMessageService.app.domain.events.domain_event import DomainEvent
+from LuminMessageService.app.domain.models.aggregates.aggregate_root import AggregateRoot
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool
+
+logger = logging.getLogger(__name__)
+
+CacheAction = Callable[[], Awaitable[Any]]
+
+
+class TransactionScope:
+    def __init__(self, connection_pool: DatabasePool, fills_cache: bool = True) -> None:
+        self.connection_pool = connection_pool
+        self.fills_cache = fills_cache
+        self.pending_events: list[DomainEvent] = []
+        self._after_commit: list[CacheAction] = []
+        self._dirty = False
+        self._connection_context = None
+        self._connection: Optional[asyncpg.Connection] = None
+        self._transaction: Optional[Transaction] = None
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._transaction is not None
+
+    async def get_connection(self) -> asyncpg.Connection:
+        if self._connection is None:
+            self._connection_context = self.connection_pool.acquire()
+            self._connection = await self._connection_context.__aenter__()
+
+        if self._transaction is None:
+            transaction = self._connection.transaction()
+            await transaction.start()
+            self._transaction = transaction
+
+        return self._connection
+
+    async def commit(self) -> None:
+        transaction, self._transaction = self._transaction, None
+        if transaction is not None:
+            await transaction.commit()
+        self._dirty = False
+
+    async def rollback(self) -> None:
+        transaction, self._transaction = self._transaction, None
+        try:
+            if transaction is not None:
+                await transaction.rollback()
+        finally:
+            self.discard()
+
+    async def release(self, exc_type=None, exc_val=None, exc_tb=None) -> None:
+        connection_context, self._connection_context = self._connection_context, None
+        self._connection = None
+        if connection_context is not None:
+            await connection_context.__aexit__(exc_type, exc_val, exc_tb)
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def collect_events(self, aggregate: AggregateRoot) -> None:
+        self.pending_events.extend(aggregate.get_domain_events())
+        aggregate.clear_domain_events()
+
+    def add_event(self, event: DomainEvent) -> None:
+        self.pending_events.append(event)
+
+    def after_commit(self, action: CacheAction) -> None:
+        self._after_commit.append(action)
+
+    async def cache_write(self, action: CacheAction) -> None:
+        if not self.fills_cache:
+            return
+        if self._dirty:
+            self._after_commit.append(action)
+        else:
+            await action()
+
+    async def run_after_commit(self) -> None:
+        actions, self._after_commit = self._after_commit, []
+        for action in actions:
+            try:
+                await action()
+            except Exception as e:
+                logger.error(f"❌ Post-commit cache action failed: {e}")
+
+    def discard(self) -> None:
+        self._after_commit.clear()
+        self.pending_events.clear()
+        self._dirty = False
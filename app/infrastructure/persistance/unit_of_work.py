@@ -1,38 +1,98 @@
 from contextlib import asynccontextmanager
 from typing import Self, AsyncGenerator
 from LuminMessageService.app.domain.repositories.unit_of_work import UnitOfWork
+from LuminMessageService.app.infrastructure.archive.message_archive import MessageArchive
 from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool
 from LuminMessageService.app.infrastructure.persistance.identity_map import MessageIdentityMap
+from LuminMessageService.app.infrastructure.persistance.postgres_sql_chat_change_repository import \
+    PostgresSQLChatChangeRepository
 from LuminMessageService.app.infrastructure.persistance.postgres_sql_message_repository import \
     PostgresSQLMessageRepository
+from LuminMessageService.app.infrastructure.persistance.postgres_sql_outbox_repository import \
+    PostgresSQLOutboxRepository
+from LuminMessageService.app.infrastructure.persistance.postgres_sql_read_watermark_repository import \
+    PostgresSQLReadWatermarkRepository
+from LuminMessageService.app.infrastructure.persistance.postgres_sql_unread_counter_repository import \
+    PostgresSQLUnreadCounterRepository
+from LuminMessageService.app.infrastructure.persistance.transaction_scope import TransactionScope
 
 
 class MessageUnitOfWork(UnitOfWork):
-    def __init__(self, connection_factory, cache: MultiLevelCache) -> None:
-        self.connection_factory = connection_factory
+    def __init__(
+            self,
+            connection_pool: DatabasePool,
+            cache: MultiLevelCache,
+            archive: MessageArchive | None = None,
+            fills_cache: bool = True
+    ) -> None:
+        self.connection_pool = connection_pool
         self.identity_map: MessageIdentityMap = MessageIdentityMap()
         self.cache = cache
+        self.archive = archive
+        self.fills_cache = fills_cache
 
     async def __aenter__(self) -> Self:
+        self.scope = TransactionScope(self.connection_pool, self.fills_cache)
+        self.outbox = PostgresSQLOutboxRepository(
+            connection_pool=self.connection_pool
+        )
+        self.unread_counters = PostgresSQLUnreadCounterRepository(
+            scope=self.scope
+        )
+        self.chat_changes = PostgresSQLChatChangeRepository(
+            scope=self.scope
+        )
+        self.read_watermarks = PostgresSQLReadWatermarkRepository(
+            scope=self.scope,
+            cache=self.cache,
+            chat_changes=self.chat_changes
+        )
         self.messages = PostgresSQLMessageRepository(
-            connection_factory=self.connection_factory,
+            scope=self.scope,
             identity_map=self.identity_map,
-            cache=self.cache
+            cache=self.cache,
+            unread_counters=self.unread_counters,
+            read_watermarks=self.read_watermarks,
+            chat_changes=self.chat_changes,
+            archive=self.archive
         )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        self.identity_map.clear()
+        try:
+            if exc_type is not None or self.scope.in_transaction:
+                await self.rollback(evict_local=exc_type is not None)
+        finally:
+            self.identity_map.clear()
+            await self.scope.release(exc_type, exc_val, exc_tb)
 
     async def commit(self) -> None:
-        pass
+        if self.scope.pending_events:
+            connection = await self.scope.get_connection()
+            await self.outbox.add(connection, self.scope.pending_events)
+            self.scope.pending_events.clear()
+
+        await self.scope.commit()
+        await self.scope.run_after_commit()
+
+    async def rollback(self, evict_local: bool = False) -> None:
+        if evict_local or self.scope.dirty:
+            self.cache.evict_local(list(self.identity_map.get_all()))
 
-    async def rollback(self) -> None:
-        self.identity_map.clear()
+        try:
+            await self.scope.rollback()
+        finally:
+            self.identity_map.clear()
 
 
 @asynccontextmanager
-async def get_unit_of_work(connection_factory, cache: MultiLevelCache) -> AsyncGenerator[MessageUnitOfWork, None]:
-    uow = MessageUnitOfWork(connection_factory, cache)
+async def get_unit_of_work(
+        connection_pool: DatabasePool,
+        cache: MultiLevelCache,
+        archive: MessageArchive | None = None,
+        fills_cache: bool = True
+) -> AsyncGenerator[MessageUnitOfWork, None]:
+    uow = MessageUnitOfWork(connection_pool, cache, archive, fills_cache)
     async with uow:
         yield uow
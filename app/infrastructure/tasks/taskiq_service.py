@@ -7,7 +7,15 @@ from LuminMessageService.app.application.taskiq.message_commands import (
     create_message_task,
     delete_message_task,
     edit_message_text_task,
-    mark_as_read_task
+    mark_as_read_task,
+    mark_chat_as_read_task,
+    reconcile_unread_counters_task,
+    maintain_message_partitions_task,
+    relay_outbox_task,
+    compact_tombstones_task,
+    move_chat_task,
+    archive_messages_task,
+    sweep_derived_cache_task
 )
 from LuminMessageService.app.infrastructure.tasks.taskiq_broker import get_taskiq_broker
 
@@ -53,6 +61,10 @@ class TaskiqService:
         task = await mark_as_read_task.kiq(str(message_id))
         return task.task_id
 
+    async def send_mark_chat_as_read_task(self, chat_id: UUID, reader_id: UUID, up_to_message_id: UUID) -> str:
+        task = await mark_chat_as_read_task.kiq(str(chat_id), str(reader_id), str(up_to_message_id))
+        return task.task_id
+
     async def send_edit_message_text_task(self, message_id: UUID, new_text: MessageText) -> str:
         task = await edit_message_text_task.kiq(str(message_id), new_text)
         return task.task_id
@@ -60,3 +72,31 @@ class TaskiqService:
     async def send_delete_message_task(self, message_id: UUID) -> str:
         task = await delete_message_task.kiq(str(message_id))
         return task.task_id
+
+    async def send_reconcile_unread_counters_task(self, recipient_id: UUID | None = None) -> str:
+        task = await reconcile_unread_counters_task.kiq(str(recipient_id) if recipient_id else None)
+        return task.task_id
+
+    async def send_maintain_message_partitions_task(self) -> str:
+        task = await maintain_message_partitions_task.kiq()
+        return task.task_id
+
+    async def send_relay_outbox_task(self, max_batches: int | None = None) -> str:
+        task = await relay_outbox_task.kiq(max_batches)
+        return task.task_id
+
+    async def send_compact_tombstones_task(self, max_chunks: int | None = None) -> str:
+        task = await compact_tombstones_task.kiq(max_chunks)
+        return task.task_id
+
+    async def send_move_chat_task(self, chat_id: UUID, target_shard: int) -> str:
+        task = await move_chat_task.kiq(str(chat_id), target_shard)
+        return task.task_id
+
+    async def send_archive_messages_task(self, max_segments: int | None = None) -> str:
+        task = await archive_messages_task.kiq(max_segments)
+        return task.task_id
+
+    async def send_sweep_derived_cache_task(self, max_keys: int | None = None) -> str:
+        task = await sweep_derived_cache_task.kiq(max_keys)
+        return task.task_id
@@ -35,6 +35,17 @@ async def lifespan(app: Litestar):
 
         app.state.event_bus = event_bus
 
+        from LuminMessageService.app.infrastructure.persistance.database import get_dependency_container
+        try:
+            for partition_manager in get_dependency_container().get_partition_managers():
+                created = await partition_manager.ensure_partitions()
+                logger.info(f"Message partitions ready, created: {created}")
+        except Exception as e:
+            logger.error(f"Message partition maintenance failed: {e}")
+
+        for outbox_relay in await get_dependency_container().get_outbox_relays():
+            await outbox_relay.start()
+
         yield
 
     except Exception as e:
@@ -48,13 +59,27 @@ async def lifespan(app: Litestar):
             await shutdown_broker()
             logger.info("Taskiq broker shutdown")
 
-            from LuminUserService.app.infrastructure.persistanse.database import get_dependency_container
+            from LuminMessageService.app.infrastructure.persistance.database import get_dependency_container
 
             container = get_dependency_container()
+            if container._l1_invalidation_broadcaster:
+                await container._l1_invalidation_broadcaster.stop()
+
             if hasattr(container, "_redis_cache") and container._redis_cache:
                 await container._redis_cache.disconnect()
 
                 logger.info("Redis connections closed")
+
+            for outbox_relay in container._outbox_relays or []:
+                await outbox_relay.stop()
+
+            if container._shard_router:
+                await container._shard_router.stop()
+            elif container._replica_router:
+                await container._replica_router.stop()
+
+            await container.connection_pool.disconnect()
+            logger.info("Postgres pool closed")
         except Exception as e:
             logger.error(f"Shutdown error: {e}")
 
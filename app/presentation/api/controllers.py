@@ -4,8 +4,15 @@ from litestar import Controller, get, post, patch
 from litestar.di import Provide
 from litestar.exceptions import HTTPException
 from litestar.params import Parameter
-from litestar.status_codes import HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
-from LuminMessageService.app.domain.models.common.value_objects import MessageText
+from litestar.response import Stream
+from litestar.status_codes import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
+from LuminMessageService.app.application.queries.get_chat_changes import GetChatChangesQuery
+from LuminMessageService.app.application.queries.get_chat_history import GetChatHistoryQuery
+from LuminMessageService.app.application.queries.get_unread_count import GetUnreadCountQuery
+from LuminMessageService.app.application.queries.search_messages import SearchMessagesQuery
+from LuminMessageService.app.domain.models.common.exceptions import InvalidCursorError
+from LuminMessageService.app.domain.models.common.value_objects import (MessageText, MessageCursor, HistoryDirection,
+                                                                        SearchCursor)
 from LuminMessageService.app.infrastructure.persistance.database import get_dependency_container
 from LuminMessageService.app.infrastructure.persistance.message_mapper import MessageMapper
 from LuminMessageService.app.infrastructure.persistance.pydantic_models import CreateMessageRequest
@@ -73,6 +80,185 @@ class MessageController(Controller):
                 status_code=HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @get(
+        "/chat/{chat_id:uuid}",
+        summary="Get chat history",
+        description="Получить историю сообщений чата с постраничной навигацией по курсору",
+    )
+    async def get_chat_history(
+        self,
+        chat_id: Annotated[UUID, Parameter(description="Chat ID (UUID)")],
+        cursor: Annotated[str | None, Parameter(description="Opaque page cursor")] = None,
+        direction: Annotated[HistoryDirection, Parameter(description="Page direction relative to the cursor")] = HistoryDirection.OLDER,
+        limit: Annotated[int, Parameter(description="Page size", ge=1, le=200)] = 50,
+    ) -> Dict[str, Any]:
+        try:
+            query = GetChatHistoryQuery(
+                chat_id=chat_id,
+                limit=limit,
+                cursor=MessageCursor.decode(cursor) if cursor else None,
+                direction=direction
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(
+                detail=str(e),
+                status_code=HTTP_400_BAD_REQUEST
+            )
+
+        container = get_dependency_container()
+        handler = await container.get_chat_history_handler()
+        result = await handler.handle(query)
+
+        if not result["success"]:
+            raise HTTPException(
+                detail=result["exception"],
+                status_code=HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        return result
+
+    @get(
+        "/search",
+        summary="Search messages",
+        description="Полнотекстовый поиск по тексту сообщений в чате или по участнику с ранжированием",
+    )
+    async def search_messages(
+        self,
+        q: Annotated[str, Parameter(description="Search query (web search syntax)", min_length=1, max_length=256)],
+        chat_id: Annotated[UUID | None, Parameter(description="Search within one chat")] = None,
+        participant_id: Annotated[UUID | None, Parameter(description="Search messages sent or received by a user")] = None,
+        cursor: Annotated[str | None, Parameter(description="Opaque page cursor")] = None,
+        limit: Annotated[int, Parameter(description="Page size", ge=1, le=100)] = 20,
+    ) -> Dict[str, Any]:
+        if chat_id is None and participant_id is None:
+            raise HTTPException(
+                detail="Either chat_id or participant_id is required",
+                status_code=HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            query = SearchMessagesQuery(
+                query=q,
+                chat_id=chat_id,
+                participant_id=participant_id,
+                limit=limit,
+                cursor=SearchCursor.decode(cursor) if cursor else None
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(
+                detail=str(e),
+                status_code=HTTP_400_BAD_REQUEST
+            )
+
+        container = get_dependency_container()
+        handler = await container.get_search_messages_handler()
+        result = await handler.handle(query)
+
+        if not result["success"]:
+            raise HTTPException(
+                detail=result["exception"],
+                status_code=HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        return result
+
+    @get(
+        "/chat/{chat_id:uuid}/changes",
+        summary="Get chat changes",
+        description="Получить все изменения чата после указанного порядкового номера для синхронизации клиента",
+    )
+    async def get_chat_changes(
+        self,
+        chat_id: Annotated[UUID, Parameter(description="Chat ID (UUID)")],
+        since: Annotated[int, Parameter(description="Last sequence number the client has seen", ge=0)] = 0,
+        limit: Annotated[int, Parameter(description="Maximum number of changes", ge=1, le=1000)] = 500,
+    ) -> Dict[str, Any]:
+        container = get_dependency_container()
+        handler = await container.get_chat_changes_handler()
+        result = await handler.handle(GetChatChangesQuery(chat_id=chat_id, since_seq=since, limit=limit))
+
+        if not result["success"]:
+            raise HTTPException(
+                detail=result["exception"],
+                status_code=HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        return result
+
+    @get(
+        "/chat/{chat_id:uuid}/export",
+        summary="Export chat",
+        description="Выгрузить все сообщения чата в формате NDJSON потоком",
+    )
+    async def export_chat(
+        self,
+        chat_id: Annotated[UUID, Parameter(description="Chat ID (UUID)")],
+    ) -> Stream:
+        container = get_dependency_container()
+        message_service = await container.get_message_service()
+
+        return Stream(
+            message_service.export_chat(chat_id),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f'attachment; filename="chat-{chat_id}.ndjson"'}
+        )
+
+    @get(
+        "/unread/{recipient_id:uuid}",
+        summary="Get unread counters",
+        description="Получить количество непрочитанных сообщений получателя по чатам",
+    )
+    async def get_unread_count(
+        self,
+        recipient_id: Annotated[UUID, Parameter(description="Recipient ID (UUID)")],
+        chat_id: Annotated[UUID | None, Parameter(description="Limit the counter to one chat")] = None,
+    ) -> Dict[str, Any]:
+        container = get_dependency_container()
+        handler = await container.get_unread_count_handler()
+        result = await handler.handle(GetUnreadCountQuery(recipient_id=recipient_id, chat_id=chat_id))
+
+        if not result["success"]:
+            raise HTTPException(
+                detail=result["exception"],
+                status_code=HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        return result
+
+    @get(
+        "/metrics/replicas",
+        summary="Get replica metrics",
+        description="Получить состояние, отставание и распределение чтений по репликам",
+    )
+    async def get_replica_metrics(self) -> Dict[str, Any]:
+        container = get_dependency_container()
+        replica_router = await container.get_replica_router()
+        return replica_router.get_metrics()
+
+    @get(
+        "/metrics/shards",
+        summary="Get shard metrics",
+        description="Получить число шардов, переопределения чатов и статистику индекса маршрутизации",
+    )
+    async def get_shard_metrics(self) -> Dict[str, Any]:
+        container = get_dependency_container()
+        shard_router = await container.get_shard_router()
+        return shard_router.get_metrics()
+
+    @get(
+        "/metrics/cache",
+        summary="Get cache metrics",
+        description="Получить попадания, промахи и вытеснения локального кэша",
+    )
+    async def get_cache_metrics(self) -> Dict[str, Any]:
+        container = get_dependency_container()
+        cache = await container.get_multi_level_cache()
+        metrics = cache.get_metrics()
+        broadcaster = await container.get_l1_invalidation_broadcaster()
+        if broadcaster is not None:
+            metrics["l1_invalidation"] = broadcaster.get_metrics()
+        return metrics
+
     @post(
         "/",
         summary="Create new message",
@@ -137,6 +323,27 @@ class MessageController(Controller):
                 status_code=HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @patch(
+        "/chat/{chat_id:uuid}/read_up_to/{message_id:uuid}",
+        summary="Mark chat as read up to a message",
+        description="Пометить прочитанными все сообщения чата вплоть до указанного",
+    )
+    async def mark_chat_as_read(
+        self,
+        chat_id: Annotated[UUID, Parameter(description="Chat ID (UUID)")],
+        message_id: Annotated[UUID, Parameter(description="Last read message ID (UUID)")],
+        reader_id: Annotated[UUID, Parameter(description="Reader ID (UUID)")],
+        taskiq_service: TaskiqService
+    ) -> Dict[str, Any]:
+        try:
+            task_id = await taskiq_service.send_mark_chat_as_read_task(chat_id, reader_id, message_id)
+            return {"task_id": task_id, "status": "queued"}
+        except Exception as e:
+            raise HTTPException(
+                detail=str(e),
+                status_code=HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
     @patch(
         "/{message_id:uuid}/delete",
         summary="Delete message",
@@ -0,0 +1,57 @@
+"""Redis entry size and encode/decode cost per cache codec.
+
+Run from the directory containing the package:
+
+    python -m LuminMessageService.benchmarks.cache_codec
+"""
+import json
+import timeit
+from datetime import datetime
+from uuid import uuid4
+from LuminMessageService.app.infrastructure.cache.codecs import (
+    JSON_TAG, BinaryCacheCodec, PickleCacheCodec, _json_default, _json_object_hook,
+)
+
+ROUNDS = 100_000
+
+
+class JsonFallbackCodec:
+    def encode(self, value):
+        return bytes((JSON_TAG,)) + json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+    def decode(self, data):
+        return json.loads(data[1:], object_hook=_json_object_hook)
+
+
+def message_records() -> dict[str, dict]:
+    folded = {
+        "message_id": uuid4(),
+        "sender_id": uuid4(),
+        "recipient_id": uuid4(),
+        "chat_id": uuid4(),
+        "text": "See you at the standup tomorrow",
+        "sent_at": datetime(2026, 10, 18, 12, 0, 0, 123456),
+        "read_at": datetime(2026, 10, 18, 12, 5, 0, 654321),
+        "edited_at": None,
+        "version": 3,
+    }
+    return {
+        "save path": {**folded, "is_read": True},
+        "fetched row": {**folded, "is_deleted": False},
+        "folded history": folded,
+    }
+
+
+def main() -> None:
+    codecs = {"pickle": PickleCacheCodec(), "json (0xB2)": JsonFallbackCodec(), "binary": BinaryCacheCodec()}
+    print(f"{'record':<16}{'codec':<14}{'tag':>6}{'bytes':>8}{'encode us':>12}{'decode us':>12}")
+    for record_name, record in message_records().items():
+        for codec_name, codec in codecs.items():
+            encoded = codec.encode(record)
+            encode_us = timeit.timeit(lambda: codec.encode(record), number=ROUNDS) / ROUNDS * 1e6
+            decode_us = timeit.timeit(lambda: codec.decode(encoded), number=ROUNDS) / ROUNDS * 1e6
+            print(f"{record_name:<16}{codec_name:<14}{encoded[0]:>#6x}{len(encoded):>8}{encode_us:>12.2f}{decode_us:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Chat history page latency by depth: keyset cursor vs OFFSET.
+
+OFFSET times the bare query; keyset times MessageService.get_chat_history, mapping and watermarks included.
+
+Needs a scratch Postgres database; its public schema is dropped. Run from the directory containing the package:
+
+    python -m LuminMessageService.benchmarks.chat_history postgresql://postgres@127.0.0.1:5432/bench 1000000
+"""
+import asyncio
+import statistics
+import sys
+import time
+from uuid import uuid4
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.domain.models.common.value_objects import HistoryDirection, MessageCursor
+from LuminMessageService.app.infrastructure.cache.bounded_local_cache import BoundedLocalCache, LocalCacheConfig
+from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache, local_entry_size
+from LuminMessageService.app.infrastructure.cache.redis_cache import CacheConfig, RedisCache
+from LuminMessageService.benchmarks.database import insert_chat_rows, scratch_pool
+
+PAGE_SIZE = 50
+ROUNDS = 20
+
+OFFSET_SQL = """
+SELECT message_id, sender_id, recipient_id, chat_id, text, sent_at, read_at, edited_at, version
+FROM messages
+WHERE chat_id = $1 AND deleted_at IS NULL
+ORDER BY sent_at DESC, message_id DESC
+OFFSET $2 LIMIT $3
+"""
+
+
+async def median_ms(call) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        started_at = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(timings)
+
+
+async def main(dsn: str, total: int) -> None:
+    pool = await scratch_pool(dsn)
+    chat_id = uuid4()
+    await insert_chat_rows(pool, chat_id, (uuid4(), uuid4()), total, ["hello", "world", "standup", "review"])
+    message_service = MessageService(
+        pool, MultiLevelCache(RedisCache(CacheConfig()), BoundedLocalCache(LocalCacheConfig(), local_entry_size))
+    )
+
+    print(f"{'depth':>10}{'offset ms':>14}{'keyset ms':>14}")
+    for depth in sorted({0, 1_000, 10_000, 100_000, total // 2, total - PAGE_SIZE}):
+        if not 0 <= depth < total:
+            continue
+
+        cursor = None
+        async with pool.acquire() as conn:
+            offset_ms = await median_ms(lambda: conn.fetch(OFFSET_SQL, chat_id, depth, PAGE_SIZE))
+            if depth:
+                previous = await conn.fetchrow(OFFSET_SQL, chat_id, depth - 1, 1)
+                cursor = MessageCursor(previous["sent_at"], previous["message_id"])
+
+        keyset_ms = await median_ms(
+            lambda: message_service.get_chat_history(chat_id, PAGE_SIZE, cursor, HistoryDirection.OLDER)
+        )
+        print(f"{depth:>10}{offset_ms:>14.3f}{keyset_ms:>14.3f}")
+
+    await pool.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000))
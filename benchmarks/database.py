@@ -0,0 +1,61 @@
+"""Scratch Postgres schema and bulk data for the database benchmarks.
+
+The public schema of the target database is dropped and recreated, so point the benchmarks at a throwaway database.
+"""
+from datetime import datetime, timedelta
+from uuid import UUID
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool, PoolConfig
+from LuminMessageService.app.infrastructure.persistance.models import Base
+from LuminMessageService.app.infrastructure.persistance.partitioning import MessagePartitionManager
+
+INSERT_BATCH = 100_000
+
+
+async def scratch_pool(dsn: str, max_size: int = 10) -> DatabasePool:
+    pool = DatabasePool(PoolConfig(dsn=dsn, min_size=1, max_size=max_size, command_timeout=600))
+    dialect = postgresql.dialect()
+    async with pool.acquire() as conn:
+        await conn.execute("DROP SCHEMA IF EXISTS public CASCADE; CREATE SCHEMA public")
+        for table in Base.metadata.sorted_tables:
+            await conn.execute(str(CreateTable(table).compile(dialect=dialect)))
+            for index in table.indexes:
+                await conn.execute(str(CreateIndex(index).compile(dialect=dialect)))
+    return pool
+
+
+async def insert_chat_rows(
+        pool: DatabasePool,
+        chat_id: UUID,
+        participants: tuple[UUID, UUID],
+        total: int,
+        words: list[str],
+        newest: datetime | None = None,
+) -> None:
+    """Insert `total` messages one second apart, ending at `newest`, with texts drawn from `words`."""
+    newest = newest or datetime.now().replace(microsecond=0)
+    oldest = newest - timedelta(seconds=total - 1)
+    month, months = oldest, []
+    while month <= newest:
+        months.append(month)
+        month = (month.replace(day=1) + timedelta(days=32)).replace(day=1)
+    await MessagePartitionManager(pool).ensure_months(months)
+
+    async with pool.acquire() as conn:
+        for offset in range(0, total, INSERT_BATCH):
+            await conn.execute("""
+            INSERT INTO messages (message_id, sender_id, recipient_id, chat_id, text, sent_at, version)
+            SELECT
+                gen_random_uuid(),
+                CASE WHEN i % 2 = 0 THEN $2::uuid ELSE $3::uuid END,
+                CASE WHEN i % 2 = 0 THEN $3::uuid ELSE $2::uuid END,
+                $1,
+                ($4::text[])[(1 + i % cardinality($4::text[]))::int] || ' ' ||
+                    ($4::text[])[(1 + (i * 7919) % cardinality($4::text[]))::int] || ' ' ||
+                    ($4::text[])[(1 + (i * 104729) % cardinality($4::text[]))::int],
+                $5::timestamp + make_interval(secs => i),
+                1
+            FROM generate_series($6::bigint, $7::bigint) AS i
+            """, chat_id, participants[0], participants[1], words, oldest, offset, min(offset + INSERT_BATCH, total) - 1)
+        await conn.execute("ANALYZE messages")
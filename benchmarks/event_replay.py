@@ -0,0 +1,56 @@
+"""Message load time against edit count, with and without snapshots.
+
+Needs a scratch Postgres database; its public schema is dropped. Run from the directory containing the package:
+
+    python -m LuminMessageService.benchmarks.event_replay postgresql://postgres@127.0.0.1:5432/bench 10 100 1000
+"""
+import asyncio
+import statistics
+import sys
+import time
+from uuid import UUID, uuid4
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.domain.models.common.value_objects import MessageText
+from LuminMessageService.app.infrastructure.cache.bounded_local_cache import BoundedLocalCache, LocalCacheConfig
+from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache, local_entry_size
+from LuminMessageService.app.infrastructure.cache.redis_cache import CacheConfig, RedisCache
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool
+from LuminMessageService.app.infrastructure.persistance.unit_of_work import get_unit_of_work
+from LuminMessageService.benchmarks.database import scratch_pool
+
+ROUNDS = 50
+
+
+async def load_ms(pool: DatabasePool, cache: MultiLevelCache, message_id: UUID) -> float:
+    timings = []
+    async with get_unit_of_work(pool, cache) as uow:
+        for _ in range(ROUNDS):
+            started_at = time.perf_counter()
+            await uow.messages.fetch_message_data(message_id)
+            timings.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(timings)
+
+
+async def main(dsn: str, edit_counts: list[int]) -> None:
+    pool = await scratch_pool(dsn)
+    cache = MultiLevelCache(RedisCache(CacheConfig()), BoundedLocalCache(LocalCacheConfig(), local_entry_size))
+    message_service = MessageService(pool, cache)
+
+    print(f"{'edits':>8}{'events':>8}{'snapshot ms':>14}{'full replay ms':>16}")
+    for edits in edit_counts:
+        message = await message_service.create_message(uuid4(), uuid4(), uuid4(), uuid4(), MessageText("draft"))
+        for edit in range(edits):
+            message = await message_service.edit_message_text(message.id, MessageText(f"draft {edit}"))
+            cache.evict_local([message.id])
+
+        snapshot_ms = await load_ms(pool, cache, message.id)
+        async with pool.acquire() as conn:
+            await conn.execute("DELETE FROM message_snapshots WHERE aggregate_id = $1", message.id)
+        replay_ms = await load_ms(pool, cache, message.id)
+        print(f"{edits:>8}{message.version:>8}{snapshot_ms:>14.3f}{replay_ms:>16.3f}")
+
+    await pool.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1], [int(value) for value in sys.argv[2:]] or [10, 100, 1000]))
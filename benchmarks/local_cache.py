@@ -0,0 +1,46 @@
+"""BoundedLocalCache hit ratio and throughput under Zipf-distributed key popularity.
+
+Every miss is followed by a set, as MultiLevelCache does after loading from Redis. Run from the directory containing
+the package:
+
+    python -m LuminMessageService.benchmarks.local_cache 100000 1000000
+"""
+import random
+import sys
+import time
+from itertools import accumulate
+from LuminMessageService.app.infrastructure.cache.bounded_local_cache import BoundedLocalCache, LocalCacheConfig
+
+SKEWS = [0.8, 1.0, 1.2]
+CAPACITY_RATIOS = [0.001, 0.01, 0.1]
+
+
+def zipf_keys(keys: int, skew: float, accesses: int, seed: int = 7) -> list[int]:
+    weights = accumulate(1 / rank ** skew for rank in range(1, keys + 1))
+    return random.Random(seed).choices(range(keys), cum_weights=list(weights), k=accesses)
+
+
+def replay(trace: list[int], capacity: int) -> tuple[float, float]:
+    cache: BoundedLocalCache[int, int] = BoundedLocalCache(
+        LocalCacheConfig(max_entries=capacity, ttl_seconds=3600), lambda value: 64
+    )
+    started_at = time.perf_counter()
+    for key in trace:
+        if cache.get(key) is None:
+            cache.set(key, key)
+    elapsed = time.perf_counter() - started_at
+    return cache.get_metrics()["hit_ratio"], len(trace) / elapsed
+
+
+def main(keys: int, accesses: int) -> None:
+    print(f"{'skew':>6}{'capacity':>10}{'hit ratio':>12}{'ops/s':>12}")
+    for skew in SKEWS:
+        trace = zipf_keys(keys, skew, accesses)
+        for ratio in CAPACITY_RATIOS:
+            capacity = max(1, int(keys * ratio))
+            hit_ratio, ops = replay(trace, capacity)
+            print(f"{skew:>6}{capacity:>10}{hit_ratio:>12.3f}{ops:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000, int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
@@ -0,0 +1,82 @@
+"""Full-text search latency (p50/p99) against an unindexed ILIKE scan.
+
+ILIKE stops at the first page of matches in sent_at order and does not rank, so it only loses when matches are rare.
+
+Messages are spread over CHATS chats that share one participant, so participant-scoped searches cover the whole table.
+Needs a scratch Postgres database; its public schema is dropped. Run from the directory containing the package:
+
+    python -m LuminMessageService.benchmarks.message_search postgresql://postgres@127.0.0.1:5432/bench 1000000
+"""
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.infrastructure.cache.bounded_local_cache import BoundedLocalCache, LocalCacheConfig
+from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache, local_entry_size
+from LuminMessageService.app.infrastructure.cache.redis_cache import CacheConfig, RedisCache
+from LuminMessageService.benchmarks.database import insert_chat_rows, scratch_pool
+
+CHATS = 20
+ROUNDS = 200
+PAGE_SIZE = 20
+# "standup" fills about 1 in 100 word slots; every "wN" is rare.
+WORDS = ["standup"] * 50 + [f"w{index}" for index in range(5000)]
+QUERIES = ["standup", "w4242", "w42 w43", "standup -w4242", "nomatch"]
+SCAN_QUERIES = ["standup", "w4242", "nomatch"]
+
+ILIKE_SQL = """
+SELECT message_id FROM messages
+WHERE chat_id = $1 AND deleted_at IS NULL AND text ILIKE '%' || $2 || '%'
+ORDER BY sent_at DESC
+LIMIT $3
+"""
+
+
+async def percentiles(call) -> tuple[float, float]:
+    timings = []
+    for _ in range(ROUNDS):
+        started_at = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started_at) * 1000)
+    cuts = statistics.quantiles(timings, n=100)
+    return cuts[49], cuts[98]
+
+
+async def main(dsn: str, total: int) -> None:
+    pool = await scratch_pool(dsn)
+    participant_id = uuid4()
+    chat_ids = [uuid4() for _ in range(CHATS)]
+    newest = datetime.now().replace(microsecond=0)
+    for index, chat_id in enumerate(chat_ids):
+        await insert_chat_rows(
+            pool, chat_id, (participant_id, uuid4()), total // CHATS, WORDS,
+            newest - timedelta(seconds=index * (total // CHATS))
+        )
+
+    message_service = MessageService(
+        pool, MultiLevelCache(RedisCache(CacheConfig()), BoundedLocalCache(LocalCacheConfig(), local_entry_size))
+    )
+    chat_id = chat_ids[0]
+
+    print(f"{'query':>16}{'scope':>14}{'p50 ms':>10}{'p99 ms':>10}")
+    for query in QUERIES:
+        chat = await percentiles(lambda: message_service.search_messages(query, PAGE_SIZE, chat_id=chat_id))
+        print(f"{query:>16}{'chat':>14}{chat[0]:>10.2f}{chat[1]:>10.2f}")
+        participant = await percentiles(
+            lambda: message_service.search_messages(query, PAGE_SIZE, participant_id=participant_id)
+        )
+        print(f"{query:>16}{'participant':>14}{participant[0]:>10.2f}{participant[1]:>10.2f}")
+
+    async with pool.acquire() as conn:
+        for query in SCAN_QUERIES:
+            scan = await percentiles(lambda: conn.fetch(ILIKE_SQL, chat_id, query, PAGE_SIZE))
+            print(f"{query:>16}{'chat ILIKE':>14}{scan[0]:>10.2f}{scan[1]:>10.2f}")
+
+    await pool.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000))
@@ -0,0 +1,79 @@
+"""Outbox relay throughput: pipelined JetStream acks vs publishing one event at a time.
+
+Needs a scratch Postgres database (its public schema is dropped) and a NATS server with JetStream enabled.
+Run from the directory containing the package:
+
+    python -m LuminMessageService.benchmarks.outbox_relay postgresql://postgres@127.0.0.1:5432/bench nats://127.0.0.1:4222 50000
+"""
+import asyncio
+import json
+import sys
+import time
+from uuid import uuid4
+from LuminMessageService.app.infrastructure.messaging.nats_event_bus import NatsEventBus
+from LuminMessageService.app.infrastructure.messaging.outbox_relay import OutboxRelay, OutboxRelayConfig
+from LuminMessageService.benchmarks.database import scratch_pool
+
+STREAM = "OUTBOX_BENCH"
+
+
+class SequentialEventBus(NatsEventBus):
+    async def publish_batch(self, messages: list[tuple[str, bytes, str]]) -> list[BaseException | None]:
+        results = []
+        for subject, payload, message_id in messages:
+            try:
+                await self.js.publish(subject=subject, payload=payload, headers={"Nats-Msg-Id": message_id})
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+async def fill_outbox(pool, total: int) -> None:
+    payload = json.dumps({"chat_id": str(uuid4()), "text": "See you at the standup tomorrow"})
+    async with pool.acquire() as conn:
+        await conn.execute("""
+        INSERT INTO outbox (event_id, aggregate_id, event_type, subject, payload)
+        SELECT gen_random_uuid(), gen_random_uuid(), 'MessageSentEvent', 'bench.events.MessageSentEvent', $1::jsonb
+        FROM generate_series(1, $2)
+        """, payload, total)
+
+
+async def events_per_second(pool, event_bus: NatsEventBus, total: int) -> float:
+    await fill_outbox(pool, total)
+    relay = OutboxRelay(pool, event_bus, OutboxRelayConfig())
+
+    started_at = time.perf_counter()
+    published = await relay.drain()
+    elapsed = time.perf_counter() - started_at
+
+    if published != total:
+        raise RuntimeError(f"Relayed {published} of {total} events: {relay.stats}")
+    return total / elapsed
+
+
+async def main(dsn: str, nats_url: str, total: int) -> None:
+    pool = await scratch_pool(dsn)
+    pipelined, sequential = NatsEventBus(nats_url), SequentialEventBus(nats_url)
+    await pipelined.connect()
+    await sequential.connect()
+
+    try:
+        await pipelined.js.delete_stream(STREAM)
+    except Exception:
+        pass
+    await pipelined.js.add_stream(name=STREAM, subjects=["bench.events.>"])
+
+    print(f"{'events':>10}{'sequential ev/s':>18}{'pipelined ev/s':>18}")
+    sequential_rate = await events_per_second(pool, sequential, total)
+    pipelined_rate = await events_per_second(pool, pipelined, total)
+    print(f"{total:>10}{sequential_rate:>18.0f}{pipelined_rate:>18.0f}")
+
+    await pipelined.js.delete_stream(STREAM)
+    await pipelined.nc.close()
+    await sequential.nc.close()
+    await pool.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 50_000))
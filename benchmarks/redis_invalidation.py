@@ -0,0 +1,63 @@
+"""Invalidation cost against Redis keyspace size: pattern delete vs generation bump.
+
+Needs a scratch Redis database; it is flushed. Run from the directory containing the package:
+
+    python -m LuminMessageService.benchmarks.redis_invalidation redis://127.0.0.1:6379/15 10000000
+"""
+import asyncio
+import sys
+import time
+from urllib.parse import urlsplit
+from uuid import uuid4
+from LuminMessageService.app.infrastructure.cache.redis_cache import CacheConfig, RedisCache
+
+FILL_BATCH = 10_000
+INVALIDATIONS = 20
+
+
+async def fill(redis_cache: RedisCache, total: int, start: int) -> None:
+    for offset in range(start, total, FILL_BATCH):
+        pipeline = redis_cache._client.pipeline(transaction=False)
+        for index in range(offset, min(offset + FILL_BATCH, total)):
+            pipeline.set(redis_cache._build_key(f"message:{uuid4()}"), b"x" * 16)
+        await pipeline.execute()
+
+
+async def timed(invalidate) -> float:
+    started_at = time.perf_counter()
+    for _ in range(INVALIDATIONS):
+        await invalidate()
+    return (time.perf_counter() - started_at) / INVALIDATIONS * 1000
+
+
+async def main(redis_url: str, max_keys: int) -> None:
+    url = urlsplit(redis_url)
+    redis_cache = RedisCache(CacheConfig(
+        host=url.hostname, port=url.port or 6379, password=url.password, db=int(url.path.strip("/") or 0)
+    ))
+    await redis_cache.connect()
+    await redis_cache._client.flushdb()
+
+    chat_id = uuid4()
+    _, generation = await redis_cache.get_derived("chat", chat_id, "history:50")
+    await redis_cache.set_derived("chat", chat_id, "history:50", [], generation)
+    message_id = uuid4()
+
+    print(f"{'keys':>10}{'pattern delete ms':>20}{'generation bump ms':>20}")
+    filled = 0
+    size = 10_000
+    while filled < max_keys:
+        size = min(size, max_keys)
+        await fill(redis_cache, size, filled)
+        filled = size
+        pattern_ms = await timed(lambda: redis_cache.delete_pattern(f"message:{message_id}:*"))
+        bump_ms = await timed(lambda: redis_cache.invalidate_chats([chat_id]))
+        print(f"{filled:>10}{pattern_ms:>20.3f}{bump_ms:>20.3f}")
+        size *= 10
+
+    await redis_cache._client.flushdb()
+    await redis_cache.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 10_000_000))
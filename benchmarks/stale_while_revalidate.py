@@ -0,0 +1,89 @@
+"""Read latency across cache expiry: stale-while-revalidate vs a hard TTL.
+
+Readers hammer a small hot set whose loader is slow. With a hard TTL every expiry blocks readers on a reload; with a
+soft TTL they keep getting the stale entry while one background refresh runs. Needs a scratch Redis database; it is
+flushed. Run from the directory containing the package:
+
+    python -m LuminMessageService.benchmarks.stale_while_revalidate redis://127.0.0.1:6379/15 200 10
+"""
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+from uuid import UUID, uuid4
+from LuminMessageService.app.infrastructure.cache.bounded_local_cache import BoundedLocalCache, LocalCacheConfig
+from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache, local_entry_size
+from LuminMessageService.app.infrastructure.cache.redis_cache import CacheConfig, RedisCache
+
+HOT_KEYS = 20
+READERS = 50
+EXPIRY_SECONDS = 1
+
+
+async def run(redis_url: str, soft_ttl: int, hard_ttl: int, load_ms: float, duration: float) -> tuple[list[float], int]:
+    url = urlsplit(redis_url)
+    redis_cache = RedisCache(CacheConfig(
+        host=url.hostname, port=url.port or 6379, password=url.password, db=int(url.path.strip("/") or 0),
+        default_ttl=hard_ttl, soft_ttl=soft_ttl, ttl_jitter=0, early_refresh_beta=0
+    ))
+    await redis_cache.connect()
+    await redis_cache._client.flushdb()
+    # The local tier is disabled so every read reaches the Redis entry whose expiry is being measured.
+    cache = MultiLevelCache(redis_cache, BoundedLocalCache(LocalCacheConfig(ttl_seconds=0), local_entry_size))
+
+    sender_id, recipient_id, chat_id = uuid4(), uuid4(), uuid4()
+    loads = 0
+
+    async def load(message_id: UUID) -> dict:
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(load_ms / 1000)
+        return {
+            "message_id": message_id, "sender_id": sender_id, "recipient_id": recipient_id, "chat_id": chat_id,
+            "text": "See you at the standup tomorrow", "sent_at": datetime.now(), "read_at": None,
+            "edited_at": None, "version": 1,
+        }
+
+    cache.set_refresher(load)
+    message_ids = [uuid4() for _ in range(HOT_KEYS)]
+    for message_id in message_ids:
+        await cache.load_message(message_id, lambda message_id=message_id: load(message_id))
+    loads = 0
+
+    timings: list[float] = []
+    deadline = time.monotonic() + duration
+
+    async def reader(seed: int) -> None:
+        keys = random.Random(seed)
+        while time.monotonic() < deadline:
+            message_id = keys.choice(message_ids)
+            started_at = time.perf_counter()
+            hit, _ = await cache.get_message_entry(message_id)
+            if not hit:
+                await cache.load_message(message_id, lambda: load(message_id))
+            timings.append((time.perf_counter() - started_at) * 1000)
+
+    await asyncio.gather(*(reader(seed) for seed in range(READERS)))
+    await asyncio.gather(*cache._refresh_tasks.values())
+    await redis_cache._client.flushdb()
+    await redis_cache.disconnect()
+    return timings, loads
+
+
+async def main(redis_url: str, load_ms: float, duration: float) -> None:
+    print(f"{'mode':>12}{'reads':>10}{'loads':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for mode, soft_ttl, hard_ttl in (("hard ttl", EXPIRY_SECONDS, EXPIRY_SECONDS), ("swr", EXPIRY_SECONDS, 3600)):
+        timings, loads = await run(redis_url, soft_ttl, hard_ttl, load_ms, duration)
+        cuts = statistics.quantiles(timings, n=100)
+        print(f"{mode:>12}{len(timings):>10}{loads:>8}{cuts[49]:>10.2f}{cuts[98]:>10.2f}{max(timings):>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        sys.argv[1],
+        float(sys.argv[2]) if len(sys.argv) > 2 else 200,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 10,
+    ))
@@ -0,0 +1,98 @@
+import os
+import sys
+import types
+from pathlib import Path
+from urllib.parse import urlsplit
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if "LuminMessageService" not in sys.modules:
+    package = types.ModuleType("LuminMessageService")
+    package.__path__ = [str(ROOT)]
+    sys.modules["LuminMessageService"] = package
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.infrastructure.archive.message_archive import ArchiveConfig, MessageArchive
+from LuminMessageService.app.infrastructure.cache.bounded_local_cache import BoundedLocalCache, LocalCacheConfig
+from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache, local_entry_size
+from LuminMessageService.app.infrastructure.cache.redis_cache import CacheConfig, RedisCache
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool, PoolConfig
+from LuminMessageService.app.infrastructure.persistance.models import Base
+from LuminMessageService.app.infrastructure.persistance.partitioning import MessagePartitionManager
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+TEST_REDIS_URL = os.getenv("TEST_REDIS_URL")
+SHARD_DATABASE = "lumin_test_shard_1"
+
+
+async def create_schema(conn) -> None:
+    dialect = postgresql.dialect()
+    await conn.execute("DROP SCHEMA IF EXISTS public CASCADE; CREATE SCHEMA public")
+    for table in Base.metadata.sorted_tables:
+        await conn.execute(str(CreateTable(table).compile(dialect=dialect)))
+        for index in table.indexes:
+            await conn.execute(str(CreateIndex(index).compile(dialect=dialect)))
+
+
+@pytest.fixture
+async def connection_pool():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    pool = DatabasePool(PoolConfig(dsn=TEST_DATABASE_URL, min_size=1, max_size=10))
+    async with pool.acquire() as conn:
+        await create_schema(conn)
+    await MessagePartitionManager(pool).ensure_partitions()
+
+    yield pool
+    await pool.disconnect()
+
+
+@pytest.fixture
+async def second_shard(connection_pool):
+    async with connection_pool.acquire() as conn:
+        await conn.execute(f"DROP DATABASE IF EXISTS {SHARD_DATABASE} WITH (FORCE)")
+        await conn.execute(f"CREATE DATABASE {SHARD_DATABASE}")
+
+    pool = DatabasePool(PoolConfig(
+        dsn=urlsplit(TEST_DATABASE_URL)._replace(path=f"/{SHARD_DATABASE}").geturl(), min_size=1, max_size=5
+    ))
+    async with pool.acquire() as conn:
+        await create_schema(conn)
+    await MessagePartitionManager(pool).ensure_partitions()
+
+    yield pool
+    await pool.disconnect()
+
+
+@pytest.fixture
+def cache() -> MultiLevelCache:
+    return MultiLevelCache(RedisCache(CacheConfig()), BoundedLocalCache(LocalCacheConfig(), local_entry_size))
+
+
+@pytest.fixture
+async def redis_cache():
+    if not TEST_REDIS_URL:
+        pytest.skip("TEST_REDIS_URL is not set")
+
+    url = urlsplit(TEST_REDIS_URL)
+    redis_cache = RedisCache(CacheConfig(
+        host=url.hostname, port=url.port or 6379, password=url.password, db=int(url.path.strip("/") or 0)
+    ))
+    await redis_cache.connect()
+    await redis_cache._client.flushdb()
+
+    yield redis_cache
+    await redis_cache.disconnect()
+
+
+@pytest.fixture
+def archive(tmp_path) -> MessageArchive:
+    return MessageArchive(ArchiveConfig(directory=str(tmp_path / "archive"), refresh_interval=0))
+
+
+@pytest.fixture
+def message_service(connection_pool, cache, archive) -> MessageService:
+    return MessageService(connection_pool, cache, archive=archive)
@@ -0,0 +1,37 @@
+from uuid import uuid4
+from LuminMessageService.app.domain.models.common.value_objects import MessageText
+from LuminMessageService.app.infrastructure.cache.codecs import MESSAGE_TAG, BinaryCacheCodec
+from LuminMessageService.app.infrastructure.persistance.unit_of_work import get_unit_of_work
+
+
+async def fetch_message_data(connection_pool, cache, message_id):
+    async with get_unit_of_work(connection_pool, cache) as uow:
+        return await uow.messages.fetch_message_data(message_id)
+
+
+def assert_compact_round_trip(message_data):
+    codec = BinaryCacheCodec()
+    encoded = codec.encode(message_data)
+    assert encoded[0] == MESSAGE_TAG
+
+    decoded = codec.decode(encoded)
+    assert decoded["is_read"] == (message_data["read_at"] is not None)
+    assert {key: decoded[key] for key in message_data if key != "is_deleted"} == {
+        key: value for key, value in message_data.items() if key != "is_deleted"
+    }
+
+
+async def test_folded_history_and_table_row_use_compact_message_encoding(connection_pool, cache, message_service):
+    message = await message_service.create_message(uuid4(), uuid4(), uuid4(), uuid4(), MessageText("encoded"))
+    await message_service.mark_message_as_read(message.id)
+
+    folded = await fetch_message_data(connection_pool, cache, message.id)
+    assert "is_read" not in folded
+    assert_compact_round_trip(folded)
+
+    async with connection_pool.acquire() as conn:
+        await conn.execute("DELETE FROM message_events WHERE aggregate_id = $1", message.id)
+        await conn.execute("DELETE FROM message_snapshots WHERE aggregate_id = $1", message.id)
+    row = await fetch_message_data(connection_pool, cache, message.id)
+    assert row["is_deleted"] is False
+    assert_compact_round_trip(row)
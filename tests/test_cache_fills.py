@@ -0,0 +1,42 @@
+import asyncio
+from uuid import uuid4
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.domain.models.common.value_objects import MessageText
+from LuminMessageService.app.infrastructure.cache.bounded_local_cache import BoundedLocalCache, LocalCacheConfig
+from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache, local_entry_size
+
+
+def process_cache(redis_cache) -> MultiLevelCache:
+    return MultiLevelCache(redis_cache, BoundedLocalCache(LocalCacheConfig(), local_entry_size))
+
+
+async def test_slow_fill_does_not_overwrite_a_later_save(connection_pool, redis_cache):
+    reader_cache = process_cache(redis_cache)
+    reader = MessageService(connection_pool, reader_cache)
+    writer = MessageService(connection_pool, process_cache(redis_cache))
+    message = await writer.create_message(uuid4(), uuid4(), uuid4(), uuid4(), MessageText("original"))
+    await redis_cache.delete_messages([message.id])
+
+    loaded = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_loader():
+        message_data = await reader._load_message_data(message.id)
+        loaded.set()
+        await release.wait()
+        return message_data
+
+    fill = asyncio.create_task(reader_cache.load_message(message.id, slow_loader))
+    await loaded.wait()
+    await writer.edit_message_text(message.id, MessageText("edited"))
+    release.set()
+    assert (await fill)["version"] == message.version
+
+    cached = (await redis_cache.get_message(message.id)).value
+    assert (cached["version"], cached["text"]) == (message.version + 1, "edited")
+
+    await reader_cache.set_message(message.id, {**cached, "version": message.version + 1})
+    assert (await redis_cache.get_message(message.id)).value["version"] == message.version + 1
+    await reader.delete(message.id)
+    await reader_cache.set_message(message.id, cached)
+    assert await redis_cache.get_message(message.id) == {"deleted": True}
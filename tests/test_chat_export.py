@@ -0,0 +1,38 @@
+import json
+import os
+from uuid import uuid4
+import pytest
+
+EXPORT_ROWS = 1_000_000
+PEAK_RSS_GROWTH_BOUND = 64 * 1024 * 1024
+
+
+def resident_bytes() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc to sample RSS")
+async def test_export_streams_large_chat_in_bounded_memory(connection_pool, message_service):
+    chat_id, sender_id, recipient_id = uuid4(), uuid4(), uuid4()
+    async with connection_pool.acquire() as conn:
+        await conn.execute("""
+        INSERT INTO messages (message_id, sender_id, recipient_id, chat_id, text, sent_at, version)
+        SELECT gen_random_uuid(), $2, $3, $1, 'message ' || n, date_trunc('month', now()) + n * interval '1 ms', 1
+        FROM generate_series(1, $4) AS n
+        """, chat_id, sender_id, recipient_id, EXPORT_ROWS)
+
+    lines = 0
+    exported_bytes = 0
+    first_row = None
+    baseline = peak = resident_bytes()
+    async for chunk in message_service.export_chat(chat_id):
+        if first_row is None:
+            first_row = json.loads(chunk.split(b"\n", 1)[0])
+        lines += chunk.count(b"\n")
+        exported_bytes += len(chunk)
+        peak = max(peak, resident_bytes())
+
+    assert lines == EXPORT_ROWS
+    assert first_row["text"] == "message 1"
+    assert peak - baseline < PEAK_RSS_GROWTH_BOUND < exported_bytes
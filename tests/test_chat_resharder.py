@@ -0,0 +1,44 @@
+from uuid import uuid4
+import pytest
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.domain.models.common.exceptions import MessageVersionConflictError
+from LuminMessageService.app.domain.models.common.value_objects import MessageText
+from LuminMessageService.app.infrastructure.persistance.chat_resharder import ChatResharder, ChatResharderConfig
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool, PoolConfig
+from LuminMessageService.app.infrastructure.persistance.replica_router import ReplicaRouter
+from LuminMessageService.app.infrastructure.persistance.shard_router import ShardRouter
+from LuminMessageService.app.infrastructure.persistance.tombstone_compactor import TombstoneCompactor, \
+    TombstoneCompactorConfig
+
+async def count_events(pool: DatabasePool, message_id) -> int:
+    async with pool.acquire() as conn:
+        return await conn.fetchval("SELECT count(*) FROM message_events WHERE aggregate_id = $1", message_id)
+
+
+async def test_moving_a_chat_carries_events_of_compacted_tombstones(connection_pool, second_shard, cache):
+    router = ShardRouter([ReplicaRouter(connection_pool), ReplicaRouter(second_shard)])
+    message_service = MessageService(connection_pool, cache, shard_router=router)
+    chat_id, sender_id, recipient_id = uuid4(), uuid4(), uuid4()
+    source, target = router.shard_index(chat_id), 1 - router.shard_index(chat_id)
+    source_pool, target_pool = router.shards[source].primary, router.shards[target].primary
+
+    kept = await message_service.create_message(uuid4(), sender_id, recipient_id, chat_id, MessageText("kept"))
+    deleted = await message_service.create_message(uuid4(), sender_id, recipient_id, chat_id, MessageText("gone"))
+    await message_service.delete(deleted.id)
+    assert await TombstoneCompactor(source_pool, TombstoneCompactorConfig(retention_seconds=0)).compact() == 1
+
+    before = {message.id: await count_events(source_pool, message.id) for message in (kept, deleted)}
+    assert before[deleted.id] > before[kept.id] > 0
+
+    result = await ChatResharder(router, ChatResharderConfig(settle_seconds=0)).move_chat(chat_id, target)
+    assert result["moved"] and result["copied"] == 1
+
+    assert {message_id: await count_events(source_pool, message_id) for message_id in before} == {
+        kept.id: 0, deleted.id: 0
+    }
+    assert {message_id: await count_events(target_pool, message_id) for message_id in before} == before
+
+    cache.evict_local([kept.id, deleted.id])
+    assert (await message_service.get_message_by_id(kept.id)).text.value == "kept"
+    with pytest.raises(MessageVersionConflictError):
+        await message_service.create_message(deleted.id, sender_id, recipient_id, chat_id, MessageText("again"))
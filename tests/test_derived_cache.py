@@ -0,0 +1,50 @@
+from uuid import uuid4
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.domain.models.common.value_objects import MessageText
+from LuminMessageService.app.infrastructure.cache.bounded_local_cache import BoundedLocalCache, LocalCacheConfig
+from LuminMessageService.app.infrastructure.cache.derived_key_sweeper import DerivedKeySweeper, \
+    DerivedKeySweeperConfig
+from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache, local_entry_size
+
+
+async def history_ids(message_service, chat_id):
+    return [message.id for message in (await message_service.get_chat_history(chat_id, 10)).messages]
+
+
+async def test_chat_history_page_is_unreadable_after_generation_bump(connection_pool, redis_cache):
+    cache = MultiLevelCache(redis_cache, BoundedLocalCache(LocalCacheConfig(), local_entry_size))
+    message_service = MessageService(connection_pool, cache)
+    chat_id = uuid4()
+
+    first = await message_service.create_message(uuid4(), uuid4(), uuid4(), chat_id, MessageText("first"))
+    assert await history_ids(message_service, chat_id) == [first.id]
+    rows, generation = await redis_cache.get_derived("chat", chat_id, "history:10")
+    assert [row["message_id"] for row in rows] == [first.id]
+
+    second = await message_service.create_message(uuid4(), uuid4(), uuid4(), chat_id, MessageText("second"))
+    assert await redis_cache.get_derived("chat", chat_id, "history:10") == (None, generation + 1)
+    assert not await redis_cache.set_derived("chat", chat_id, "history:10", rows, generation)
+    assert await history_ids(message_service, chat_id) == [second.id, first.id]
+
+    await message_service.delete(second.id)
+    assert await history_ids(message_service, chat_id) == [first.id]
+    assert not await redis_cache._client.keys(redis_cache._build_key("gen:message:*"))
+
+
+async def test_sweeper_deletes_stale_generations_within_its_budget(redis_cache):
+    chat_ids = [uuid4() for _ in range(30)]
+    for chat_id in chat_ids:
+        _, generation = await redis_cache.get_derived("chat", chat_id, "history:10")
+        assert await redis_cache.set_derived("chat", chat_id, "history:10", [], generation)
+    await redis_cache.invalidate_chats(chat_ids[:20])
+
+    sweeper = DerivedKeySweeper(redis_cache, DerivedKeySweeperConfig(scan_count=5, max_keys_per_second=100_000))
+    assert await sweeper.sweep(max_keys=8) <= 8
+    assert sweeper.stats["scanned"] == 8
+
+    while await sweeper.sweep():
+        pass
+    assert sweeper.stats["deleted"] == 20
+    assert len(await redis_cache._client.keys(redis_cache._build_key("chat:*"))) == 10
+    for chat_id in chat_ids[20:]:
+        assert await redis_cache.get_derived("chat", chat_id, "history:10") == ([], 0)
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+import pytest
+from LuminMessageService.app.domain.models.common.value_objects import MessageText
+from LuminMessageService.app.infrastructure.archive.message_archiver import MessageArchiver
+from LuminMessageService.app.infrastructure.persistance.partitioning import MessagePartitionManager, PartitionConfig
+
+
+async def create_archived_message(connection_pool, cache, archive, message_service, chat_id):
+    sent_at = datetime.now() - timedelta(days=200)
+    message = await message_service.create_message(
+        uuid4(), uuid4(), uuid4(), chat_id, MessageText("archived hello"), sent_at=sent_at, read_at=sent_at
+    )
+
+    assert await MessageArchiver(connection_pool, archive).archive_once() == 1
+    cache.evict_local([message.id])
+    async with connection_pool.acquire() as conn:
+        assert await conn.fetchval("SELECT count(*) FROM messages") == 0
+
+    return message
+
+
+async def test_archived_message_is_read_back_by_id_and_history(connection_pool, cache, archive, message_service):
+    chat_id = uuid4()
+    message = await create_archived_message(connection_pool, cache, archive, message_service, chat_id)
+
+    found = await message_service.get_message_by_id(message.id)
+    assert found.id == message.id
+    assert found.text.value == "archived hello"
+
+    page = await message_service.get_chat_history(chat_id, 10)
+    assert [history_message.id for history_message in page.messages] == [message.id]
+
+
+async def test_deleting_archived_message_recreates_expired_partition(connection_pool, cache, archive, message_service):
+    message = await create_archived_message(connection_pool, cache, archive, message_service, uuid4())
+    partition = MessagePartitionManager.partition_name(message.sent_at)
+
+    manager = MessagePartitionManager(connection_pool, PartitionConfig(retention_months=3))
+    assert partition in await manager.apply_retention()
+
+    await message_service.delete(message.id)
+
+    async with connection_pool.acquire() as conn:
+        assert await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", partition)
+        assert await conn.fetchval("SELECT deleted_at IS NOT NULL FROM messages WHERE message_id = $1", message.id)
+    with pytest.raises(ValueError):
+        await message_service.get_message_by_id(message.id)
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+import pytest
+from LuminMessageService.app.domain.models.common.exceptions import MessageVersionConflictError
+from LuminMessageService.app.domain.models.common.value_objects import MessageText
+from LuminMessageService.app.infrastructure.persistance.partitioning import MessagePartitionManager, PartitionConfig
+from LuminMessageService.app.infrastructure.persistance.tombstone_compactor import TombstoneCompactor, \
+    TombstoneCompactorConfig
+from LuminMessageService.app.infrastructure.persistance.unit_of_work import get_unit_of_work
+
+
+async def test_messages_dropped_by_retention_are_not_rebuilt_from_events(connection_pool, cache, message_service):
+    sent_at = datetime.now() - timedelta(days=200)
+    message = await message_service.create_message(
+        uuid4(), uuid4(), uuid4(), uuid4(), MessageText("expired"), sent_at=sent_at
+    )
+    await MessagePartitionManager(connection_pool, PartitionConfig(retention_months=3)).apply_retention()
+    cache.evict_local([message.id])
+
+    async with connection_pool.acquire() as conn:
+        assert await conn.fetchval("SELECT count(*) FROM message_events WHERE aggregate_id = $1", message.id)
+
+    with pytest.raises(ValueError):
+        await message_service.get_message_by_id(message.id)
+    assert await message_service.get_messages_by_ids([message.id]) == []
+
+
+async def test_compacted_tombstones_are_not_rebuilt_from_events(connection_pool, cache, message_service):
+    message = await message_service.create_message(uuid4(), uuid4(), uuid4(), uuid4(), MessageText("compacted"))
+    await message_service.delete(message.id)
+    assert await TombstoneCompactor(connection_pool, TombstoneCompactorConfig(retention_seconds=0)).compact() == 1
+    cache.evict_local([message.id])
+
+    with pytest.raises(ValueError):
+        await message_service.get_message_by_id(message.id)
+    assert await message_service.get_messages_by_ids([message.id]) == []
+
+
+@pytest.mark.parametrize("compacted", [False, True])
+async def test_recreating_deleted_message_id_is_a_conflict(connection_pool, message_service, compacted):
+    message_id, sender_id, recipient_id, chat_id = uuid4(), uuid4(), uuid4(), uuid4()
+    await message_service.create_message(message_id, sender_id, recipient_id, chat_id, MessageText("first"))
+    await message_service.delete(message_id)
+    if compacted:
+        await TombstoneCompactor(connection_pool, TombstoneCompactorConfig(retention_seconds=0)).compact()
+
+    with pytest.raises(MessageVersionConflictError):
+        await message_service.create_message(message_id, sender_id, recipient_id, chat_id, MessageText("again"))
+    with pytest.raises(MessageVersionConflictError):
+        await message_service.create_messages([{
+            "message_id": message_id, "sender_id": sender_id, "recipient_id": recipient_id,
+            "chat_id": chat_id, "text": MessageText("again")
+        }])
+
+
+async def test_concurrent_update_with_stale_version_is_rejected(connection_pool, cache, message_service):
+    message = await message_service.create_message(uuid4(), uuid4(), uuid4(), uuid4(), MessageText("original"))
+
+    async with get_unit_of_work(connection_pool, cache) as first, get_unit_of_work(connection_pool, cache) as second:
+        first_copy = await first.messages.get_by_id(message.id)
+        second_copy = await second.messages.get_by_id(message.id)
+        assert first_copy is not second_copy
+        assert first_copy.version == second_copy.version == message.version
+
+        first_copy.edit_text(MessageText("first writer"))
+        await first.messages.save(first_copy)
+        await first.commit()
+
+        second_copy.edit_text(MessageText("lost update"))
+        with pytest.raises(MessageVersionConflictError):
+            await second.messages.save(second_copy)
+
+    cache.evict_local([message.id])
+    stored = await message_service.get_message_by_id(message.id)
+    assert stored.text.value == "first writer"
+    assert stored.version == message.version + 1
+
+
+async def test_messages_are_created_in_months_without_a_partition(connection_pool, cache, message_service):
+    chat_id = uuid4()
+    past = datetime.now() - timedelta(days=3 * 365)
+    future = datetime.now() + timedelta(days=365)
+    imported = [
+        {"message_id": uuid4(), "sender_id": uuid4(), "recipient_id": uuid4(), "chat_id": chat_id,
+         "text": MessageText(f"imported {days}"), "sent_at": past + timedelta(days=days)}
+        for days in (0, 40, 80)
+    ]
+
+    single = await message_service.create_message(
+        uuid4(), uuid4(), uuid4(), chat_id, MessageText("scheduled"), sent_at=future
+    )
+    await message_service.create_messages(imported)
+    cache.evict_local([single.id, *(data["message_id"] for data in imported)])
+
+    assert (await message_service.get_message_by_id(single.id)).sent_at == future
+    found = await message_service.get_messages_by_ids([data["message_id"] for data in imported])
+    assert [message.sent_at for message in found] == [data["sent_at"] for data in imported]
+    partitions = {name for name, _ in await MessagePartitionManager(connection_pool).list_partitions()}
+    assert {MessagePartitionManager.partition_name(message.sent_at) for message in [single, *found]} <= partitions
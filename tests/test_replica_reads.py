@@ -0,0 +1,36 @@
+import os
+from uuid import uuid4
+from LuminMessageService.app.application.services.message_service import MessageService
+from LuminMessageService.app.domain.models.common.value_objects import MessageText
+from LuminMessageService.app.infrastructure.cache.bounded_local_cache import BoundedLocalCache, LocalCacheConfig
+from LuminMessageService.app.infrastructure.cache.multi_level_cache import MultiLevelCache, local_entry_size
+from LuminMessageService.app.infrastructure.persistance.connection_pool import DatabasePool, PoolConfig
+from LuminMessageService.app.infrastructure.persistance.replica_router import ReplicaRouter
+
+
+def process_cache(redis_cache) -> MultiLevelCache:
+    return MultiLevelCache(redis_cache, BoundedLocalCache(LocalCacheConfig(), local_entry_size))
+
+
+async def test_only_primary_reads_fill_the_shared_cache(connection_pool, redis_cache):
+    replica = DatabasePool(PoolConfig(dsn=os.environ["TEST_DATABASE_URL"], min_size=1, max_size=2))
+    router = ReplicaRouter(connection_pool, [replica])
+    await router.check_health()
+    writer = MessageService(connection_pool, process_cache(redis_cache))
+    reader = MessageService(connection_pool, process_cache(redis_cache), replica_router=router)
+
+    try:
+        chat_id = uuid4()
+        message = await writer.create_message(uuid4(), uuid4(), uuid4(), chat_id, MessageText("replicated"))
+        await redis_cache.delete_messages([message.id])
+
+        assert [found.id for found in (await reader.get_chat_history(chat_id, 10)).messages] == [message.id]
+        assert router.get_metrics()["replica_reads"] == 1
+        assert await redis_cache.get_derived("chat", chat_id, "history:10") == (None, 0)
+
+        assert (await reader.get_message_by_id(message.id)).id == message.id
+        assert [found.id for found in await reader.get_messages_by_ids([message.id])] == [message.id]
+        assert router.get_metrics()["replica_reads"] == 1
+        assert (await redis_cache.get_message(message.id)).value["version"] == message.version
+    finally:
+        await replica.disconnect()
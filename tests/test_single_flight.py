@@ -0,0 +1,29 @@
+import asyncio
+from uuid import uuid4
+from LuminMessageService.app.domain.models.common.value_objects import MessageText
+from LuminMessageService.app.infrastructure.persistance.postgres_sql_message_repository import (
+    PostgresSQLMessageRepository,
+)
+
+CONCURRENT_MISSES = 1000
+
+
+async def test_concurrent_misses_for_one_message_run_a_single_query(monkeypatch, cache, message_service):
+    message = await message_service.create_message(uuid4(), uuid4(), uuid4(), uuid4(), MessageText("popular"))
+    await cache.invalidate_messages([message.id])
+
+    queries = 0
+    fetch_message_data = PostgresSQLMessageRepository.fetch_message_data
+
+    async def counting_fetch_message_data(repository, message_id):
+        nonlocal queries
+        queries += 1
+        return await fetch_message_data(repository, message_id)
+
+    monkeypatch.setattr(PostgresSQLMessageRepository, "fetch_message_data", counting_fetch_message_data)
+
+    found = await asyncio.gather(*(message_service.get_message_by_id(message.id) for _ in range(CONCURRENT_MISSES)))
+
+    assert queries == 1
+    assert {found_message.id for found_message in found} == {message.id}
+    assert cache.single_flight.stats["coalesced"] == CONCURRENT_MISSES - 1
@@ -0,0 +1,20 @@
+from uuid import uuid4
+from LuminMessageService.app.domain.models.common.value_objects import MessageText
+
+
+async def test_unread_counter_tracks_recipient_through_create_read_and_delete(message_service):
+    sender_id, recipient_id, chat_id = uuid4(), uuid4(), uuid4()
+
+    messages = [
+        await message_service.create_message(uuid4(), sender_id, recipient_id, chat_id, MessageText(f"hello {number}"))
+        for number in range(3)
+    ]
+    assert await message_service.get_unread_count(recipient_id, chat_id) == 3
+    assert await message_service.get_unread_count(sender_id, chat_id) == 0
+
+    await message_service.mark_message_as_read(messages[0].id)
+    assert await message_service.get_unread_count(recipient_id, chat_id) == 2
+
+    await message_service.delete(messages[1].id)
+    assert await message_service.get_unread_count(recipient_id, chat_id) == 1
+    assert await message_service.get_unread_count(sender_id, chat_id) == 0